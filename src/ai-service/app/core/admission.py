@@ -0,0 +1,148 @@
+"""Admission control for concurrent chat orchestrations."""
+
+import asyncio
+import logging
+import time
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted."""
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        """
+        Initialize the rejection.
+
+        Args:
+            status_code: HTTP status to return (429 queue full, 503 timed out)
+            retry_after: Seconds the client should wait before retrying
+            reason: Short machine-readable reason, used as a metric attribute
+        """
+        super().__init__(f"Server busy ({reason}), retry after {retry_after}s")
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionLease:
+    """A granted admission slot; release it when the request finishes."""
+
+    def __init__(self, controller: "AdmissionController | None"):
+        self._controller = controller
+        self._released = controller is None
+
+    def release(self) -> None:
+        """Return the slot. Safe to call more than once."""
+        if self._released:
+            return
+        self._released = True
+        self._controller._release()
+
+    async def __aenter__(self) -> "AdmissionLease":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+class AdmissionController:
+    """
+    Per-worker limit on concurrently running chat turns.
+
+    Up to `max_concurrent` requests run at once and up to `max_queue` more
+    wait for a slot. A request arriving at a full queue is rejected at once
+    with 429; one that waits longer than `queue_timeout` gets 503. Both
+    carry a Retry-After hint.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            max_concurrent: Maximum running requests; 0 disables the limit
+            max_queue: Maximum requests waiting for a slot
+            queue_timeout: Seconds a request may wait for a slot
+            retry_after: Retry-After seconds sent with rejections
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrent) if max_concurrent > 0 else None
+        )
+        self._waiting = 0
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests currently waiting for a slot."""
+        return self._waiting
+
+    async def acquire(self, max_wait: float | None = None) -> AdmissionLease:
+        """
+        Wait for a slot.
+
+        Args:
+            max_wait: Optional shorter wait than `queue_timeout`, e.g. the
+                time left before the request's deadline
+
+        Returns:
+            Lease to release when the request finishes
+
+        Raises:
+            AdmissionRejected: If the wait queue is full or the wait timed out
+        """
+        if self._semaphore is None:
+            return AdmissionLease(None)
+
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            metrics.admission_wait_time.record(0.0)
+            return self._grant()
+
+        if self._waiting >= self.max_queue:
+            self._reject(429, "queue_full")
+
+        started = time.perf_counter()
+        self._waiting += 1
+        metrics.admission_queue_depth.add(1)
+        try:
+            timeout = self.queue_timeout
+            if max_wait is not None:
+                timeout = min(timeout, max_wait)
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self._reject(503, "queue_timeout")
+        finally:
+            self._waiting -= 1
+            metrics.admission_queue_depth.add(-1)
+            metrics.admission_wait_time.record(time.perf_counter() - started)
+        return self._grant()
+
+    def _grant(self) -> AdmissionLease:
+        metrics.admission_in_flight.add(1)
+        return AdmissionLease(self)
+
+    def _release(self) -> None:
+        metrics.admission_in_flight.add(-1)
+        self._semaphore.release()
+
+    def _reject(self, status_code: int, reason: str) -> None:
+        metrics.admission_rejections.add(1, {"reason": reason})
+        logger.warning(
+            "Rejecting chat request: %s (waiting=%d, max_concurrent=%d)",
+            reason,
+            self._waiting,
+            self.max_concurrent,
+        )
+        raise AdmissionRejected(status_code, self.retry_after, reason)
@@ -0,0 +1,194 @@
+"""In-process caching primitives shared by services and plugins."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Size-bounded LRU cache whose entries expire after a fixed TTL.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        on_evict: Callable[[K], None] | None = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+            ttl_seconds: Lifetime of an entry in seconds
+            on_evict: Optional callback invoked with the key of each entry
+                evicted to make room (expired entries are not reported)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._on_evict = on_evict
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """
+        Get a live entry and mark it as most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None when missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            if self._on_evict is not None:
+                self._on_evict(evicted_key)
+
+    def pop(self, key: K) -> V | None:
+        """Remove an entry and return its value if it was still live."""
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+
+class SharedTask(Generic[V]):
+    """
+    A task whose result several callers wait for.
+
+    A caller being cancelled does not cancel the task for the others, but
+    once every caller has stopped waiting an unfinished task is cancelled,
+    so work nobody wants any more (say, for requests whose clients
+    disconnected) does not keep running.
+    """
+
+    def __init__(self, work: Awaitable[V]):
+        """
+        Start the task.
+
+        Args:
+            work: Coroutine or future producing the value
+        """
+        self.task: asyncio.Future[V] = asyncio.ensure_future(work)
+        self._waiters = 0
+
+    def wait(self) -> "asyncio.Future[V]":
+        """
+        Wait for the task's result.
+
+        The caller counts as waiting from this call until the returned
+        future is done or cancelled.
+
+        Returns:
+            Future with the value produced by the task
+        """
+        waiter = asyncio.shield(self.task)
+        self._waiters += 1
+        waiter.add_done_callback(self._release)
+        return waiter
+
+    def _release(self, _waiter: "asyncio.Future[V]") -> None:
+        """Cancel the unfinished task once its last caller stopped waiting."""
+        self._waiters -= 1
+        if not self._waiters and not self.task.done():
+            self.task.cancel()
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Coalesce concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key starts the work; callers arriving while it
+    is still running await the same result. A caller being cancelled does
+    not cancel the shared call for the others; the call is cancelled once
+    all of its callers have been (see `SharedTask`).
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._inflight: dict[K, SharedTask[V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def is_inflight(self, key: K) -> bool:
+        """Return True if a call for the key is currently running."""
+        return key in self._inflight
+
+    def start(self, key: K, fn: Callable[[], Awaitable[V]]) -> SharedTask[V]:
+        """
+        Start `fn` for the key unless a call for it is already in flight.
+
+        The call is registered before this returns, so callers started
+        right after it join it.
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument coroutine factory producing the value
+
+        Returns:
+            The key's shared call; wait on it for the value
+        """
+        call = self._inflight.get(key)
+        if call is None:
+            call = self._inflight[key] = SharedTask(fn())
+            call.task.add_done_callback(
+                lambda t, key=key, call=call: self._forget(key, call)
+            )
+        return call
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        """
+        Run `fn` for the key unless a call for it is already in flight.
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument coroutine factory producing the value
+
+        Returns:
+            The value produced by the shared call
+        """
+        return await self.start(key, fn).wait()
+
+    def _forget(self, key: K, call: SharedTask[V]) -> None:
+        """Drop a finished call and mark its exception as retrieved."""
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+        if not call.task.cancelled():
+            call.task.exception()
@@ -1,5 +1,7 @@
 """Application configuration settings."""
 
+from typing import Literal
+
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,6 +13,19 @@ class Settings(BaseSettings):
     azure_ai_project_endpoint: str
     azure_ai_model_deployment: str
     azure_openai_api_key: str | None = None
+    # Send Azure OpenAI requests to this URL instead of the endpoint's
+    # deployment URL, e.g. an API gateway or benchmarks/mock_openai.py
+    azure_openai_base_url: str | None = None
+    # Per-agent deployments and sampling (empty/unset = the model default
+    # deployment and the deployment's defaults). model_fallback_deployment
+    # answers for an agent while its own deployment is throttled.
+    coordinator_model_deployment: str = ""
+    coordinator_max_tokens: int | None = None
+    coordinator_temperature: float | None = None
+    query_model_deployment: str = ""
+    query_max_tokens: int | None = None
+    query_temperature: float | None = None
+    model_fallback_deployment: str = ""
 
     # Application settings
     app_name: str = "AI Chat Service"
@@ -24,6 +39,135 @@ class Settings(BaseSettings):
     enable_tracing: bool = True
     otlp_endpoint: str | None = None
     applicationinsights_connection_string: str | None = None
+    # Serve the service's metrics at GET /metrics (requires the prometheus
+    # extra); per process, so app.server only allows it with one worker
+    prometheus_metrics_enabled: bool = False
+
+    # Weather function HTTP client settings
+    weather_http_timeout: float = 10.0
+    weather_http_max_connections: int = 100
+    weather_http_max_keepalive_connections: int = 20
+    weather_http_keepalive_expiry: float = 30.0
+    weather_http2: bool = False
+
+    # Weather result cache settings
+    weather_cache_enabled: bool = True
+    weather_cache_ttl_seconds: float = 300.0
+    weather_cache_max_entries: int = 1024
+    weather_batch_max_locations: int = 50
+
+    # Conversation session store settings
+    session_store: Literal["memory", "redis"] = "memory"
+    session_ttl_seconds: float = 3600.0
+    session_max_entries: int = 10000
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Prompt history budget settings (0 disables windowing)
+    history_token_budget: int = 0
+    history_strategy: Literal["truncate", "summarize"] = "truncate"
+    history_min_recent_messages: int = 4
+    history_chunk_messages: int = 6
+    history_summary_max_tokens: int = 256
+    history_summary_cache_entries: int = 1024
+    history_summary_cache_ttl_seconds: float = 3600.0
+    history_tokenizer_encoding: str = "o200k_base"
+
+    # Fast-path intent routing ("none" always uses the full handoff)
+    intent_router: Literal["none", "keyword"] = "keyword"
+
+    # Exact-match response cache settings (opt-in)
+    response_cache_enabled: bool = False
+    response_cache_ttl_seconds: float = 300.0
+    response_cache_max_entries: int = 1000
+
+    # Streaming settings: consecutive text deltas are coalesced into one
+    # frame until the flush interval elapses or the frame reaches the byte
+    # limit (0 disables that trigger; both 0 sends every delta as-is)
+    stream_flush_interval_seconds: float = 0.05
+    stream_flush_max_bytes: int = 4096
+    # Events buffered per stream before a slow client stalls the agents
+    stream_queue_max_events: int = 256
+
+    # Production server (python -m app.server): worker processes (0 = one
+    # per available CPU, honouring container CPU limits, with the redis
+    # session store; one with the in-memory store) and HTTP timeouts
+    server_workers: int = 0
+    server_keepalive_timeout_seconds: int = 120
+    server_graceful_shutdown_seconds: int = 30
+
+    # Worker warmup before accepting traffic: fetch the Entra ID token and
+    # open connections to Azure OpenAI and the weather function
+    warmup_enabled: bool = True
+    warmup_timeout_seconds: float = 15.0
+    # Log a per-phase startup timing breakdown (imports, telemetry, agent
+    # service, warmup) instead of a one-line summary
+    startup_report: bool = False
+
+    # Entra ID token cache (managed identity mode): tokens are refreshed in
+    # the background this long before expiry, failed refreshes are retried
+    # every TOKEN_REFRESH_RETRY_SECONDS, and a cached token is served until
+    # TOKEN_EXPIRY_SKEW_SECONDS before it expires
+    token_refresh_margin_seconds: float = 300.0
+    token_refresh_retry_seconds: float = 10.0
+    token_expiry_skew_seconds: float = 30.0
+
+    # Orchestration traces: "record" appends every model and weather
+    # function exchange (with timings) and each chat turn to recording_file;
+    # "replay" serves those calls from the file instead of the network,
+    # with recorded delays scaled by recording_replay_speed (0 = no delay).
+    # Recording runs a single server worker so the file has one writer
+    recording_mode: Literal["off", "record", "replay"] = "off"
+    recording_file: str = "traces/orchestration.jsonl"
+    recording_replay_speed: float = 1.0
+
+    # Agent runtime pool: orchestrations are spread over this many runtimes
+    # (least_loaded or round_robin). A runtime is replaced after
+    # runtime_recycle_after orchestrations or runtime_max_consecutive_failures
+    # failures in a row (0 disables either trigger).
+    runtime_pool_size: int = 4
+    runtime_pool_policy: Literal["least_loaded", "round_robin"] = "least_loaded"
+    runtime_recycle_after: int = 10
+    runtime_max_consecutive_failures: int = 5
+
+    # Admission control (per worker): chat requests beyond the concurrency
+    # limit wait in a bounded queue; when it is full (429) or the wait times
+    # out (503) the request is rejected with Retry-After. 0 disables it.
+    admission_max_concurrent: int = 32
+    admission_max_queue: int = 64
+    admission_queue_timeout_seconds: float = 10.0
+    admission_retry_after_seconds: int = 2
+
+    # Request deadlines in seconds, per endpoint. Clients may set their own
+    # with an X-Request-Timeout header, capped at request_timeout_max_seconds.
+    # Model and weather calls are not started with less than
+    # deadline_min_step_seconds left.
+    chat_timeout_seconds: float = 60.0
+    stream_timeout_seconds: float = 60.0
+    request_timeout_max_seconds: float = 300.0
+    deadline_min_step_seconds: float = 0.5
+
+    # Downstream resilience: transient failures (429, 5xx, timeouts,
+    # connection errors) are retried with jittered exponential backoff,
+    # waiting at least as long as Retry-After asks. After
+    # breaker_failure_threshold consecutive failures a dependency's circuit
+    # breaker fails calls fast for breaker_reset_seconds (0 disables it).
+    model_max_retries: int = 3
+    weather_max_retries: int = 2
+    retry_base_delay_seconds: float = 0.5
+    retry_max_delay_seconds: float = 8.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 30.0
+    # Send a second weather request when the first has not answered within
+    # this many seconds (0 disables hedging)
+    weather_hedge_delay_seconds: float = 0.0
+
+    # Tool calling: whether each agent's model may ask for several tool
+    # calls in one turn (the coordinator's tools are handoffs, which must
+    # not run together). Tool calls of one request run concurrently, at
+    # most tool_call_max_concurrency at a time (0 = no limit).
+    query_agent_parallel_tool_calls: bool = True
+    coordinator_agent_parallel_tool_calls: bool = False
+    tool_call_max_concurrency: int = 4
 
     @field_validator("cors_origins", mode="before")
     @classmethod
@@ -0,0 +1,130 @@
+"""Per-request deadlines shared by every step of a chat turn."""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Awaitable, TypeVar
+
+from .config import settings
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(Exception):
+    """The request's deadline passed before a step could start or finish."""
+
+    def __init__(self, stage: str):
+        """
+        Initialize the error.
+
+        Args:
+            stage: Step that ran out of time, e.g. "model" or "weather"
+        """
+        super().__init__(f"Request deadline exceeded ({stage})")
+        self.stage = stage
+
+
+class Deadline:
+    """Point in time by which a request must be answered."""
+
+    def __init__(self, seconds: float):
+        """
+        Start the clock.
+
+        Args:
+            seconds: Time budget from now
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+
+_current: ContextVar[Deadline | None] = ContextVar("deadline", default=None)
+
+
+def request_deadline(header_seconds: float | None, default_seconds: float) -> Deadline:
+    """
+    Build a request's deadline.
+
+    Args:
+        header_seconds: Value of the X-Request-Timeout header, if sent
+        default_seconds: The endpoint's default timeout
+
+    Returns:
+        Deadline capped at `request_timeout_max_seconds`
+    """
+    seconds = header_seconds if header_seconds is not None else default_seconds
+    return Deadline(min(seconds, settings.request_timeout_max_seconds))
+
+
+def current_deadline() -> Deadline | None:
+    """The deadline of the request being handled, if any."""
+    return _current.get()
+
+
+def bind_deadline(deadline: Deadline | None) -> None:
+    """
+    Make a deadline current for the rest of the running task.
+
+    Each request, and each agent runtime task, runs in its own task, so
+    the deadline does not leak into other requests. Tasks created from
+    here on inherit it.
+
+    Args:
+        deadline: Deadline to apply
+    """
+    _current.set(deadline)
+
+
+def time_left(stage: str, default: float | None = None) -> float | None:
+    """
+    Time budget for the next step under the current deadline.
+
+    Args:
+        stage: Step about to start, reported if the deadline has passed
+        default: Budget when no deadline is set
+
+    Returns:
+        Seconds left, or `default` without a deadline
+
+    Raises:
+        DeadlineExceeded: If less than `deadline_min_step_seconds` is
+            left, so no work is started that cannot finish in time
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    remaining = deadline.remaining()
+    if remaining < settings.deadline_min_step_seconds:
+        raise DeadlineExceeded(stage)
+    return remaining
+
+
+async def within_deadline(work: Awaitable[T], stage: str) -> T:
+    """
+    Await work, cancelling it when the current deadline passes.
+
+    Args:
+        work: Awaitable to run
+        stage: Step reported if the deadline passes
+
+    Returns:
+        Result of the work
+
+    Raises:
+        DeadlineExceeded: If the deadline passed first
+    """
+    try:
+        timeout = time_left(stage)
+    except DeadlineExceeded:
+        # Close the coroutine that will never be awaited
+        if asyncio.iscoroutine(work):
+            work.close()
+        raise
+    try:
+        return await asyncio.wait_for(work, timeout)
+    except asyncio.TimeoutError as e:
+        raise DeadlineExceeded(stage) from e
@@ -5,9 +5,12 @@ from typing import Annotated
 from fastapi import Depends
 
 from ..services.agent import ChatAgentService
+from .admission import AdmissionController
+from .config import settings
 
-# Singleton instance
+# Singleton instances
 _agent_service: ChatAgentService | None = None
+_admission_controller: AdmissionController | None = None
 
 
 def get_agent_service() -> ChatAgentService:
@@ -26,5 +29,37 @@ def get_agent_service() -> ChatAgentService:
     return _agent_service
 
 
-# Type alias for injecting the agent service
+async def shutdown_agent_service() -> None:
+    """
+    Close the singleton agent service, if one was created.
+
+    Releases the agent runtime and pooled HTTP connections so the
+    process can exit cleanly.
+    """
+    global _agent_service
+    if _agent_service is not None:
+        await _agent_service.close()
+        _agent_service = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """
+    Get or create the singleton admission controller for this worker.
+
+    Returns:
+        AdmissionController: Limits concurrently running chat requests
+    """
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController(
+            max_concurrent=settings.admission_max_concurrent,
+            max_queue=settings.admission_max_queue,
+            queue_timeout=settings.admission_queue_timeout_seconds,
+            retry_after=settings.admission_retry_after_seconds,
+        )
+    return _admission_controller
+
+
+# Type aliases for injecting singletons
 AgentServiceDep = Annotated[ChatAgentService, Depends(get_agent_service)]
+AdmissionDep = Annotated[AdmissionController, Depends(get_admission_controller)]
@@ -0,0 +1,68 @@
+"""ASGI middleware recording per-endpoint request metrics."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import metrics
+
+
+class RequestMetricsMiddleware:
+    """
+    Records request duration and time to first body byte per endpoint.
+
+    Implemented as plain ASGI middleware so streamed responses are timed to
+    their last byte rather than to when the response object is returned.
+    Endpoints are labelled by route template (e.g. /api/chat/sessions/
+    {session_id}) to keep metric cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: tuple[str, ...] = ()):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            excluded_paths: Paths not recorded, such as probes and scrapes
+        """
+        self.app = app
+        self.excluded_paths = frozenset(excluded_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        waiting_for_body = True
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, waiting_for_body
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif waiting_for_body and message.get("body"):
+                waiting_for_body = False
+                metrics.http_time_to_first_byte.record(
+                    time.perf_counter() - started,
+                    {"endpoint": _endpoint(scope), "method": scope["method"]},
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            metrics.http_request_duration.record(
+                time.perf_counter() - started,
+                {
+                    "endpoint": _endpoint(scope),
+                    "method": scope["method"],
+                    "status_code": status_code,
+                },
+            )
+
+
+def _endpoint(scope: Scope) -> str:
+    """Route template of the matched endpoint, or "unmatched"."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
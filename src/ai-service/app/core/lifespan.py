@@ -4,15 +4,22 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from .dependencies import get_agent_service
+from .dependencies import shutdown_agent_service
+from .startup import startup_phases
 from .telemetry import setup_telemetry
+from .warmup import warm_up_worker, warmup_state
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    # Startup: Initialize telemetry and agent service
-    setup_telemetry()
-    get_agent_service()
+    # Startup: Initialize telemetry, build the agent service and warm up
+    # its connections before the worker accepts traffic
+    with startup_phases.phase("telemetry"):
+        setup_telemetry()
+    await warm_up_worker()
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: fail readiness, then close pooled connections and stop the
+    # agent runtimes
+    warmup_state.ready = False
+    await shutdown_agent_service()
@@ -0,0 +1,301 @@
+"""OpenTelemetry instruments recorded by the service."""
+
+from .telemetry import METER_NAME, get_meter
+
+_meter = get_meter()
+
+# Weather result cache
+weather_cache_hits = _meter.create_counter(
+    f"{METER_NAME}.weather.cache.hits",
+    unit="1",
+    description="Weather lookups served from the result cache",
+)
+weather_cache_misses = _meter.create_counter(
+    f"{METER_NAME}.weather.cache.misses",
+    unit="1",
+    description="Weather lookups not found in the result cache",
+)
+weather_cache_evictions = _meter.create_counter(
+    f"{METER_NAME}.weather.cache.evictions",
+    unit="1",
+    description="Weather cache entries evicted to stay within the size limit",
+)
+weather_cache_coalesced = _meter.create_counter(
+    f"{METER_NAME}.weather.cache.coalesced",
+    unit="1",
+    description="Weather lookups that joined an in-flight request",
+)
+
+# Prompt history windowing
+history_messages_dropped = _meter.create_counter(
+    f"{METER_NAME}.history.messages_dropped",
+    unit="1",
+    description="History messages removed from prompts to fit the token budget",
+)
+history_summaries = _meter.create_counter(
+    f"{METER_NAME}.history.summaries",
+    unit="1",
+    description="Rolling history summaries written by the model",
+)
+history_summary_cache_hits = _meter.create_counter(
+    f"{METER_NAME}.history.summary_cache.hits",
+    unit="1",
+    description="Prompts that reused a cached rolling history summary",
+)
+
+# Fast-path intent routing
+intent_routes = _meter.create_counter(
+    f"{METER_NAME}.intent.routes",
+    unit="1",
+    description="Chat requests by route: a directly invoked agent or full handoff",
+)
+intent_misroutes = _meter.create_counter(
+    f"{METER_NAME}.intent.misroutes",
+    unit="1",
+    description=(
+        "Directly routed requests whose agent transferred the turn, which "
+        "then ran on the full handoff"
+    ),
+)
+
+# Exact-match response cache
+response_cache_hits = _meter.create_counter(
+    f"{METER_NAME}.response_cache.hits",
+    unit="1",
+    description="Chat turns served from the response cache",
+)
+response_cache_misses = _meter.create_counter(
+    f"{METER_NAME}.response_cache.misses",
+    unit="1",
+    description="Chat turns not found in the response cache",
+)
+response_cache_evictions = _meter.create_counter(
+    f"{METER_NAME}.response_cache.evictions",
+    unit="1",
+    description="Response cache entries evicted to stay within the size limit",
+)
+
+# Streaming
+chat_time_to_first_token = _meter.create_histogram(
+    f"{METER_NAME}.chat.time_to_first_token",
+    unit="s",
+    description="Time from a streaming request to its first response token",
+)
+stream_backpressure_waits = _meter.create_counter(
+    f"{METER_NAME}.stream.backpressure_waits",
+    unit="1",
+    description="Stream events that waited because the client was reading slowly",
+)
+
+# Admission control
+admission_in_flight = _meter.create_up_down_counter(
+    f"{METER_NAME}.admission.in_flight",
+    unit="1",
+    description="Chat requests currently holding an admission slot",
+)
+admission_queue_depth = _meter.create_up_down_counter(
+    f"{METER_NAME}.admission.queue_depth",
+    unit="1",
+    description="Chat requests waiting for an admission slot",
+)
+admission_wait_time = _meter.create_histogram(
+    f"{METER_NAME}.admission.wait_time",
+    unit="s",
+    description="Time chat requests waited for an admission slot",
+)
+admission_rejections = _meter.create_counter(
+    f"{METER_NAME}.admission.rejections",
+    unit="1",
+    description="Chat requests rejected because the worker was saturated",
+)
+
+# Agent runtime pool
+runtime_pool_active = _meter.create_up_down_counter(
+    f"{METER_NAME}.runtime_pool.active",
+    unit="1",
+    description="Orchestrations running on each pooled agent runtime",
+)
+runtime_pool_restarts = _meter.create_counter(
+    f"{METER_NAME}.runtime_pool.restarts",
+    unit="1",
+    description="Pooled agent runtimes replaced, by reason",
+)
+
+# Entra ID token cache
+token_refresh_duration = _meter.create_histogram(
+    f"{METER_NAME}.token.refresh_duration",
+    unit="s",
+    description="Time taken to fetch an Entra ID token, by outcome",
+)
+token_refresh_failures = _meter.create_counter(
+    f"{METER_NAME}.token.refresh_failures",
+    unit="1",
+    description="Failed Entra ID token fetches",
+)
+token_blocking_fetches = _meter.create_counter(
+    f"{METER_NAME}.token.blocking_fetches",
+    unit="1",
+    description=(
+        "Token requests that waited for a fetch because no valid token was cached"
+    ),
+)
+token_stale_served = _meter.create_counter(
+    f"{METER_NAME}.token.stale_served",
+    unit="1",
+    description="Tokens served close to expiry because a refresh failed",
+)
+
+# HTTP endpoints
+http_request_duration = _meter.create_histogram(
+    f"{METER_NAME}.http.request.duration",
+    unit="s",
+    description="Time from request start to the last response byte, by endpoint",
+)
+http_time_to_first_byte = _meter.create_histogram(
+    f"{METER_NAME}.http.time_to_first_byte",
+    unit="s",
+    description="Time from request start to the first response body byte, by endpoint",
+)
+request_tokens = _meter.create_histogram(
+    f"{METER_NAME}.request.tokens",
+    unit="{token}",
+    description=(
+        "Tokens used by one chat request across all its agent calls, by "
+        "endpoint and token type (prompt, completion, cached)"
+    ),
+)
+request_stage_duration = _meter.create_histogram(
+    f"{METER_NAME}.request.stage_duration",
+    unit="s",
+    description=(
+        "Wall-clock time one chat request spent in a stage (queue, history, "
+        "orchestration, model, tools), by endpoint and stage"
+    ),
+)
+
+# Orchestration
+orchestration_duration = _meter.create_histogram(
+    f"{METER_NAME}.orchestration.duration",
+    unit="s",
+    description="Time to run one chat turn through the agents, by route and outcome",
+)
+orchestration_handoffs = _meter.create_histogram(
+    f"{METER_NAME}.orchestration.handoffs",
+    unit="1",
+    description="Agent handoffs per chat turn",
+)
+
+# Model calls
+llm_duration = _meter.create_histogram(
+    f"{METER_NAME}.llm.duration",
+    unit="s",
+    description="Duration of chat completion calls, by agent, deployment and outcome",
+)
+llm_time_to_first_chunk = _meter.create_histogram(
+    f"{METER_NAME}.llm.time_to_first_chunk",
+    unit="s",
+    description=(
+        "Time to the first streamed chunk of a chat completion call, "
+        "by agent and deployment"
+    ),
+)
+llm_tokens = _meter.create_counter(
+    f"{METER_NAME}.llm.tokens",
+    unit="{token}",
+    description=(
+        "Tokens used by chat completion calls, by agent, deployment and token "
+        "type (prompt, completion, and cached prompt tokens)"
+    ),
+)
+llm_fallbacks = _meter.create_counter(
+    f"{METER_NAME}.llm.fallbacks",
+    unit="1",
+    description=(
+        "Chat completion calls sent to the fallback deployment because the "
+        "agent's deployment was throttled or its circuit open"
+    ),
+)
+
+# Weather function calls
+weather_request_duration = _meter.create_histogram(
+    f"{METER_NAME}.weather.request.duration",
+    unit="s",
+    description="Duration of weather function calls, by operation and outcome",
+)
+weather_request_errors = _meter.create_counter(
+    f"{METER_NAME}.weather.request.errors",
+    unit="1",
+    description="Failed weather function calls, by operation",
+)
+
+# Stream output
+stream_chunks = _meter.create_histogram(
+    f"{METER_NAME}.stream.chunks",
+    unit="1",
+    description="Chunks written per streamed response, by format",
+)
+stream_bytes = _meter.create_histogram(
+    f"{METER_NAME}.stream.bytes",
+    unit="By",
+    description="Bytes written per streamed response, by format",
+)
+
+# Client disconnects
+requests_abandoned = _meter.create_counter(
+    f"{METER_NAME}.requests.abandoned",
+    unit="1",
+    description=(
+        "Chat requests whose client disconnected before the response was "
+        "complete, by endpoint and phase (queued, running or streaming)"
+    ),
+)
+agent_calls_cancelled = _meter.create_counter(
+    f"{METER_NAME}.orchestration.cancelled_agent_calls",
+    unit="1",
+    description="In-flight agent runs cancelled with their orchestration",
+)
+requests_deadline_exceeded = _meter.create_counter(
+    f"{METER_NAME}.requests.deadline_exceeded",
+    unit="1",
+    description=(
+        "Chat requests stopped at their deadline, by endpoint and the stage "
+        "that ran out of time"
+    ),
+)
+
+# Downstream resilience (Azure OpenAI, weather function)
+dependency_retries = _meter.create_counter(
+    f"{METER_NAME}.dependency.retries",
+    unit="1",
+    description="Retried downstream calls, by dependency and failure reason",
+)
+load_shed = _meter.create_counter(
+    f"{METER_NAME}.dependency.shed",
+    unit="1",
+    description=(
+        "Downstream calls failed fast without being attempted, by dependency "
+        "and reason (circuit_open, deadline)"
+    ),
+)
+circuit_breaker_state = _meter.create_gauge(
+    f"{METER_NAME}.circuit_breaker.state",
+    unit="1",
+    description="Circuit breaker state by dependency (0 closed, 1 half-open, 2 open)",
+)
+circuit_breaker_transitions = _meter.create_counter(
+    f"{METER_NAME}.circuit_breaker.transitions",
+    unit="1",
+    description="Circuit breaker state changes, by dependency and new state",
+)
+hedged_requests = _meter.create_counter(
+    f"{METER_NAME}.dependency.hedged",
+    unit="1",
+    description="Hedged downstream calls, by dependency and winning attempt",
+)
+
+# Tool calling
+tool_calls_per_turn = _meter.create_histogram(
+    f"{METER_NAME}.tool_calls.per_turn",
+    unit="1",
+    description="Tool calls requested by the model in one turn (run concurrently)",
+)
@@ -0,0 +1,461 @@
+"""Record and replay the service's outbound HTTP traffic as trace files."""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import IO, Any, AsyncIterator, Callable
+
+import httpx
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Response headers kept in traces; everything else is dropped
+_KEPT_HEADERS = ("content-type", "content-encoding", "retry-after")
+
+# Request fields that differ between otherwise identical requests
+_VOLATILE_KEYS = frozenset({"id", "tool_call_id", "user"})
+
+
+def _strip_volatile(value: Any) -> Any:
+    """Remove generated ids from a JSON value so fingerprints are stable."""
+    if isinstance(value, dict):
+        return {
+            key: _strip_volatile(item)
+            for key, item in value.items()
+            if key not in _VOLATILE_KEYS
+        }
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def request_fingerprints(service: str, request: httpx.Request) -> tuple[str, str]:
+    """
+    Fingerprint a request for matching against a trace.
+
+    The exact fingerprint covers the whole request body with generated ids
+    removed, so it matches the same conversation replayed. The shape
+    fingerprint only covers the conversation structure of model calls
+    (offered tools and the messages since the last user message), so it
+    matches other conversations that take the same path through the agents.
+
+    Args:
+        service: Name of the traced client ("openai" or "weather")
+        request: Outbound request
+
+    Returns:
+        Tuple of (exact, shape) hex digests
+    """
+    prefix = f"{service} {request.method} {request.url.path}"
+    body: Any = None
+    if request.content:
+        try:
+            body = json.loads(request.content)
+        except ValueError:
+            body = request.content.decode("utf-8", "replace")
+
+    exact = json.dumps(
+        [prefix, str(request.url.params), _strip_volatile(body)], sort_keys=True
+    )
+    shape: list[Any] = [prefix]
+    if isinstance(body, dict) and "messages" in body:
+        messages = body["messages"]
+        last_user = max(
+            (i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1
+        )
+        shape += [
+            bool(body.get("stream")),
+            sorted(tool["function"]["name"] for tool in body.get("tools") or []),
+            [
+                [m.get("role")]
+                + [c["function"]["name"] for c in m.get("tool_calls") or []]
+                for m in messages[last_user + 1:]
+            ],
+        ]
+    return (
+        hashlib.sha256(exact.encode()).hexdigest()[:32],
+        hashlib.sha256(json.dumps(shape).encode()).hexdigest()[:32],
+    )
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Open a trace file, gzip-compressed if it ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _encode(data: bytes) -> list[str]:
+    """Encode a body chunk as [encoding, text]."""
+    try:
+        return ["utf-8", data.decode("utf-8")]
+    except UnicodeDecodeError:
+        return ["base64", base64.b64encode(data).decode("ascii")]
+
+
+def _decode(encoded: list[str]) -> bytes:
+    """Decode a body chunk written by `_encode`."""
+    encoding, text = encoded
+    if encoding == "base64":
+        return base64.b64decode(text)
+    return text.encode("utf-8")
+
+
+class TraceRecorder:
+    """
+    Appends chat turns and outbound HTTP exchanges to a JSON-lines trace.
+
+    Each HTTP record keeps the request fingerprints, a short request
+    summary, the response status and headers, and the response body as
+    chunks with their arrival times, so streamed model responses replay
+    with their original pacing.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the recorder.
+
+        Args:
+            path: Trace file; appended to, gzip-compressed if it ends in .gz
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = _open(path, "a")
+        self._started = time.perf_counter()
+        # Records are encoded and written on a thread so file and gzip I/O
+        # stays off the event loop; None tells the thread to stop
+        self._queue: queue.SimpleQueue[dict[str, Any] | None] = queue.SimpleQueue()
+        self._writer = threading.Thread(
+            target=self._drain, name="trace-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _write(self, record: dict[str, Any]) -> None:
+        """Queue a record for the writer thread."""
+        self._queue.put(record)
+
+    def _drain(self) -> None:
+        """Write queued records, flushing whenever the queue runs empty."""
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            try:
+                self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+                if self._queue.empty():
+                    self._file.flush()
+            except Exception:
+                logger.exception("Failed to write trace record to %s", self.path)
+        self._file.close()
+
+    def record_turn(
+        self,
+        message: str,
+        history: list[dict[str, str]] | None,
+        streamed: bool,
+    ) -> None:
+        """
+        Record a chat turn as received from the client.
+
+        Args:
+            message: User message
+            history: Client-supplied history messages (role and content)
+            streamed: Whether the turn was streamed
+        """
+        self._write(
+            {
+                "kind": "turn",
+                "at": round(time.perf_counter() - self._started, 4),
+                "message": message,
+                "history": history or [],
+                "streamed": streamed,
+            }
+        )
+
+    def wrap(
+        self, service: str, transport: httpx.AsyncBaseTransport
+    ) -> httpx.AsyncBaseTransport:
+        """
+        Wrap a client transport so its exchanges are recorded.
+
+        Args:
+            service: Name of the client in the trace
+            transport: Transport that sends the requests
+
+        Returns:
+            Recording transport
+        """
+        return _RecordingTransport(self, service, transport)
+
+    def close(self) -> None:
+        """Write the queued records and close the trace file."""
+        self._queue.put(None)
+        self._writer.join()
+
+
+class _RecordingTransport(httpx.AsyncBaseTransport):
+    """Sends requests through the inner transport and records the exchange."""
+
+    def __init__(
+        self,
+        recorder: TraceRecorder,
+        service: str,
+        transport: httpx.AsyncBaseTransport,
+    ):
+        self._recorder = recorder
+        self._service = service
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        await request.aread()
+        exact, shape = request_fingerprints(self._service, request)
+        response = await self._transport.handle_async_request(request)
+        record: dict[str, Any] = {
+            "kind": "http",
+            "service": self._service,
+            "at": round(started - self._recorder._started, 4),
+            "method": request.method,
+            "path": request.url.path,
+            "exact": exact,
+            "shape": shape,
+            "request": _summarize_request(request),
+            "status": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in _KEPT_HEADERS
+                if name in response.headers
+            },
+            "header_delay": round(time.perf_counter() - started, 4),
+            "chunks": [],
+        }
+
+        inner = response.stream
+
+        async def recorded_stream() -> AsyncIterator[bytes]:
+            async for chunk in inner:
+                record["chunks"].append(
+                    [round(time.perf_counter() - started, 4), *_encode(chunk)]
+                )
+                yield chunk
+
+        async def close() -> None:
+            # httpx closes the stream once the body is read or abandoned
+            await inner.aclose()
+            self._recorder._write(record)
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_CallbackStream(recorded_stream(), close),
+            extensions=response.extensions,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _summarize_request(request: httpx.Request) -> dict[str, Any]:
+    """Human-readable summary of a model call for trace inspection."""
+    try:
+        body = json.loads(request.content) if request.content else None
+    except ValueError:
+        return {}
+    if not isinstance(body, dict) or "messages" not in body:
+        return {"params": str(request.url.params)} if request.url.params else {}
+    return {
+        "messages": len(body["messages"]),
+        "tools": [tool["function"]["name"] for tool in body.get("tools") or []],
+        "stream": bool(body.get("stream")),
+    }
+
+
+class _CallbackStream(httpx.AsyncByteStream):
+    """Async byte stream over an iterator with a custom close."""
+
+    def __init__(self, iterator: AsyncIterator[bytes], close: Callable[[], Any]):
+        self._iterator = iterator
+        self._close = close
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._iterator:
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._iterator.aclose()
+        await self._close()
+
+
+class TraceReplayer:
+    """
+    Serves outbound HTTP requests from a recorded trace.
+
+    Requests are matched by exact fingerprint first, then by conversation
+    shape. Repeated matches cycle through the recorded responses, so a
+    trace can be replayed any number of times. `speed` scales the
+    recorded timings: 1.0 replays them as recorded, 0 without delay.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0):
+        """
+        Load a trace.
+
+        Args:
+            path: Trace file written by TraceRecorder
+            speed: Multiplier applied to recorded delays
+        """
+        self.path = path
+        self.speed = speed
+        self.turns: list[dict[str, Any]] = []
+        self.misses = 0
+        self._by_exact: dict[str, list[dict[str, Any]]] = {}
+        self._by_shape: dict[str, list[dict[str, Any]]] = {}
+        self._cursors: dict[tuple[str, str], int] = {}
+        with _open(path, "r") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["kind"] == "turn":
+                    self.turns.append(record)
+                elif record["kind"] == "http":
+                    self._by_exact.setdefault(record["exact"], []).append(record)
+                    self._by_shape.setdefault(record["shape"], []).append(record)
+        logger.info(
+            "Loaded trace %s: %d turns, %d HTTP exchanges",
+            path,
+            len(self.turns),
+            sum(len(records) for records in self._by_exact.values()),
+        )
+
+    def record_turn(
+        self,
+        message: str,
+        history: list[dict[str, str]] | None,
+        streamed: bool,
+    ) -> None:
+        """Turns are not recorded while replaying."""
+
+    def wrap(
+        self, service: str, transport: httpx.AsyncBaseTransport
+    ) -> httpx.AsyncBaseTransport:
+        """
+        Replace a client transport with one serving the trace.
+
+        Args:
+            service: Name of the client in the trace
+            transport: Transport that is no longer used
+
+        Returns:
+            Replay transport
+        """
+        return _ReplayTransport(self, service)
+
+    def match(self, service: str, request: httpx.Request) -> dict[str, Any] | None:
+        """
+        Find the recorded exchange for a request.
+
+        Args:
+            service: Name of the client in the trace
+            request: Outbound request
+
+        Returns:
+            Recorded exchange, or None if nothing matches
+        """
+        exact, shape = request_fingerprints(service, request)
+        for kind, index, key in (
+            ("exact", self._by_exact, exact),
+            ("shape", self._by_shape, shape),
+        ):
+            records = index.get(key)
+            if records:
+                cursor = self._cursors.get((kind, key), 0)
+                self._cursors[(kind, key)] = cursor + 1
+                return records[cursor % len(records)]
+        return None
+
+    def close(self) -> None:
+        """Nothing to release; present for symmetry with TraceRecorder."""
+
+
+class _ReplayTransport(httpx.AsyncBaseTransport):
+    """Answers requests with recorded responses."""
+
+    def __init__(self, replayer: TraceReplayer, service: str):
+        self._replayer = replayer
+        self._service = service
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        record = self._replayer.match(self._service, request)
+        if record is None:
+            self._replayer.misses += 1
+            logger.warning(
+                "No recorded %s response for %s %s",
+                self._service,
+                request.method,
+                request.url.path,
+            )
+            return httpx.Response(
+                404,
+                json={
+                    "error": {"message": "No recorded response matches this request"}
+                },
+                request=request,
+            )
+
+        speed = self._replayer.speed
+        started = time.perf_counter()
+        if speed:
+            await asyncio.sleep(record["header_delay"] * speed)
+
+        async def replayed_stream() -> AsyncIterator[bytes]:
+            for at, *encoded in record["chunks"]:
+                if speed:
+                    delay = at * speed - (time.perf_counter() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                yield _decode(encoded)
+
+        async def close() -> None:
+            pass
+
+        return httpx.Response(
+            status_code=record["status"],
+            headers=record["headers"],
+            stream=_CallbackStream(replayed_stream(), close),
+            request=request,
+        )
+
+
+TraceSession = TraceRecorder | TraceReplayer
+
+
+def create_trace_session() -> TraceSession | None:
+    """
+    Create the recorder or replayer selected by the `recording_mode` setting.
+
+    Returns:
+        TraceRecorder, TraceReplayer, or None when recording is off
+    """
+    if settings.recording_mode == "record":
+        logger.warning(
+            "Recording model and tool traffic to %s", settings.recording_file
+        )
+        return TraceRecorder(settings.recording_file)
+    if settings.recording_mode == "replay":
+        logger.warning(
+            "Replaying model and tool traffic from %s (speed %s)",
+            settings.recording_file,
+            settings.recording_replay_speed,
+        )
+        return TraceReplayer(settings.recording_file, settings.recording_replay_speed)
+    return None
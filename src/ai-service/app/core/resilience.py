@@ -0,0 +1,484 @@
+"""Retries, circuit breakers and hedging for calls to downstream services."""
+
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from typing import AsyncIterator, Awaitable, Callable, NamedTuple, TypeVar
+
+import httpx
+
+from . import metrics
+from .config import settings
+from .deadline import current_deadline
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statuses worth retrying: throttling, timeouts and server errors
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class Failure(NamedTuple):
+    """How a failed call should be handled."""
+
+    retryable: bool
+    reason: str
+    retry_after: float | None = None
+    # HTTP status the dependency answered with; None if it never answered
+    status: int | None = None
+
+
+class CircuitOpenError(Exception):
+    """A dependency's circuit breaker is open; the call was not attempted."""
+
+    def __init__(self, dependency: str, retry_after: float):
+        """
+        Initialize the error.
+
+        Args:
+            dependency: Name of the unhealthy dependency
+            retry_after: Seconds until the breaker lets a probe call through
+        """
+        super().__init__(
+            f"{dependency} is unavailable (circuit open, retry in {retry_after:.0f}s)"
+        )
+        self.dependency = dependency
+        self.retry_after = retry_after
+
+
+def parse_retry_after(headers: httpx.Headers | None) -> float | None:
+    """
+    Read the server's requested delay from response headers.
+
+    Understands Azure OpenAI's `retry-after-ms` as well as `Retry-After`
+    in seconds or as an HTTP date.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Delay in seconds, or None if the response did not ask for one
+    """
+    if headers is None:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+def classify_http_error(error: BaseException) -> Failure:
+    """
+    Classify an httpx error from a call to a downstream service.
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        Failure telling whether to retry and how long to wait
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return Failure(
+            status in RETRYABLE_STATUSES,
+            str(status),
+            parse_retry_after(error.response.headers),
+            status,
+        )
+    if isinstance(error, httpx.TimeoutException):
+        return Failure(True, "timeout")
+    if isinstance(error, httpx.TransportError):
+        return Failure(True, "connection")
+    return Failure(False, type(error).__name__)
+
+
+class RetryPolicy:
+    """Jittered exponential backoff that honours Retry-After."""
+
+    def __init__(self, max_retries: int, base_delay: float, max_delay: float):
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries: Retries after the first attempt
+            base_delay: Backoff ceiling for the first retry, in seconds
+            max_delay: Upper bound for any backoff, in seconds
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, retry: int, retry_after: float | None) -> float:
+        """
+        Time to wait before a retry.
+
+        Uses "full jitter": a uniform delay up to an exponentially growing
+        ceiling, so clients throttled together do not retry together. A
+        server-requested Retry-After is a floor, with a little jitter on top.
+
+        Args:
+            retry: Zero-based retry number
+            retry_after: Delay requested by the server, if any
+
+        Returns:
+            Delay in seconds
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2**retry)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, min(ceiling, 1.0))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Per-dependency circuit breaker.
+
+    Closed: calls flow. After `failure_threshold` consecutive failures the
+    breaker opens and calls fail fast for `reset_timeout` seconds. It then
+    lets one probe call through (half-open). The probe's outcome closes or
+    re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, dependency: str, failure_threshold: int, reset_timeout: float):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            dependency: Name used in errors and metrics
+            failure_threshold: Consecutive failures that open the breaker
+                (0 disables it)
+            reset_timeout: Seconds the breaker stays open before a probe
+        """
+        self.dependency = dependency
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        """
+        Check that a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with its
+                probe already in flight
+        """
+        if self.state == self.CLOSED:
+            return
+        if self.state == self.OPEN:
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                self._shed(remaining)
+            self._transition(self.HALF_OPEN)
+        if self._probing:
+            self._shed(self.reset_timeout)
+        self._probing = True
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        self._failures = 0
+        self._probing = False
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed call that indicates the dependency is unhealthy."""
+        self._failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or (
+            self.failure_threshold and self._failures >= self.failure_threshold
+        ):
+            self._opened_at = time.monotonic()
+            if self.state != self.OPEN:
+                self._transition(self.OPEN)
+
+    def record_cancelled(self) -> None:
+        """Release a half-open probe that never finished or told nothing."""
+        self._probing = False
+
+    def _shed(self, retry_after: float) -> None:
+        metrics.load_shed.add(
+            1, {"dependency": self.dependency, "reason": "circuit_open"}
+        )
+        raise CircuitOpenError(self.dependency, retry_after)
+
+    def _transition(self, state: str) -> None:
+        logger.warning(
+            "Circuit breaker for %s: %s -> %s", self.dependency, self.state, state
+        )
+        self.state = state
+        metrics.circuit_breaker_state.set(
+            self._STATE_VALUES[state], {"dependency": self.dependency}
+        )
+        metrics.circuit_breaker_transitions.add(
+            1, {"dependency": self.dependency, "state": state}
+        )
+
+
+class Resilience:
+    """Retry policy and circuit breaker for one dependency."""
+
+    def __init__(self, dependency: str, policy: RetryPolicy, breaker: CircuitBreaker):
+        """
+        Initialize the wrapper.
+
+        Args:
+            dependency: Name used in metrics
+            policy: Retry policy
+            breaker: The dependency's circuit breaker
+        """
+        self.dependency = dependency
+        self.policy = policy
+        self.breaker = breaker
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        classify: Callable[[BaseException], Failure],
+        give_up: Callable[[Failure], bool] | None = None,
+    ) -> T:
+        """
+        Call the dependency, retrying transient failures.
+
+        Args:
+            fn: Zero-argument coroutine factory making one attempt
+            classify: Maps an attempt's exception to a Failure
+            give_up: Optional predicate for transient failures not worth
+                retrying here, e.g. throttling when a fallback exists
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            Exception: The last attempt's error once retries are exhausted,
+                or a non-retryable error
+        """
+        retry = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                self.breaker.record_cancelled()
+                raise
+            except Exception as e:
+                await self._backoff(e, classify, retry, give_up)
+                retry += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def stream(
+        self,
+        open_stream: Callable[[], AsyncIterator[T]],
+        classify: Callable[[BaseException], Failure],
+        give_up: Callable[[Failure], bool] | None = None,
+    ) -> AsyncIterator[T]:
+        """
+        Stream from the dependency, retrying failures before the first item.
+
+        Once an item has been passed on, a failure is raised as is; the
+        consumer has already seen part of the response.
+
+        Args:
+            open_stream: Zero-argument factory starting one attempt
+            classify: Maps an attempt's exception to a Failure
+            give_up: Optional predicate for transient failures not worth
+                retrying here
+
+        Yields:
+            Items of the first attempt that produces any
+        """
+        retry = 0
+        while True:
+            self.breaker.before_call()
+            started = False
+            try:
+                async for item in open_stream():
+                    if not started:
+                        started = True
+                        self.breaker.record_success()
+                    yield item
+                if not started:
+                    self.breaker.record_success()
+                return
+            except asyncio.CancelledError:
+                if not started:
+                    self.breaker.record_cancelled()
+                raise
+            except Exception as e:
+                if started:
+                    raise
+                await self._backoff(e, classify, retry, give_up)
+                retry += 1
+
+    async def _backoff(
+        self,
+        error: Exception,
+        classify: Callable[[BaseException], Failure],
+        retry: int,
+        give_up: Callable[[Failure], bool] | None = None,
+    ) -> None:
+        """
+        Record a failed attempt and wait before the next one.
+
+        Args:
+            error: The attempt's exception
+            classify: Maps the exception to a Failure
+            retry: Number of retries made so far
+            give_up: Optional predicate for failures to raise at once
+
+        Raises:
+            CircuitOpenError: If the failure opened the breaker
+            Exception: `error` itself when it should not be retried
+        """
+        failure = classify(error)
+        if failure.retryable:
+            self.breaker.record_failure()
+        elif failure.status is not None:
+            # The dependency answered; the request itself was bad
+            self.breaker.record_success()
+        else:
+            # A local error (deadline, unusable response body) says nothing
+            # about the dependency's health; only free a half-open probe
+            self.breaker.record_cancelled()
+        if not failure.retryable or retry >= self.policy.max_retries:
+            raise error
+        if give_up is not None and give_up(failure):
+            raise error
+        if self.breaker.state == CircuitBreaker.OPEN:
+            # This failure opened the breaker; shed now rather than after
+            # a backoff
+            self.breaker.before_call()
+        delay = self.policy.delay(retry, failure.retry_after)
+        deadline = current_deadline()
+        if deadline is not None and (
+            delay + settings.deadline_min_step_seconds > deadline.remaining()
+        ):
+            # Waiting would leave no time for the retry; fail now
+            metrics.load_shed.add(
+                1, {"dependency": self.dependency, "reason": "deadline"}
+            )
+            raise error
+        metrics.dependency_retries.add(
+            1, {"dependency": self.dependency, "reason": failure.reason}
+        )
+        logger.info(
+            "Retrying %s in %.2fs after %s (retry %d of %d)",
+            self.dependency,
+            delay,
+            failure.reason,
+            retry + 1,
+            self.policy.max_retries,
+        )
+        await asyncio.sleep(delay)
+
+
+async def hedged(
+    fn: Callable[[], Awaitable[T]], delay: float, dependency: str
+) -> T:
+    """
+    Run a call, starting a second identical one if the first is slow.
+
+    Only for idempotent calls. Whichever attempt succeeds first wins and
+    the other is cancelled; if one fails, the other's outcome decides.
+
+    Args:
+        fn: Zero-argument coroutine factory making one attempt
+        delay: Seconds to wait for the first attempt before hedging
+        dependency: Name used in metrics
+
+    Returns:
+        Result of the first successful attempt
+    """
+    primary = asyncio.ensure_future(fn())
+    attempts = [primary]
+    try:
+        done, _ = await asyncio.wait(attempts, timeout=delay)
+        if not done:
+            attempts.append(asyncio.ensure_future(fn()))
+        pending = set(attempts)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                    continue
+                if len(attempts) > 1:
+                    metrics.hedged_requests.add(
+                        1,
+                        {
+                            "dependency": dependency,
+                            "winner": "primary" if task is primary else "hedge",
+                        },
+                    )
+                return task.result()
+        raise error
+    finally:
+        for task in attempts:
+            if not task.done():
+                task.cancel()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def create_resilience(dependency: str, max_retries: int) -> Resilience:
+    """
+    Create the retry wrapper for a dependency.
+
+    Breakers are shared per dependency within the worker, so every client
+    of a dependency sees the same health.
+
+    Args:
+        dependency: Dependency name, e.g. "azure_openai" or "weather"
+        max_retries: Retries after the first attempt
+
+    Returns:
+        Resilience configured from settings
+    """
+    breaker = _breakers.get(dependency)
+    if breaker is None:
+        breaker = _breakers[dependency] = CircuitBreaker(
+            dependency,
+            settings.breaker_failure_threshold,
+            settings.breaker_reset_seconds,
+        )
+    return Resilience(
+        dependency,
+        RetryPolicy(
+            max_retries,
+            settings.retry_base_delay_seconds,
+            settings.retry_max_delay_seconds,
+        ),
+        breaker,
+    )
@@ -0,0 +1,89 @@
+"""Startup phase timing for cold-start analysis."""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+def process_age() -> float | None:
+    """
+    Seconds since this process was started, including interpreter boot.
+
+    Returns:
+        Process age, or None where /proc is not available
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is #22
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupPhases:
+    """Durations of the named phases a worker goes through before serving."""
+
+    def __init__(self):
+        self.durations: dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Record a phase duration.
+
+        Args:
+            name: Phase name
+            seconds: Phase duration in seconds
+        """
+        self.durations[name] = round(seconds, 3)
+
+    def record_process_age(self, name: str) -> None:
+        """
+        Record the time since process start as a phase, where available.
+
+        Args:
+            name: Phase name
+        """
+        age = process_age()
+        if age is not None:
+            self.record(name, age)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def log_report(self, detailed: bool) -> None:
+        """
+        Log how long startup took.
+
+        Args:
+            detailed: Log one line per phase instead of a single summary
+        """
+        age = process_age()
+        if not detailed:
+            logger.info(
+                "Worker ready %s(phases: %s)",
+                f"{age:.3f}s after process start " if age is not None else "",
+                self.durations,
+            )
+            return
+        logger.info("Startup phase report:")
+        for name, seconds in self.durations.items():
+            logger.info("  %-28s %8.3fs", name, seconds)
+        logger.info("  %-28s %8.3fs", "sum of phases", sum(self.durations.values()))
+        if age is not None:
+            logger.info("  %-28s %8.3fs", "since process start", age)
+
+
+startup_phases = StartupPhases()
@@ -1,85 +1,140 @@
-"""Telemetry configuration for Application Insights."""
+"""Telemetry configuration for Application Insights and Prometheus."""
 
 import logging
 
-from azure.monitor.opentelemetry.exporter import (AzureMonitorLogExporter,
-                                                  AzureMonitorMetricExporter,
-                                                  AzureMonitorTraceExporter)
-from opentelemetry._logs import set_logger_provider
-from opentelemetry.metrics import set_meter_provider
-from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
-from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
-from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-from opentelemetry.sdk.metrics.view import DropAggregation, View
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.semconv.resource import ResourceAttributes
-from opentelemetry.trace import set_tracer_provider
+from opentelemetry.metrics import Meter, get_meter_provider
 
 from .config import settings
 
+# Meter name for the service's own instruments (see app.core.metrics)
+METER_NAME = "ai_service"
+
+_configured = False
+
+
+def get_meter() -> Meter:
+    """
+    Get the meter used for the service's own metrics.
+
+    Instruments created before `setup_telemetry` runs are bound to the
+    global proxy provider and start exporting once it is configured.
+
+    Returns:
+        OpenTelemetry Meter
+    """
+    return get_meter_provider().get_meter(METER_NAME)
+
 
 def setup_telemetry():
-    """Configure Application Insights telemetry."""
-    if not settings.applicationinsights_connection_string:
+    """
+    Configure Application Insights telemetry and the Prometheus endpoint.
+
+    Runs once per process; later calls are no-ops. The exporter and SDK
+    modules are imported here rather than at module level so workers
+    without a connection string never load them.
+
+    Raises:
+        RuntimeError: If Prometheus metrics are enabled but the exporter
+            is not installed
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    connection_string = settings.applicationinsights_connection_string
+    if not connection_string and not settings.prometheus_metrics_enabled:
         logging.info(
             "Application Insights not configured, skipping telemetry setup"
         )
         return
 
-    connection_string = settings.applicationinsights_connection_string
+    from opentelemetry.metrics import set_meter_provider
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import (MetricReader,
+                                                  PeriodicExportingMetricReader)
+    from opentelemetry.sdk.metrics.view import DropAggregation, View
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.semconv.resource import ResourceAttributes
 
     # Create resource
     resource = Resource.create(
         {ResourceAttributes.SERVICE_NAME: settings.app_name}
     )
+    metric_readers: list[MetricReader] = []
 
-    # Setup logging
-    log_exporter = AzureMonitorLogExporter(
-        connection_string=connection_string
-    )
-    logger_provider = LoggerProvider(resource=resource)
-    logger_provider.add_log_record_processor(
-        BatchLogRecordProcessor(log_exporter)
-    )
-    set_logger_provider(logger_provider)
+    if connection_string:
+        from azure.monitor.opentelemetry.exporter import (
+            AzureMonitorLogExporter, AzureMonitorMetricExporter,
+            AzureMonitorTraceExporter)
+        from opentelemetry._logs import set_logger_provider
+        from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
+        from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.trace import set_tracer_provider
 
-    handler = LoggingHandler()
-    handler.addFilter(logging.Filter("semantic_kernel"))
-    logger = logging.getLogger()
-    logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
+        # Setup logging
+        log_exporter = AzureMonitorLogExporter(
+            connection_string=connection_string
+        )
+        logger_provider = LoggerProvider(resource=resource)
+        logger_provider.add_log_record_processor(
+            BatchLogRecordProcessor(log_exporter)
+        )
+        set_logger_provider(logger_provider)
 
-    # Setup tracing
-    trace_exporter = AzureMonitorTraceExporter(
-        connection_string=connection_string
-    )
-    tracer_provider = TracerProvider(resource=resource)
-    tracer_provider.add_span_processor(
-        BatchSpanProcessor(trace_exporter)
-    )
-    set_tracer_provider(tracer_provider)
+        handler = LoggingHandler()
+        handler.addFilter(logging.Filter("semantic_kernel"))
+        logger = logging.getLogger()
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
 
-    # Setup metrics
-    metric_exporter = AzureMonitorMetricExporter(
-        connection_string=connection_string
-    )
-    meter_provider = MeterProvider(
-        metric_readers=[
+        # Setup tracing
+        trace_exporter = AzureMonitorTraceExporter(
+            connection_string=connection_string
+        )
+        tracer_provider = TracerProvider(resource=resource)
+        tracer_provider.add_span_processor(
+            BatchSpanProcessor(trace_exporter)
+        )
+        set_tracer_provider(tracer_provider)
+
+        metric_exporter = AzureMonitorMetricExporter(
+            connection_string=connection_string
+        )
+        metric_readers.append(
             PeriodicExportingMetricReader(
                 metric_exporter, export_interval_millis=5000
             )
-        ],
+        )
+
+    if settings.prometheus_metrics_enabled:
+        try:
+            from opentelemetry.exporter.prometheus import PrometheusMetricReader
+        except ImportError as e:
+            raise RuntimeError(
+                "PROMETHEUS_METRICS_ENABLED requires the "
+                "'opentelemetry-exporter-prometheus' package; "
+                "install it with `uv pip install .[prometheus]`"
+            ) from e
+        # Collected on scrape; served by app.routers.metrics
+        metric_readers.append(PrometheusMetricReader())
+
+    # Setup metrics
+    meter_provider = MeterProvider(
+        metric_readers=metric_readers,
         resource=resource,
         views=[
             View(instrument_name="*", aggregation=DropAggregation()),
             View(instrument_name="semantic_kernel*"),
+            View(instrument_name=f"{METER_NAME}.*"),
         ],
     )
     set_meter_provider(meter_provider)
 
     logging.info(
-        "Application Insights telemetry configured successfully"
+        "Telemetry configured (Application Insights: %s, Prometheus: %s)",
+        bool(connection_string),
+        settings.prometheus_metrics_enabled,
     )
@@ -0,0 +1,207 @@
+"""Cached Entra ID bearer token provider with background refresh."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from azure.core.credentials_async import AsyncTokenCredential
+
+from . import metrics
+from .cache import SingleFlight
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+
+@dataclass(frozen=True)
+class _CachedToken:
+    """A bearer token and when to refresh it."""
+
+    token: str
+    expires_on: float
+    refresh_on: float
+
+
+class CachedTokenProvider:
+    """
+    Bearer token provider that keeps a fresh token ready.
+
+    A background task refreshes the token ahead of expiry, so requests
+    normally read it from memory. Concurrent fetches share one credential
+    call. If a refresh fails, the cached token keeps being served until it
+    is about to expire, and the refresh is retried in the background.
+
+    Instances are async callables returning the token string, as expected
+    by `AzureChatCompletion(ad_token_provider=...)`.
+    """
+
+    def __init__(
+        self,
+        credential: AsyncTokenCredential,
+        scope: str = COGNITIVE_SERVICES_SCOPE,
+        refresh_margin: float = 300.0,
+        retry_interval: float = 10.0,
+        expiry_skew: float = 30.0,
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            credential: Azure credential used to fetch tokens
+            scope: Token scope
+            refresh_margin: Seconds before expiry to refresh; capped at half
+                the token lifetime for short-lived tokens
+            retry_interval: Seconds between background retries after a
+                failed refresh
+            expiry_skew: Seconds before expiry after which a token is no
+                longer served
+        """
+        self._credential = credential
+        self.scope = scope
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.expiry_skew = expiry_skew
+        self._token: _CachedToken | None = None
+        self._inflight: SingleFlight[str, _CachedToken] = SingleFlight()
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    async def __call__(self) -> str:
+        """
+        Get a bearer token.
+
+        Returns:
+            Token string
+
+        Raises:
+            Exception: The credential error, when no usable token is cached
+        """
+        self._ensure_refresh_task()
+        cached = self._token
+        now = time.time()
+        if cached is not None and now < cached.expires_on - self.expiry_skew:
+            return cached.token
+
+        # Nothing usable cached: this request has to wait for the credential
+        metrics.token_blocking_fetches.add(1)
+        try:
+            return (await self._refresh()).token
+        except Exception:
+            if cached is not None and time.time() < cached.expires_on:
+                metrics.token_stale_served.add(1)
+                logger.warning("Token refresh failed; serving token close to expiry")
+                return cached.token
+            raise
+
+    async def close(self) -> None:
+        """Stop background refresh and close the credential."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        await self._credential.close()
+
+    def _ensure_refresh_task(self) -> None:
+        """Start the background refresh loop on first use."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh(self) -> _CachedToken:
+        """Fetch a new token, sharing any fetch already in flight."""
+        return await self._inflight.do(self.scope, self._fetch)
+
+    async def _fetch(self) -> _CachedToken:
+        """
+        Fetch a token from the credential and cache it.
+
+        Returns:
+            The new cached token
+        """
+        started = time.perf_counter()
+        try:
+            access_token = await self._credential.get_token(self.scope)
+        except Exception:
+            metrics.token_refresh_duration.record(
+                time.perf_counter() - started, {"outcome": "failure"}
+            )
+            metrics.token_refresh_failures.add(1)
+            raise
+        metrics.token_refresh_duration.record(
+            time.perf_counter() - started, {"outcome": "success"}
+        )
+
+        now = time.time()
+        lifetime = max(access_token.expires_on - now, 0)
+        margin = min(self.refresh_margin, lifetime / 2)
+        self._token = _CachedToken(
+            token=access_token.token,
+            expires_on=access_token.expires_on,
+            refresh_on=access_token.expires_on - margin,
+        )
+        logger.info("Fetched Entra ID token valid for %.0fs", lifetime)
+        return self._token
+
+    async def _refresh_loop(self) -> None:
+        """Refresh the token ahead of expiry until cancelled."""
+        failed = False
+        refreshed = False
+        while True:
+            cached = self._token
+            if failed:
+                delay = self.retry_interval
+            elif cached is None:
+                delay = 0
+            else:
+                delay = max(cached.refresh_on - time.time(), 0)
+                if delay == 0 and refreshed:
+                    # The credential returned a token that is already due
+                    # for refresh (expired or very short-lived); asking
+                    # again straight away would call it in a tight loop
+                    logger.warning(
+                        "Fetched token is already due for refresh, "
+                        "refreshing again in %ss",
+                        self.retry_interval,
+                    )
+                    delay = self.retry_interval
+            await asyncio.sleep(delay)
+            try:
+                await self._refresh()
+                failed = False
+                refreshed = True
+            except Exception as e:
+                failed = True
+                logger.warning(
+                    "Background token refresh failed, retrying in %ss: %s",
+                    self.retry_interval,
+                    e,
+                )
+
+
+def create_token_provider(
+    credential: AsyncTokenCredential | None = None,
+) -> CachedTokenProvider:
+    """
+    Create the cached token provider from settings.
+
+    Args:
+        credential: Credential to fetch tokens with; defaults to
+            DefaultAzureCredential
+
+    Returns:
+        Configured CachedTokenProvider
+    """
+    if credential is None:
+        from azure.identity.aio import DefaultAzureCredential
+
+        credential = DefaultAzureCredential()
+    return CachedTokenProvider(
+        credential,
+        refresh_margin=settings.token_refresh_margin_seconds,
+        retry_interval=settings.token_refresh_retry_seconds,
+        expiry_skew=settings.token_expiry_skew_seconds,
+    )
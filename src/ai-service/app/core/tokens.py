@@ -0,0 +1,114 @@
+"""Local token counting for prompt budgeting."""
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+from functools import lru_cache
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Approximate per-message framing overhead (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Where tiktoken fetches each encoding's BPE file; its cache directory keeps
+# the file under the SHA-1 of this URL
+_ENCODING_URLS = {
+    name: f"https://openaipublic.blob.core.windows.net/encodings/{name}.tiktoken"
+    for name in ("o200k_base", "cl100k_base", "p50k_base", "r50k_base")
+}
+
+
+def _cached_encoding_file(name: str) -> str | None:
+    """
+    Find an encoding's BPE file in the operator-provided tiktoken cache.
+
+    Args:
+        name: tiktoken encoding name
+
+    Returns:
+        Path of the cached file, or None if it is not there
+    """
+    cache_dir = os.environ.get("TIKTOKEN_CACHE_DIR")
+    url = _ENCODING_URLS.get(name)
+    if not cache_dir or url is None:
+        return None
+    path = os.path.join(cache_dir, hashlib.sha1(url.encode()).hexdigest())
+    return path if os.path.isfile(path) else None
+
+
+@lru_cache(maxsize=1)
+def _get_encoder():
+    """
+    Load the BPE encoder used for counting, if available.
+
+    Uses `tiktoken` (optional `tokenizer` extra) only when the encoding file
+    is already in the directory named by `TIKTOKEN_CACHE_DIR`, as tiktoken
+    would otherwise download it. Without it, counting falls back to a
+    character-based estimate. Reads a file, so call it through
+    `load_tokenizer` rather than on the event loop.
+
+    Returns:
+        A tiktoken Encoding, or None to use the estimate
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        logger.info("tiktoken not installed; estimating token counts")
+        return None
+    name = settings.history_tokenizer_encoding
+    if _cached_encoding_file(name) is None:
+        logger.info(
+            "Tokenizer encoding '%s' not found in TIKTOKEN_CACHE_DIR; "
+            "estimating token counts",
+            name,
+        )
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(
+            "Could not load tokenizer encoding '%s' (%s); estimating token counts",
+            name,
+            e,
+        )
+        return None
+
+
+async def load_tokenizer() -> None:
+    """Load the encoder on a worker thread; returns at once once loaded."""
+    if _get_encoder.cache_info().currsize == 0:
+        await asyncio.to_thread(_get_encoder)
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a piece of text.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Token count (exact with tiktoken, otherwise ~4 characters per token)
+    """
+    encoder = _get_encoder()
+    if encoder is None:
+        return math.ceil(len(text) / 4)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(content: str | None) -> int:
+    """
+    Count the tokens a chat message contributes to a prompt.
+
+    Args:
+        content: Message text
+
+    Returns:
+        Token count including per-message overhead
+    """
+    return MESSAGE_OVERHEAD_TOKENS + (count_tokens(content) if content else 0)
@@ -0,0 +1,66 @@
+"""Worker warmup run before the worker accepts traffic."""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from .config import settings
+from .dependencies import get_agent_service
+from .startup import startup_phases
+from .tokens import load_tokenizer
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Readiness of this worker and the warmup phases that failed."""
+
+    def __init__(self):
+        self.ready = False
+        self.failures: dict[str, str] = {}
+
+
+warmup_state = WarmupState()
+
+
+async def _phase(name: str, step: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run one warmup phase, recording its duration.
+
+    Failures and timeouts are logged rather than raised: the worker still
+    serves, and the first request retries whatever did not warm up.
+
+    Args:
+        name: Phase name for logs and the readiness report
+        step: Coroutine function performing the phase
+    """
+    with startup_phases.phase(name):
+        try:
+            await asyncio.wait_for(step(), settings.warmup_timeout_seconds)
+        except Exception as e:
+            warmup_state.failures[name] = str(e) or type(e).__name__
+            logger.warning("Warmup phase %s failed: %s", name, e)
+
+
+async def warm_up_worker() -> None:
+    """
+    Build the agent service and open its connections, then mark ready.
+
+    Runs during lifespan startup, so uvicorn does not hand this worker any
+    requests until it has finished.
+    """
+    with startup_phases.phase("agent_service"):
+        service = get_agent_service()
+
+    if settings.warmup_enabled:
+        await _phase("token", service.warm_up_token)
+        phases = [
+            _phase("azure_openai_connection", service.warm_up_chat_connection),
+            _phase("weather_connection", service.weather_plugin.warm_up),
+        ]
+        if service.history_window.enabled:
+            phases.append(_phase("tokenizer", load_tokenizer))
+        await asyncio.gather(*phases)
+
+    warmup_state.ready = True
+    startup_phases.log_report(detailed=settings.startup_report)
@@ -1,15 +1,21 @@
 """Chat models package."""
 
-from .chat import (ChatHistoryModel, ChatMessage, ChatRequest, ChatResponse,
-                   MessageRole)
+from .chat import (AgentUsage, ChatHistoryModel, ChatMessage, ChatRequest,
+                   ChatResponse, ChatUsage, MessageRole, StreamEvent,
+                   StreamEventType, StreamFormat)
 from .converters import chat_history_to_sk, sk_to_chat_history
 
 __all__ = [
+    "AgentUsage",
     "ChatHistoryModel",
     "ChatMessage",
     "ChatRequest",
     "ChatResponse",
+    "ChatUsage",
     "MessageRole",
+    "StreamEvent",
+    "StreamEventType",
+    "StreamFormat",
     "chat_history_to_sk",
     "sk_to_chat_history",
 ]
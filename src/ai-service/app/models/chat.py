@@ -53,10 +53,124 @@ class ChatRequest(BaseModel):
         default=None, description="Optional chat history for context"
     )
     stream: bool = Field(default=True, description="Whether to stream the response")
+    session_id: Optional[str] = Field(
+        default=None,
+        max_length=128,
+        description=(
+            "Optional session id. When set, history is kept server-side and "
+            "only the new message needs to be sent"
+        ),
+    )
+    include_usage: bool = Field(
+        default=False,
+        description=(
+            "Return token usage and timings: a usage block on the response, "
+            "or a final usage event on sse/ndjson streams"
+        ),
+    )
+
+
+class AgentUsage(BaseModel):
+    """Token usage of one agent on one deployment within a request."""
+
+    agent: str = Field(..., description="Agent name")
+    deployment: str = Field(..., description="Model deployment the calls went to")
+    model_calls: int = Field(default=0, description="Chat completion calls made")
+    prompt_tokens: int = Field(default=0, description="Prompt tokens")
+    completion_tokens: int = Field(default=0, description="Completion tokens")
+    cached_tokens: int = Field(
+        default=0, description="Prompt tokens served from the prompt cache"
+    )
+
+
+class ChatUsage(BaseModel):
+    """Token usage and latency breakdown of one chat request."""
+
+    prompt_tokens: int = Field(default=0, description="Prompt tokens, all agents")
+    completion_tokens: int = Field(
+        default=0, description="Completion tokens, all agents"
+    )
+    cached_tokens: int = Field(
+        default=0, description="Prompt tokens served from the prompt cache"
+    )
+    total_tokens: int = Field(default=0, description="Prompt plus completion tokens")
+    model_calls: int = Field(default=0, description="Chat completion calls made")
+    tool_calls: int = Field(default=0, description="Tool (function) calls made")
+    handoffs: int = Field(default=0, description="Agent handoffs")
+    agents: list[AgentUsage] = Field(
+        default_factory=list, description="Usage per agent and deployment"
+    )
+    duration_ms: float = Field(..., description="Time from arrival to this report")
+    time_to_first_token_ms: Optional[float] = Field(
+        default=None, description="Time to the first response text (streams)"
+    )
+    stages_ms: dict[str, float] = Field(
+        default_factory=dict,
+        description=(
+            "Wall-clock time per stage: queue (admission wait), history, "
+            "orchestration, and within it model and tools. Concurrent calls "
+            "count once."
+        ),
+    )
 
 
 class ChatResponse(BaseModel):
     """Chat response model for non-streaming responses."""
 
     response: str = Field(..., description="Assistant's response message")
-    history: ChatHistoryModel = Field(..., description="Updated chat history")
+    history: ChatHistoryModel = Field(
+        ...,
+        description=(
+            "Updated chat history, or only the messages added by this turn "
+            "when a session id is used"
+        ),
+    )
+    session_id: Optional[str] = Field(
+        default=None, description="Session id the turn was stored under"
+    )
+    usage: Optional[ChatUsage] = Field(
+        default=None, description="Token usage and timings, if requested"
+    )
+
+
+class StreamFormat(str, Enum):
+    """Wire format of a streamed chat response."""
+
+    TEXT = "text"
+    SSE = "sse"
+    NDJSON = "ndjson"
+
+
+class StreamEventType(str, Enum):
+    """Type of a streamed chat event."""
+
+    DELTA = "delta"
+    AGENT = "agent"
+    HANDOFF = "handoff"
+    TOOL_CALL = "tool_call"
+    TOOL_RESULT = "tool_result"
+    USAGE = "usage"
+
+
+class StreamEvent(BaseModel):
+    """Event emitted while a chat response is streaming."""
+
+    type: StreamEventType = Field(..., description="Event type")
+    content: Optional[str] = Field(
+        default=None, description="Response text (delta) or tool output (tool_result)"
+    )
+    agent: Optional[str] = Field(
+        default=None, description="Agent that produced the event"
+    )
+    target: Optional[str] = Field(
+        default=None, description="Agent the conversation is handed off to"
+    )
+    name: Optional[str] = Field(
+        default=None, description="Fully qualified tool function name"
+    )
+    arguments: Optional[str] = Field(
+        default=None, description="Tool call arguments as a JSON string"
+    )
+    usage: Optional[ChatUsage] = Field(
+        default=None, description="Token usage and timings (usage)"
+    )
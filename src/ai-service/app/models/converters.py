@@ -1,9 +1,18 @@
 """Converter utilities for chat models."""
 
-from semantic_kernel.contents import ChatHistory
+from semantic_kernel.contents import AuthorRole, ChatHistory, ChatMessageContent
 
 from .chat import ChatHistoryModel, MessageRole
 
+# Role mappings between the API and Semantic Kernel; roles missing here
+# (such as tool messages) are not part of the API history
+_SK_ROLES = {
+    MessageRole.SYSTEM: AuthorRole.SYSTEM,
+    MessageRole.USER: AuthorRole.USER,
+    MessageRole.ASSISTANT: AuthorRole.ASSISTANT,
+}
+_API_ROLES = {sk_role: role for role, sk_role in _SK_ROLES.items()}
+
 
 def chat_history_to_sk(
     history: ChatHistoryModel, system_message: str | None = None
@@ -11,6 +20,11 @@ def chat_history_to_sk(
     """
     Convert API ChatHistoryModel to Semantic Kernel ChatHistory.
 
+    Messages keep their original order; the service's system message goes
+    first when the history has none. The history is only appended to, so
+    each agent's prompts start with the same bytes on every call and turn,
+    which the model service's prompt cache can reuse.
+
     Args:
         history: The API chat history model
         system_message: Optional system message to add if no system message exists
@@ -18,24 +32,21 @@ def chat_history_to_sk(
     Returns:
         Semantic Kernel ChatHistory object
     """
-    sk_history = ChatHistory()
-
-    # Check if there's already a system message
-    has_system_message = any(msg.role == MessageRole.SYSTEM for msg in history.messages)
+    # One pass over the history, building the messages directly rather
+    # than through ChatHistory's add_* helpers
+    messages = [
+        ChatMessageContent(role=_SK_ROLES[message.role], content=message.content)
+        for message in history.messages
+    ]
 
     # Add system message if needed
-    if not has_system_message and system_message:
-        sk_history.add_system_message(system_message)
-
-    # Convert all messages
-    for message in history.messages:
-        if message.role == MessageRole.SYSTEM:
-            sk_history.add_system_message(message.content)
-        elif message.role == MessageRole.USER:
-            sk_history.add_user_message(message.content)
-        elif message.role == MessageRole.ASSISTANT:
-            sk_history.add_assistant_message(message.content)
+    if system_message and not any(m.role == AuthorRole.SYSTEM for m in messages):
+        messages.insert(
+            0, ChatMessageContent(role=AuthorRole.SYSTEM, content=system_message)
+        )
 
+    sk_history = ChatHistory()
+    sk_history.messages = messages
     return sk_history
 
 
@@ -43,42 +54,22 @@ def sk_to_chat_history(sk_history: ChatHistory) -> ChatHistoryModel:
     """
     Convert Semantic Kernel ChatHistory to API ChatHistoryModel.
 
+    Messages in other roles, such as tool results, and messages without
+    text are left out. The model is validated in one call over the whole
+    history rather than message by message, which pydantic runs in its
+    compiled core; this is also quicker than `model_construct`, which
+    builds each model in Python.
+
     Args:
         sk_history: The Semantic Kernel ChatHistory object
 
     Returns:
         API ChatHistoryModel
     """
-    history = ChatHistoryModel()
-
+    messages = []
     for message in sk_history.messages:
-        role_obj = getattr(message, "role", None)
-
-        # Extract role name from Semantic Kernel AuthorRole enums
-        if role_obj is not None:
-            role_value = getattr(role_obj, "value", None)
-            role_source = role_value if role_value is not None else role_obj
-            role_str = str(role_source).lower()
-        else:
-            role_str = ""
-
-        # Extract content - handle both strings and complex objects
-        content = ""
-        if hasattr(message, "content") and message.content is not None:
-            # If content is a string, use it directly
-            if isinstance(message.content, str):
-                content = message.content
-            # Otherwise convert to string
-            else:
-                content = str(message.content)
-
-        # Only add non-empty messages
-        if content:
-            if role_str == "system":
-                history.add_system_message(content)
-            elif role_str == "user":
-                history.add_user_message(content)
-            elif role_str == "assistant":
-                history.add_assistant_message(content)
-
-    return history
+        role = _API_ROLES.get(message.role)
+        content = message.content
+        if role is not None and content:
+            messages.append({"role": role, "content": content})
+    return ChatHistoryModel.model_validate({"messages": messages})
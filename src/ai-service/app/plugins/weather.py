@@ -1,25 +1,126 @@
 """Weather plugin for Semantic Kernel - calls Azure Function."""
 
+import asyncio
+import functools
+import json
 import logging
 import os
-from typing import Annotated
+import time
+from typing import Annotated, Callable
 
 import httpx
 from semantic_kernel.functions import kernel_function
 
+from ..core import metrics
+from ..core.cache import SharedTask, SingleFlight, TTLCache
+from ..core.config import settings
+from ..core.deadline import time_left
+from ..core.resilience import classify_http_error, create_resilience, hedged
+
 logger = logging.getLogger(__name__)
 
 
+TransportWrapper = Callable[[httpx.AsyncBaseTransport], httpx.AsyncBaseTransport]
+
+
+def create_weather_http_client(
+    wrap_transport: TransportWrapper | None = None,
+) -> httpx.AsyncClient:
+    """
+    Create the pooled HTTP client used to call the weather function.
+
+    The client keeps connections alive between tool calls so repeated
+    lookups reuse the same TCP/TLS session instead of reconnecting.
+
+    Args:
+        wrap_transport: Optional wrapper around the pooled transport, e.g.
+            to record or replay traffic
+
+    Returns:
+        Configured httpx.AsyncClient
+    """
+    limits = httpx.Limits(
+        max_connections=settings.weather_http_max_connections,
+        max_keepalive_connections=settings.weather_http_max_keepalive_connections,
+        keepalive_expiry=settings.weather_http_keepalive_expiry,
+    )
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+        limits=limits, http2=settings.weather_http2
+    )
+    if wrap_transport is not None:
+        transport = wrap_transport(transport)
+    return httpx.AsyncClient(transport=transport, timeout=settings.weather_http_timeout)
+
+
+def normalize_location(location: str) -> str:
+    """
+    Normalize a location for use as a cache key.
+
+    Folds case and collapses runs of whitespace so "  new  York" and
+    "New York" share a cache entry.
+
+    Args:
+        location: Location as provided by the model
+
+    Returns:
+        Normalized cache key
+    """
+    return " ".join(location.split()).casefold()
+
+
 class WeatherPlugin:
     """Plugin to get weather information from Azure Function."""
 
-    def __init__(self):
-        """Initialize the weather plugin."""
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        wrap_transport: TransportWrapper | None = None,
+    ):
+        """
+        Initialize the weather plugin.
+
+        Args:
+            client: Optional shared HTTP client. When omitted the plugin
+                creates and owns a pooled client, closed by `aclose`.
+            wrap_transport: Optional wrapper around the owned client's
+                transport
+        """
         # Get the Azure Function URL from environment variable
         self.weather_function_url = os.getenv(
             "WeatherFunctionUrl", "http://localhost:7071"
         )
         self.weather_endpoint = f"{self.weather_function_url}/api/weather"
+        self.weather_batch_endpoint = f"{self.weather_endpoint}/batch"
+
+        self._owns_client = client is None
+        self._client = client or create_weather_http_client(wrap_transport)
+
+        # Result cache keyed by normalized location; concurrent misses for
+        # the same location share a single call to the weather function
+        self._cache: TTLCache[str, str] | None = None
+        if settings.weather_cache_enabled:
+            self._cache = TTLCache(
+                max_entries=settings.weather_cache_max_entries,
+                ttl_seconds=settings.weather_cache_ttl_seconds,
+                on_evict=lambda _key: metrics.weather_cache_evictions.add(1),
+            )
+        self._inflight: SingleFlight[str, str] = SingleFlight()
+
+        # Retries and the weather function's circuit breaker
+        self._resilience = create_resilience("weather", settings.weather_max_retries)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client if this plugin owns it."""
+        if self._owns_client and not self._client.is_closed:
+            logger.info("Closing weather plugin HTTP client")
+            await self._client.aclose()
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection to the weather function."""
+        response = await self._client.get(self.weather_function_url)
+        logger.info(
+            "Weather function connection warmed (status %d)", response.status_code
+        )
 
     @kernel_function(
         name="get_weather",
@@ -44,21 +145,292 @@ class WeatherPlugin:
             "Weather plugin called: fetching weather for location='%s'",
             location
         )
-        logger.debug("Calling Azure Function at: %s", self.weather_endpoint)
+        key = normalize_location(location)
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                metrics.weather_cache_hits.add(1)
+                logger.debug("Weather cache hit for location='%s'", key)
+                return cached
+            metrics.weather_cache_misses.add(1)
+
+        if self._inflight.is_inflight(key):
+            metrics.weather_cache_coalesced.add(1)
+            logger.debug("Joining in-flight weather request for '%s'", key)
+        return await self._inflight.do(
+            key, lambda: self._fetch_weather(key, " ".join(location.split()))
+        )
+
+    @kernel_function(
+        name="get_weather_batch",
+        description=(
+            "Get the current weather for several locations in one call. "
+            "Prefer this over repeated get_weather calls when the user "
+            "asks about more than one location."
+        ),
+    )
+    async def get_weather_batch(
+        self,
+        locations: Annotated[
+            list[str], "The locations to get weather for"
+        ],
+    ) -> Annotated[str, "JSON array of weather information, in request order"]:
+        """
+        Get weather information for several locations in one round-trip.
+
+        Cached locations are answered locally, locations already being
+        fetched join the in-flight call, and the rest are requested from
+        the Azure Function's batch endpoint. Blank locations get an error
+        object in their place, so the results still line up with the
+        request.
+
+        Args:
+            locations: The locations to get weather for
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.weather_endpoint,
-                params={"location": location},
-                timeout=10.0,
+        Returns:
+            JSON array string with one weather object per location
+        """
+        logger.info(
+            "Weather plugin called: fetching weather for %d locations: %s",
+            len(locations),
+            locations,
+        )
+        keys = [normalize_location(location) for location in locations]
+        display: dict[str, str] = {}
+        for key, location in zip(keys, locations):
+            if key:
+                display.setdefault(key, " ".join(location.split()))
+
+        results: dict[str, str] = {}
+        misses: list[str] = []
+        for key in display:
+            cached = self._cache.get(key) if self._cache is not None else None
+            if cached is not None:
+                metrics.weather_cache_hits.add(1)
+                results[key] = cached
+                continue
+            if self._cache is not None:
+                metrics.weather_cache_misses.add(1)
+            if self._inflight.is_inflight(key):
+                metrics.weather_cache_coalesced.add(1)
+            misses.append(key)
+
+        # Start one batch call per chunk of locations nobody is fetching yet
+        to_fetch = [key for key in misses if not self._inflight.is_inflight(key)]
+        size = max(settings.weather_batch_max_locations, 1)
+        batches: dict[str, SharedTask[dict[str, str]]] = {}
+        for start in range(0, len(to_fetch), size):
+            chunk = {key: display[key] for key in to_fetch[start:start + size]}
+            batch = SharedTask(self._fetch_weather_batch(chunk))
+            batches.update(dict.fromkeys(chunk, batch))
+
+        # Registered right away, so concurrent calls join these lookups
+        fetched = await asyncio.gather(
+            *(
+                self._inflight.start(
+                    key,
+                    lambda key=key: self._resolve_batched(
+                        key, display[key], batches.get(key)
+                    ),
+                ).wait()
+                for key in misses
             )
+        )
+        results.update(zip(misses, fetched))
+
+        blank = json.dumps({"error": "Location must not be empty"})
+        return "[" + ",".join(results[key] if key else blank for key in keys) + "]"
+
+    async def _resolve_batched(
+        self,
+        key: str,
+        location: str,
+        batch: SharedTask[dict[str, str]] | None,
+    ) -> str:
+        """
+        Resolve one location from its batch call.
+
+        Falls back to a single-location call when the location was not part
+        of a batch, e.g. because an in-flight call it meant to join has
+        already finished.
+
+        Args:
+            key: Normalized cache key for the location
+            location: Location to send to the weather function
+            batch: Batch call covering the location, if any
+
+        Returns:
+            JSON string with weather data
+        """
+        if batch is None:
+            return await self._fetch_weather(key, location)
+        return (await batch.wait())[key]
+
+    async def _request(
+        self, operation: str, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        """
+        Call the weather function, retrying transient failures.
+
+        Single-location lookups are hedged when
+        `weather_hedge_delay_seconds` is set.
+
+        Args:
+            operation: "single" or "batch", for metrics
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to httpx
+
+        Returns:
+            Successful response
+
+        Raises:
+            httpx.HTTPError: On non-retryable errors, or once retries are
+                exhausted
+            CircuitOpenError: If the weather function is marked unhealthy
+            DeadlineExceeded: If the request's deadline leaves no time for
+                the call
+        """
+        attempt = functools.partial(self._attempt, operation, method, url, **kwargs)
+        if operation == "single" and settings.weather_hedge_delay_seconds > 0:
+            attempt = functools.partial(
+                hedged, attempt, settings.weather_hedge_delay_seconds, "weather"
+            )
+        return await self._resilience.call(attempt, classify_http_error)
+
+    async def _attempt(
+        self, operation: str, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        """
+        Make one call to the weather function, recording latency and failures.
+
+        Args:
+            operation: "single" or "batch", for metrics
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to httpx
+
+        Returns:
+            Successful response
+
+        Raises:
+            httpx.HTTPError: On transport errors and non-2xx responses
+            DeadlineExceeded: If the request's deadline leaves no time for
+                the call
+        """
+        # Bound the call by whatever is left of the request's deadline
+        timeout = time_left("weather")
+        if timeout is not None:
+            kwargs["timeout"] = min(timeout, settings.weather_http_timeout)
+
+        started = time.perf_counter()
+        outcome = "cancelled"
+        try:
+            response = await self._client.request(method, url, **kwargs)
             response.raise_for_status()
+            outcome = "success"
+            return response
+        except Exception:
+            outcome = "error"
+            metrics.weather_request_errors.add(1, {"operation": operation})
+            raise
+        finally:
+            metrics.weather_request_duration.record(
+                time.perf_counter() - started,
+                {"operation": operation, "outcome": outcome},
+            )
+
+    async def _fetch_weather_batch(self, locations: dict[str, str]) -> dict[str, str]:
+        """
+        Call the weather function's batch endpoint and cache the results.
+
+        Results are matched to locations by the location each one echoes,
+        or by position if they do not all echo one.
+
+        Args:
+            locations: Mapping of normalized cache key to location
+
+        Returns:
+            Mapping of normalized cache key to JSON weather data
+
+        Raises:
+            ValueError: If the response lacks a result for a location
+        """
+        logger.debug(
+            "Calling Azure Function at: %s for %d locations",
+            self.weather_batch_endpoint,
+            len(locations),
+        )
+
+        response = await self._request(
+            "batch",
+            "POST",
+            self.weather_batch_endpoint,
+            json={"locations": list(locations.values())},
+        )
+
+        logger.info(
+            "Weather batch function responded: status=%d, locations=%d",
+            response.status_code,
+            len(locations),
+        )
+        logger.debug("Weather batch response: %s", response.text)
 
-            logger.info(
-                "Weather function responded: status=%d, location='%s'",
-                response.status_code,
-                location
+        items = response.json()["results"]
+        echoed = [
+            item.get("location") if isinstance(item, dict) else None
+            for item in items
+        ]
+        if all(isinstance(location, str) for location in echoed):
+            keys = [normalize_location(location) for location in echoed]
+        elif len(items) == len(locations):
+            keys = list(locations)
+        else:
+            raise ValueError(
+                f"Weather batch response has {len(items)} results for "
+                f"{len(locations)} locations"
             )
-            logger.debug("Weather response: %s", response.text)
+        results = {
+            key: json.dumps(item)
+            for key, item in zip(keys, items)
+            if key in locations
+        }
+        missing = [
+            location for key, location in locations.items() if key not in results
+        ]
+        if missing:
+            raise ValueError(
+                f"Weather batch response has no result for: {', '.join(missing)}"
+            )
+        if self._cache is not None:
+            for key, text in results.items():
+                self._cache.set(key, text)
+        return results
+
+    async def _fetch_weather(self, key: str, location: str) -> str:
+        """
+        Call the weather function and cache the result.
+
+        Args:
+            key: Normalized cache key for the location
+            location: Location to send to the weather function
+
+        Returns:
+            JSON string with weather data
+        """
+        logger.debug("Calling Azure Function at: %s", self.weather_endpoint)
+
+        response = await self._request(
+            "single", "GET", self.weather_endpoint, params={"location": location}
+        )
+
+        logger.info(
+            "Weather function responded: status=%d, location='%s'",
+            response.status_code,
+            location
+        )
+        logger.debug("Weather response: %s", response.text)
 
-            return response.text
+        if self._cache is not None:
+            self._cache.set(key, response.text)
+        return response.text
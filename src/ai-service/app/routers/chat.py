@@ -1,55 +1,379 @@
 """Chat endpoints."""
 
+import asyncio
+import json
 import logging
+from typing import Any, Awaitable, TypeVar
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+import pydantic_core
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from ..core.dependencies import AgentServiceDep
-from ..models import ChatRequest, ChatResponse
+from ..core import metrics
+from ..core.admission import (AdmissionController, AdmissionLease,
+                              AdmissionRejected)
+from ..core.config import settings
+from ..core.deadline import (Deadline, DeadlineExceeded, bind_deadline,
+                             request_deadline)
+from ..core.dependencies import AdmissionDep, AgentServiceDep
+from ..core.resilience import CircuitOpenError
+from ..models import (ChatRequest, ChatResponse, ChatUsage, StreamEvent,
+                      StreamEventType, StreamFormat)
+from ..services.agent import ChatAgentService
+from ..services.streaming import coalesce_deltas
+from ..services.usage import RequestUsage, bind_usage
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
+T = TypeVar("T")
+
+# Non-standard status (as used by nginx) recorded for requests the client
+# abandoned; the client never sees it
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnected(Exception):
+    """The client closed the connection before the response was sent."""
+
+
+async def cancel_on_disconnect(http_request: Request, work: Awaitable[T]) -> T:
+    """
+    Run work for a request, cancelling it if the client disconnects.
+
+    Listens for the ASGI disconnect message while the work runs, so an
+    abandoned request stops waiting for admission, agents, model and tool
+    calls instead of running to completion.
+
+    Args:
+        http_request: Request whose connection is watched
+        work: Work producing the response
+
+    Returns:
+        Result of the work
+
+    Raises:
+        ClientDisconnected: If the client disconnected first
+    """
+    work_task = asyncio.ensure_future(work)
+
+    async def wait_for_disconnect() -> None:
+        while (await http_request.receive())["type"] != "http.disconnect":
+            pass
+
+    watcher = asyncio.create_task(wait_for_disconnect())
+    try:
+        done, _ = await asyncio.wait(
+            {work_task, watcher}, return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        # Also reached when this handler itself is cancelled
+        watcher.cancel()
+        if not work_task.done():
+            work_task.cancel()
+    if work_task in done:
+        return work_task.result()
+    # Let the work finish unwinding (releasing its admission slot and
+    # stopping its agents) before answering
+    await asyncio.gather(work_task, return_exceptions=True)
+    raise ClientDisconnected()
+
+
+def abandoned(endpoint: str, phase: str) -> Response:
+    """
+    Record an abandoned request and build the (unsent) response.
+
+    Args:
+        endpoint: "chat" or "stream"
+        phase: "queued", "running" or "streaming"
+
+    Returns:
+        Empty response with the client-closed-request status
+    """
+    logger.info("Client disconnected (%s, %s); request cancelled", endpoint, phase)
+    metrics.requests_abandoned.add(1, {"endpoint": endpoint, "phase": phase})
+    return Response(status_code=CLIENT_CLOSED_REQUEST)
+
+
+def use_response_cache(cache_control: str | None) -> bool:
+    """
+    Decide whether a request may use the response cache.
+
+    Clients bypass the cache with `Cache-Control: no-cache` or `no-store`.
+
+    Args:
+        cache_control: Value of the Cache-Control request header
+
+    Returns:
+        False if the request asked to bypass the cache
+    """
+    if not cache_control:
+        return True
+    directives = {part.strip().lower() for part in cache_control.split(",")}
+    return not directives & {"no-cache", "no-store"}
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by pydantic's serializer.
+
+    An endpoint returning it directly skips FastAPI's response handling,
+    which validates the returned model again against the endpoint's
+    `response_model` and converts it to plain objects for `json.dumps`.
+    The `response_model` still documents the response schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+class LeasedStreamingResponse(StreamingResponse):
+    """StreamingResponse that holds an admission slot until it has been sent."""
+
+    def __init__(self, *args, lease: AdmissionLease, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lease = lease
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.lease.release()
+
+
+async def admit(admission: AdmissionController, deadline: Deadline) -> AdmissionLease:
+    """
+    Wait for an admission slot, rejecting the request if saturated.
+
+    Args:
+        admission: Worker admission controller
+        deadline: Request deadline; the wait never outlasts it
+
+    Returns:
+        Lease to release when the request finishes
+
+    Raises:
+        HTTPException: 429 or 503 with a Retry-After header
+    """
+    try:
+        return await admission.acquire(max_wait=deadline.remaining())
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+
+
+def find_circuit_open(error: BaseException) -> CircuitOpenError | None:
+    """
+    Find an open circuit behind a failed turn.
+
+    Agent frameworks wrap errors raised by model and tool calls, so the
+    cause chain is searched.
+
+    Args:
+        error: Exception raised by the turn
+
+    Returns:
+        The CircuitOpenError, or None if the turn failed for another reason
+    """
+    cause: BaseException | None = error
+    while cause is not None:
+        if isinstance(cause, CircuitOpenError):
+            return cause
+        cause = cause.__cause__ or cause.__context__
+    return None
+
+
+STREAM_MEDIA_TYPES = {
+    StreamFormat.TEXT: "text/event-stream",
+    StreamFormat.SSE: "text/event-stream",
+    StreamFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def format_event(event: StreamEvent, stream_format: StreamFormat) -> str | None:
+    """
+    Frame a stream event for the requested wire format.
+
+    The text format carries only response text as bare `data:` lines, which
+    is what existing clients append to the message. The SSE and NDJSON
+    formats send every event as JSON, so content containing newlines cannot
+    break the framing.
+
+    Args:
+        event: Event from the chat service
+        stream_format: Wire format requested by the client
+
+    Returns:
+        Framed event, or None if the event is not sent in this format
+    """
+    if stream_format == StreamFormat.NDJSON:
+        return event.model_dump_json(exclude_none=True) + "\n"
+    if stream_format == StreamFormat.SSE:
+        return (
+            f"event: {event.type.value}\n"
+            f"data: {event.model_dump_json(exclude_none=True)}\n\n"
+        )
+    if event.type == StreamEventType.DELTA:
+        return f"data: {event.content}\n\n"
+    return None
+
+
+def format_control(kind: str, stream_format: StreamFormat, detail: str = "") -> str:
+    """
+    Frame the end-of-stream or error marker for the requested wire format.
+
+    Args:
+        kind: "done" or "error"
+        stream_format: Wire format requested by the client
+        detail: Error message for "error"
+
+    Returns:
+        Framed marker
+    """
+    if stream_format == StreamFormat.TEXT:
+        if kind == "done":
+            return "data: [DONE]\n\n"
+        return f"data: [ERROR: {detail}]\n\n"
+    payload = {"type": kind}
+    if kind == "error":
+        payload["detail"] = detail
+    data = json.dumps(payload, separators=(",", ":"))
+    if stream_format == StreamFormat.NDJSON:
+        return data + "\n"
+    return f"event: {kind}\ndata: {data}\n\n"
+
 
 @router.post("/stream")
-async def chat_stream(request: ChatRequest, agent_service: AgentServiceDep):
+async def chat_stream(
+    http_request: Request,
+    request: ChatRequest,
+    agent_service: AgentServiceDep,
+    admission: AdmissionDep,
+    cache_control: str | None = Header(default=None),
+    request_timeout: float | None = Header(
+        default=None,
+        alias="X-Request-Timeout",
+        gt=0,
+        description="Seconds the client will wait for a response",
+    ),
+    stream_format: StreamFormat = Query(
+        default=StreamFormat.TEXT,
+        alias="format",
+        description=(
+            "text: bare SSE text chunks; sse: typed SSE events (delta, agent, "
+            "handoff, tool_call, tool_result, and usage if requested) with "
+            "JSON payloads; ndjson: the same events as newline-delimited JSON"
+        ),
+    ),
+):
     """
     Stream chat completion responses using Server-Sent Events (SSE).
 
     Args:
+        http_request: Raw request, watched for client disconnects
         request: Chat request containing the user message
         agent_service: Injected chat agent service
+        admission: Injected admission controller
+        cache_control: Optional Cache-Control header; no-cache/no-store
+            bypasses the response cache
+        request_timeout: Optional X-Request-Timeout header overriding the
+            endpoint's deadline
+        stream_format: Wire format of the stream
 
     Returns:
-        StreamingResponse with SSE format
+        StreamingResponse in the requested format
     """
     if not request.message or not request.message.strip():
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
+    deadline = request_deadline(request_timeout, settings.stream_timeout_seconds)
+    usage = RequestUsage("stream")
+
+    # Hold a slot for the lifetime of the stream
+    try:
+        with usage.stage("queue"):
+            lease = await cancel_on_disconnect(
+                http_request, admit(admission, deadline)
+            )
+    except ClientDisconnected:
+        return abandoned("stream", "queued")
+
     async def generate_stream():
-        """Generate SSE stream of chat responses."""
+        """Generate the framed stream of chat responses."""
+        chunk_count = 0
+        byte_count = 0
+        report: ChatUsage | None = None
+        # Model and tool calls made for this stream share its deadline and
+        # add to its usage
+        bind_deadline(deadline)
+        bind_usage(usage)
+        # StreamingResponse cancels this generator when the client
+        # disconnects; closing it cancels the orchestration
         try:
-            chunk_count = 0
-            async for chunk in agent_service.stream_chat_completion(
-                request.message, request.history
-            ):
+            events = coalesce_deltas(
+                agent_service.stream_chat_completion(
+                    request.message,
+                    request.history,
+                    request.session_id,
+                    use_cache=use_response_cache(cache_control),
+                ),
+                settings.stream_flush_interval_seconds,
+                settings.stream_flush_max_bytes,
+            )
+            async for event in events:
+                message = format_event(event, stream_format)
+                if message is None:
+                    continue
                 chunk_count += 1
-                logger.debug("Streaming chunk %d: %r", chunk_count, chunk)
-                # Format as Server-Sent Events
-                yield f"data: {chunk}\n\n"
-            # Send completion marker
+                byte_count += len(message.encode("utf-8"))
+                logger.debug("Streaming chunk %d: %r", chunk_count, message)
+                yield message
+            # Send usage (not part of the text format), then completion marker
             logger.info("Stream complete, sent %d chunks", chunk_count)
-            yield "data: [DONE]\n\n"
+            report = usage.finish()
+            if request.include_usage:
+                message = format_event(
+                    StreamEvent(type=StreamEventType.USAGE, usage=report),
+                    stream_format,
+                )
+                if message is not None:
+                    yield message
+            yield format_control("done", stream_format)
+        except (asyncio.CancelledError, GeneratorExit):
+            abandoned("stream", "streaming" if chunk_count else "running")
+            raise
+        except DeadlineExceeded as e:
+            # Whatever was streamed so far stands as a partial answer
+            logger.warning("Stream stopped after %d chunks: %s", chunk_count, e)
+            metrics.requests_deadline_exceeded.add(
+                1, {"endpoint": "stream", "stage": e.stage}
+            )
+            yield format_control("error", stream_format, str(e))
         except Exception as e:
-            # Send error in SSE format
-            logger.error("Stream error: %s", e, exc_info=True)
-            yield f"data: [ERROR: {str(e)}]\n\n"
+            # Send error in the stream's format
+            circuit_open = find_circuit_open(e)
+            if circuit_open is not None:
+                logger.warning("Stream shed: %s", circuit_open)
+                yield format_control("error", stream_format, str(circuit_open))
+            else:
+                logger.error("Stream error: %s", e, exc_info=True)
+                yield format_control("error", stream_format, str(e))
+        finally:
+            # Recorded for abandoned streams too
+            attributes = {"format": stream_format.value}
+            metrics.stream_chunks.record(chunk_count, attributes)
+            metrics.stream_bytes.record(byte_count, attributes)
+            if report is None:
+                usage.finish()
 
-    return StreamingResponse(
+    return LeasedStreamingResponse(
         generate_stream(),
-        media_type="text/event-stream",
+        lease=lease,
+        media_type=STREAM_MEDIA_TYPES[stream_format],
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -58,21 +382,26 @@ async def chat_stream(request: ChatRequest, agent_service: AgentServiceDep):
     )
 
 
-@router.post("", response_model=ChatResponse)
-async def chat(request: ChatRequest, agent_service: AgentServiceDep):
+async def complete(
+    request: ChatRequest,
+    agent_service: ChatAgentService,
+    cache_control: str | None,
+) -> ChatResponse:
     """
-    Get a complete (non-streaming) chat response.
+    Run a non-streaming chat turn once admitted.
 
     Args:
         request: Chat request containing the user message
-        agent_service: Injected chat agent service
+        agent_service: Chat agent service
+        cache_control: Optional Cache-Control header value
 
     Returns:
         ChatResponse with the complete response
-    """
-    if not request.message or not request.message.strip():
-        raise HTTPException(status_code=400, detail="Message cannot be empty")
 
+    Raises:
+        HTTPException: 504 if the deadline passes, 503 with a Retry-After
+            header if a dependency's circuit is open, 500 if the turn fails
+    """
     try:
         logger.info("Chat request received | stream=%s", request.stream)
         if request.history and request.history.messages:
@@ -86,11 +415,112 @@ async def chat(request: ChatRequest, agent_service: AgentServiceDep):
         ) = await agent_service.get_chat_completion(
             request.message,
             request.history,
+            request.session_id,
+            use_cache=use_response_cache(cache_control),
         )
         logger.info("Chat response length: %d", len(response_text))
-        return ChatResponse(response=response_text, history=updated_history)
+        return ChatResponse(
+            response=response_text,
+            history=updated_history,
+            session_id=request.session_id,
+        )
+    except DeadlineExceeded as e:
+        logger.warning("Chat request stopped: %s", e)
+        metrics.requests_deadline_exceeded.add(
+            1, {"endpoint": "chat", "stage": e.stage}
+        )
+        raise HTTPException(status_code=504, detail=str(e)) from e
     except Exception as e:
+        circuit_open = find_circuit_open(e)
+        if circuit_open is not None:
+            # Shed without a stack trace; the breaker already logged why
+            logger.warning("Chat request shed: %s", circuit_open)
+            raise HTTPException(
+                status_code=503,
+                detail=str(circuit_open),
+                headers={"Retry-After": str(max(1, round(circuit_open.retry_after)))},
+            ) from e
         logger.exception("Error processing chat request")
         raise HTTPException(
             status_code=500, detail=f"Error processing chat request: {str(e)}"
         ) from e
+
+
+@router.post("", response_model=ChatResponse)
+async def chat(
+    http_request: Request,
+    request: ChatRequest,
+    agent_service: AgentServiceDep,
+    admission: AdmissionDep,
+    cache_control: str | None = Header(default=None),
+    request_timeout: float | None = Header(
+        default=None,
+        alias="X-Request-Timeout",
+        gt=0,
+        description="Seconds the client will wait for a response",
+    ),
+):
+    """
+    Get a complete (non-streaming) chat response.
+
+    Args:
+        http_request: Raw request, watched for client disconnects
+        request: Chat request containing the user message
+        agent_service: Injected chat agent service
+        admission: Injected admission controller
+        cache_control: Optional Cache-Control header; no-cache/no-store
+            bypasses the response cache
+        request_timeout: Optional X-Request-Timeout header overriding the
+            endpoint's deadline
+
+    Returns:
+        ChatResponse with the complete response
+    """
+    if not request.message or not request.message.strip():
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+
+    deadline = request_deadline(request_timeout, settings.chat_timeout_seconds)
+    admitted = False
+
+    async def respond() -> ChatResponse:
+        nonlocal admitted
+        # Runs in its own task, so the deadline and usage stay with this
+        # request
+        bind_deadline(deadline)
+        usage = RequestUsage("chat")
+        bind_usage(usage)
+        with usage.stage("queue"):
+            lease = await admit(admission, deadline)
+        async with lease:
+            admitted = True
+            try:
+                response = await complete(request, agent_service, cache_control)
+            finally:
+                report = usage.finish()
+        if request.include_usage:
+            response.usage = report
+        return response
+
+    try:
+        return ModelJSONResponse(
+            await cancel_on_disconnect(http_request, respond())
+        )
+    except ClientDisconnected:
+        return abandoned("chat", "running" if admitted else "queued")
+
+
+@router.delete("/sessions/{session_id}", status_code=204)
+async def delete_session(session_id: str, agent_service: AgentServiceDep):
+    """
+    Delete a server-side conversation session.
+
+    Args:
+        session_id: Session id to delete
+        agent_service: Injected chat agent service
+
+    Returns:
+        Empty 204 response
+    """
+    logger.info("Deleting session %s", session_id)
+    await agent_service.session_store.delete(session_id)
+    return Response(status_code=204)
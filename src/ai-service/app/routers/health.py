@@ -1,16 +1,42 @@
 """Health check endpoints."""
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
 from ..core.config import settings
+from ..core.startup import startup_phases
+from ..core.warmup import warmup_state
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "service": settings.app_name}
+    """
+    Readiness check endpoint.
+
+    Returns 503 until the worker has finished warming up and while it is
+    shutting down; once ready, includes the startup phase timings.
+    """
+    if not warmup_state.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "starting", "service": settings.app_name},
+        )
+    return {
+        "status": "healthy",
+        "service": settings.app_name,
+        "startup": {
+            "phases": startup_phases.durations,
+            "warmup_failures": warmup_state.failures,
+        },
+    }
+
+
+@router.get("/health/live")
+async def liveness_check():
+    """Liveness check endpoint; healthy as long as the process serves."""
+    return {"status": "alive", "service": settings.app_name}
 
 
 @router.get("/")
@@ -0,0 +1,20 @@
+"""Prometheus metrics endpoint."""
+
+from fastapi import APIRouter, Response
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> Response:
+    """
+    Expose this worker's metrics in Prometheus text format.
+
+    Only mounted when PROMETHEUS_METRICS_ENABLED is set. The metrics are
+    this process's only, so `app.server` refuses to start more than one
+    worker with the endpoint enabled. Defined as a sync route so collection
+    runs in the threadpool rather than on the event loop.
+    """
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,108 @@
+"""Production server entry point running multiple uvicorn workers."""
+
+import logging
+import math
+import os
+from pathlib import Path
+
+import uvicorn
+
+from .core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpus() -> int:
+    """
+    Count the CPUs this process may use.
+
+    Honours a cgroup v2 CPU quota (as set by Container Apps and Docker
+    `--cpus`) before falling back to the scheduler affinity mask.
+
+    Returns:
+        Number of CPUs, at least 1
+    """
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    """
+    Decide how many uvicorn workers to run.
+
+    Without `SERVER_WORKERS`, there is one worker per available CPU when
+    sessions are kept in Redis. With the in-memory session store there is
+    a single worker, as a session only exists in the worker that created
+    it and requests for it reaching another worker would get 404. Recording
+    always runs a single worker, as workers appending to the same trace
+    file would interleave their records and corrupt a gzip trace.
+
+    Returns:
+        Number of workers, at least 1
+    """
+    if settings.recording_mode == "record":
+        if settings.server_workers > 1:
+            logger.warning(
+                "Ignoring SERVER_WORKERS=%d while recording; running one worker "
+                "so the trace file has a single writer",
+                settings.server_workers,
+            )
+        return 1
+    if settings.server_workers > 0:
+        workers = settings.server_workers
+        if workers > 1 and settings.session_store == "memory":
+            logger.warning(
+                "Running %d workers with the in-memory session store; "
+                "sessions are per worker. Set SESSION_STORE=redis to share "
+                "them.",
+                workers,
+            )
+        return workers
+    if settings.session_store == "memory":
+        logger.info(
+            "Using one worker with the in-memory session store; set "
+            "SESSION_STORE=redis to run one per CPU"
+        )
+        return 1
+    return available_cpus()
+
+
+def main() -> None:
+    """Run the API on warmed-up uvicorn workers."""
+    log_level = os.getenv("LOG_LEVEL", settings.log_level).lower()
+    logging.basicConfig(level=log_level.upper())
+
+    workers = worker_count()
+    if workers > 1 and settings.prometheus_metrics_enabled:
+        # Workers share the listening port, so each scrape would reach a
+        # random worker and see only its metrics
+        raise RuntimeError(
+            "PROMETHEUS_METRICS_ENABLED serves one worker's metrics; set "
+            "SERVER_WORKERS=1 to use it, or export metrics through "
+            "APPLICATIONINSIGHTS_CONNECTION_STRING with several workers"
+        )
+    logger.info("Starting %d worker(s)", workers)
+
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=workers,
+        log_level=log_level,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        timeout_keep_alive=settings.server_keepalive_timeout_seconds,
+        timeout_graceful_shutdown=settings.server_graceful_shutdown_seconds,
+    )
+
+
+if __name__ == "__main__":
+    main()
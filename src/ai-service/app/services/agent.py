@@ -1,26 +1,199 @@
 """Multi-agent chat service using Semantic Kernel orchestration."""
 
+import asyncio
+import functools
+import hashlib
+import json
 import logging
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Awaitable, Callable
 
-from azure.identity.aio import DefaultAzureCredential, get_bearer_token_provider
+import httpx
+from openai import DefaultAsyncHttpxClient
 from semantic_kernel import Kernel
 from semantic_kernel.agents import (
     ChatCompletionAgent,
-    HandoffOrchestration,
     OrchestrationHandoffs,
 )
-from semantic_kernel.agents.runtime import InProcessRuntime
+from semantic_kernel.agents.orchestration.handoffs import HANDOFF_PLUGIN_NAME
+from semantic_kernel.agents.orchestration.orchestration_base import \
+    OrchestrationResult
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
-from semantic_kernel.contents import ChatMessageContent
+from semantic_kernel.contents import (
+    ChatHistory,
+    ChatMessageContent,
+    FunctionCallContent,
+    FunctionResultContent,
+    StreamingChatMessageContent,
+)
+from semantic_kernel.contents.utils.author_role import AuthorRole
 from semantic_kernel.contents.utils.finish_reason import FinishReason
+from semantic_kernel.filters import FilterTypes
 
+from ..core import metrics
 from ..core.config import settings
-from ..models import ChatHistoryModel, chat_history_to_sk, sk_to_chat_history
+from ..core.deadline import DeadlineExceeded, time_left, within_deadline
+from ..core.recording import create_trace_session
+from ..core.token_provider import CachedTokenProvider, create_token_provider
+from ..models import (
+    ChatHistoryModel,
+    StreamEvent,
+    StreamEventType,
+    chat_history_to_sk,
+    sk_to_chat_history,
+)
 from ..plugins import WeatherPlugin
+from .cancellation import CancellableHandoffOrchestration
+from .direct_handoffs import begin_direct_run, create_direct_kernel
+from .history_window import HistoryWindow
+from .instrumented_chat import create_agent_chat_service
+from .intent import create_intent_router
+from .response_cache import create_response_cache
+from .runtime_pool import create_runtime_pool
+from .sessions import create_session_store
+from .tool_calls import bind_tool_limiter, create_tool_limiter, limit_tool_calls
+from .usage import current_usage, usage_stage
 
 logger = logging.getLogger(__name__)
 
+HANDOFF_FUNCTION_PREFIX = "transfer_to_"
+
+
+def message_to_events(message: ChatMessageContent) -> list[StreamEvent]:
+    """
+    Translate an agent message or streamed chunk into stream events.
+
+    Text chunks become deltas. Intermediate messages carrying function calls
+    or results become handoff/tool events; their text was already streamed
+    as chunks and is not repeated. The handoff plugin's complete_task call
+    is internal and produces no event.
+
+    Args:
+        message: Streamed chunk or intermediate message from an agent
+
+    Returns:
+        Events for the message, possibly empty
+    """
+    events: list[StreamEvent] = []
+    has_function_content = False
+    for item in message.items:
+        if isinstance(item, FunctionCallContent):
+            has_function_content = True
+            if item.plugin_name == HANDOFF_PLUGIN_NAME:
+                if item.function_name.startswith(HANDOFF_FUNCTION_PREFIX):
+                    events.append(
+                        StreamEvent(
+                            type=StreamEventType.HANDOFF,
+                            agent=message.name,
+                            target=item.function_name.removeprefix(
+                                HANDOFF_FUNCTION_PREFIX
+                            ),
+                        )
+                    )
+                continue
+            arguments = item.arguments
+            if arguments is not None and not isinstance(arguments, str):
+                arguments = json.dumps(dict(arguments), default=str)
+            events.append(
+                StreamEvent(
+                    type=StreamEventType.TOOL_CALL,
+                    agent=message.name,
+                    name=item.name,
+                    arguments=arguments,
+                )
+            )
+        elif isinstance(item, FunctionResultContent):
+            has_function_content = True
+            if item.plugin_name == HANDOFF_PLUGIN_NAME:
+                continue
+            events.append(
+                StreamEvent(
+                    type=StreamEventType.TOOL_RESULT,
+                    agent=message.name,
+                    name=item.name,
+                    content=str(item.result),
+                )
+            )
+    if not has_function_content and message.content:
+        events.append(
+            StreamEvent(
+                type=StreamEventType.DELTA,
+                agent=message.name,
+                content=message.content,
+            )
+        )
+    return events
+
+
+def result_to_text(result: object) -> str:
+    """
+    Extract the reply text from an agent or orchestration result.
+
+    Args:
+        result: Final ChatMessageContent, list of messages or other value
+
+    Returns:
+        Response text
+    """
+    if isinstance(result, ChatMessageContent):
+        response_text = result.content or ""
+        # Check for content filter
+        if (
+            hasattr(result, "finish_reason")
+            and result.finish_reason == FinishReason.CONTENT_FILTER
+        ):
+            logger.warning("Chat blocked by content filter")
+            if not response_text:
+                response_text = (
+                    "I'm sorry, but I can't help with that "
+                    "request. It may involve content that "
+                    "cannot be shared."
+                )
+        return response_text
+    if isinstance(result, list):
+        return " ".join(
+            str(msg.content) for msg in result if getattr(msg, "content", None)
+        )
+    return str(result)
+
+
+class OrchestrationTimer:
+    """Records the duration and handoff count of one chat turn's agent run."""
+
+    def __init__(self, route: str):
+        """
+        Start timing.
+
+        Args:
+            route: Directly invoked agent name, or "handoff"
+        """
+        self.route = route
+        self.handoffs = 0
+        self._started = time.perf_counter()
+
+    def observe(self, message: ChatMessageContent) -> None:
+        """Count the handoffs in an agent message."""
+        self.handoffs += sum(
+            1 for event in message_to_events(message)
+            if event.type == StreamEventType.HANDOFF
+        )
+
+    def finish(self, outcome: str) -> None:
+        """
+        Record the turn, also in the request's usage.
+
+        Args:
+            outcome: "success", "error" or "cancelled"
+        """
+        duration = time.perf_counter() - self._started
+        attributes = {"route": self.route, "outcome": outcome}
+        metrics.orchestration_duration.record(duration, attributes)
+        metrics.orchestration_handoffs.record(self.handoffs, {"route": self.route})
+        usage = current_usage()
+        if usage is not None:
+            usage.handoffs += self.handoffs
+            usage.add_stage("orchestration", duration)
+
 
 class ChatAgentService:
     """Multi-agent orchestration service using Semantic Kernel."""
@@ -29,28 +202,50 @@ class ChatAgentService:
         """Initialize multi-agent chat with handoff orchestration."""
         # Configure Azure OpenAI chat completion service
         # Use API key if provided, otherwise use Managed Identity
+        self._token_provider: CachedTokenProvider | None = None
         if settings.azure_openai_api_key:
             self.chat_service = AzureChatCompletion(
                 deployment_name=settings.azure_ai_model_deployment,
                 endpoint=settings.azure_ai_project_endpoint,
+                base_url=settings.azure_openai_base_url,
                 api_key=settings.azure_openai_api_key,
             )
         else:
-            # Use Managed Identity (best practice for production)
-            credential = DefaultAzureCredential()
-            token_provider = get_bearer_token_provider(
-                credential, "https://cognitiveservices.azure.com/.default"
-            )
+            # Use Managed Identity (best practice for production). Tokens are
+            # cached and refreshed in the background ahead of expiry.
+            self._token_provider = create_token_provider()
             self.chat_service = AzureChatCompletion(
                 deployment_name=settings.azure_ai_model_deployment,
                 endpoint=settings.azure_ai_project_endpoint,
-                ad_token_provider=token_provider,
+                base_url=settings.azure_openai_base_url,
+                ad_token_provider=self._token_provider,
             )
 
+        # Retries happen in the agents' chat services, which know about the
+        # request deadline and the circuit breaker; the SDK must not retry
+        # underneath them
+        self.chat_service.client = self.chat_service.client.with_options(
+            max_retries=0
+        )
+
+        # Optionally record model and weather traffic to a trace file, or
+        # serve it from one instead of the network
+        self.trace = create_trace_session()
+        wrap_weather_transport = None
+        if self.trace is not None:
+            self.chat_service.client = self.chat_service.client.with_options(
+                http_client=DefaultAsyncHttpxClient(
+                    transport=self.trace.wrap("openai", httpx.AsyncHTTPTransport())
+                )
+            )
+            wrap_weather_transport = functools.partial(self.trace.wrap, "weather")
+
         # Create kernel for query agent with weather plugin
         query_kernel = Kernel()
         query_kernel.add_service(self.chat_service)
-        query_kernel.add_plugin(WeatherPlugin(), plugin_name="weather")
+        self.weather_plugin = WeatherPlugin(wrap_transport=wrap_weather_transport)
+        query_kernel.add_plugin(self.weather_plugin, plugin_name="weather")
+        query_kernel.add_filter(FilterTypes.AUTO_FUNCTION_INVOCATION, limit_tool_calls)
 
         # Get execution settings with function calling enabled
         query_settings = query_kernel.get_prompt_execution_settings_from_service_id(
@@ -59,12 +254,23 @@ class ChatAgentService:
         from semantic_kernel.connectors.ai import FunctionChoiceBehavior
 
         query_settings.function_choice_behavior = FunctionChoiceBehavior.Auto()
+        query_settings.parallel_tool_calls = settings.query_agent_parallel_tool_calls
+        query_settings.max_tokens = settings.query_max_tokens
+        query_settings.temperature = settings.query_temperature
 
         # Create query agent with weather tool access
         from semantic_kernel.functions import KernelArguments
 
+        query_service = create_agent_chat_service(
+            self.chat_service,
+            "QueryAgent",
+            settings.query_model_deployment,
+            settings.model_fallback_deployment,
+        )
+        query_settings.ai_model_id = query_service.ai_model_id
+
         self.query_agent = ChatCompletionAgent(
-            service=self.chat_service,
+            service=query_service,
             kernel=query_kernel,
             name="QueryAgent",
             instructions=(
@@ -72,6 +278,9 @@ class ChatAgentService:
                 "weather information requests. "
                 "Use the weather tool to get current weather data "
                 "for any location the user asks about. "
+                "When the user asks about more than one location, call "
+                "get_weather_batch once with all of them instead of "
+                "calling get_weather repeatedly. "
                 "Provide clear, factual responses based on the "
                 "weather tool results. "
                 "When you have completed the weather query, use "
@@ -83,6 +292,9 @@ class ChatAgentService:
         # Create coordinator agent
         coordinator_kernel = Kernel()
         coordinator_kernel.add_service(self.chat_service)
+        coordinator_kernel.add_filter(
+            FilterTypes.AUTO_FUNCTION_INVOCATION, limit_tool_calls
+        )
 
         # Get execution settings with function calling enabled
         coordinator_settings = (
@@ -91,9 +303,22 @@ class ChatAgentService:
             )
         )
         coordinator_settings.function_choice_behavior = FunctionChoiceBehavior.Auto()
+        coordinator_settings.parallel_tool_calls = (
+            settings.coordinator_agent_parallel_tool_calls
+        )
+        coordinator_settings.max_tokens = settings.coordinator_max_tokens
+        coordinator_settings.temperature = settings.coordinator_temperature
+
+        coordinator_service = create_agent_chat_service(
+            self.chat_service,
+            "CoordinatorAgent",
+            settings.coordinator_model_deployment,
+            settings.model_fallback_deployment,
+        )
+        coordinator_settings.ai_model_id = coordinator_service.ai_model_id
 
         self.coordinator_agent = ChatCompletionAgent(
-            service=self.chat_service,
+            service=coordinator_service,
             kernel=coordinator_kernel,
             name="CoordinatorAgent",
             instructions=(
@@ -131,9 +356,32 @@ class ChatAgentService:
             "handoffs": self.handoffs,
         }
 
-        # Create and start runtime
-        self.runtime = InProcessRuntime()
-        self.runtime.start()
+        # Optional pre-router that runs clearly classified requests on the
+        # target agent directly instead of via the CoordinatorAgent
+        self.intent_router = create_intent_router()
+        self.agents_by_name = {
+            agent.name: agent for agent in self.orchestration_template["members"]
+        }
+        # Directly invoked agents are offered the same tools as in the
+        # orchestration: their instructions rely on complete_task, a
+        # misrouted request needs a transfer back, and the prompt prefix
+        # (and its cache) stays shared between the routes
+        self.direct_kernels = {
+            agent.name: create_direct_kernel(agent.kernel, self.handoffs[agent.name])
+            for agent in self.orchestration_template["members"]
+        }
+
+        # Create and start the pool of runtimes orchestrations run on
+        self.runtime_pool = create_runtime_pool()
+        self.runtime_pool.start()
+
+        # Keeps prompt history within the configured token budget
+        self.history_window = HistoryWindow(
+            create_agent_chat_service(self.chat_service, "HistorySummarizer")
+        )
+
+        # Server-side conversation histories for session-id requests
+        self.session_store = create_session_store()
 
         # System message for chat history initialization
         self.system_message = (
@@ -141,136 +389,586 @@ class ChatAgentService:
             "specialized agents for specific tasks like weather queries."
         )
 
+        # Optional exact-match cache of complete responses
+        self.response_cache = create_response_cache(self._config_fingerprint())
+
+    async def close(self) -> None:
+        """Stop the agent runtimes and release pooled HTTP connections."""
+        logger.info("Shutting down chat agent service")
+        await self.runtime_pool.stop()
+        await self.weather_plugin.aclose()
+        await self.session_store.close()
+        if self._token_provider is not None:
+            await self._token_provider.close()
+        if self.trace is not None:
+            self.trace.close()
+
+    async def warm_up_token(self) -> None:
+        """Fetch the Entra ID token so the first request does not wait for it."""
+        if self._token_provider is None:
+            logger.info("Using API key authentication; no token to fetch")
+            return
+        await self._token_provider()
+
+    async def warm_up_chat_connection(self) -> None:
+        """Open a pooled connection to Azure OpenAI (TCP, TLS and auth)."""
+        client = self.chat_service.client.with_options(max_retries=0)
+        await client.models.list()
+
+    def _record_turn(
+        self,
+        user_message: str,
+        chat_history: ChatHistoryModel | None,
+        streamed: bool,
+    ) -> None:
+        """Add a chat turn to the trace when recording."""
+        if self.trace is None:
+            return
+        self.trace.record_turn(
+            user_message,
+            chat_history.model_dump(mode="json")["messages"] if chat_history else None,
+            streamed,
+        )
+
+    def _config_fingerprint(self) -> str:
+        """
+        Hash the agent configuration that shapes responses.
+
+        Returns:
+            Hex digest of deployments, system message, agent instructions,
+            sampling settings and available tools
+        """
+        config = {
+            "deployment": settings.azure_ai_model_deployment,
+            "system_message": self.system_message,
+            "intent_router": settings.intent_router,
+            "agents": [
+                {
+                    "name": agent.name,
+                    "instructions": agent.instructions,
+                    "deployment": agent.service.ai_model_id,
+                    "settings": agent.arguments.execution_settings[
+                        settings.azure_ai_model_deployment
+                    ].model_dump(include={"max_tokens", "temperature"}),
+                    "functions": sorted(
+                        f"{f.plugin_name}-{f.name}"
+                        for f in agent.kernel.get_full_list_of_function_metadata()
+                    ),
+                }
+                for agent in self.orchestration_template["members"]
+            ],
+        }
+        return hashlib.sha256(
+            json.dumps(config, sort_keys=True).encode()
+        ).hexdigest()
+
+    def _response_cache_key(
+        self, messages: list[ChatMessageContent], use_cache: bool
+    ) -> str | None:
+        """
+        Get the response cache key for a prompt, if caching applies.
+
+        Args:
+            messages: Prompt messages ending with the new user message
+            use_cache: False when the request asked to bypass the cache
+
+        Returns:
+            Cache key, or None when the cache is disabled or bypassed
+        """
+        if self.response_cache is None or not use_cache:
+            return None
+        return self.response_cache.key(messages)
+
+    def _select_direct_agent(self, user_message: str) -> ChatCompletionAgent | None:
+        """
+        Pick an agent to run directly for a clearly classified request.
+
+        Args:
+            user_message: The user's input message
+
+        Returns:
+            Agent to invoke without handoff, or None for full orchestration
+        """
+        agent_name = (
+            self.intent_router.route(user_message) if self.intent_router else None
+        )
+        agent = self.agents_by_name.get(agent_name) if agent_name else None
+        metrics.intent_routes.add(
+            1, {"route": agent.name if agent is not None else "handoff"}
+        )
+        return agent
+
+    async def _invoke_direct(
+        self,
+        agent: ChatCompletionAgent,
+        messages: list[ChatMessageContent],
+        streaming_callback: Callable[[ChatMessageContent, bool], Awaitable[None]]
+        | None = None,
+    ) -> ChatMessageContent | None:
+        """
+        Run a single agent on the conversation, skipping handoff.
+
+        The agent is offered its orchestration tools. complete_task ends the
+        run as in the orchestration; a transfer means the intent router
+        picked the wrong agent, and the turn is left to the orchestration.
+
+        Args:
+            agent: Agent selected by the intent router
+            messages: Prompt messages ending with the new user message
+            streaming_callback: Optional callback receiving streamed chunks
+                and intermediate tool messages, same contract as the
+                orchestration's streaming callback
+
+        Returns:
+            The agent's final message, or None if it handed the turn off
+        """
+        logger.info("Fast path: invoking %s directly", agent.name)
+        outcome = begin_direct_run()
+        kernel = self.direct_kernels[agent.name]
+        if streaming_callback is None:
+            message = ChatMessageContent(role=AuthorRole.ASSISTANT, content="")
+            replies: list[ChatMessageContent] = []
+
+            async def keep_reply(message: ChatMessageContent) -> None:
+                if message.role == AuthorRole.ASSISTANT and message.content:
+                    replies.append(message)
+
+            async for item in agent.invoke(
+                messages=messages, kernel=kernel, on_intermediate_message=keep_reply
+            ):
+                message = item.message
+            # A reply written alongside the handoff call is the answer
+            if message.role == AuthorRole.TOOL and replies:
+                message = replies[-1]
+        else:
+
+            async def on_intermediate_message(message: ChatMessageContent) -> None:
+                if message.name is None:
+                    message.name = agent.name
+                await streaming_callback(message, True)
+
+            chunks: list[StreamingChatMessageContent] = []
+            async for item in agent.invoke_stream(
+                messages=messages,
+                kernel=kernel,
+                on_intermediate_message=on_intermediate_message,
+            ):
+                chunks.append(item.message)
+                await streaming_callback(item.message, False)
+            message = (
+                sum(chunks[1:], chunks[0])
+                if chunks
+                else ChatMessageContent(role=AuthorRole.ASSISTANT, content="")
+            )
+
+        if outcome.transfer_to is not None:
+            logger.info(
+                "%s transferred to %s; running the handoff orchestration",
+                agent.name,
+                outcome.transfer_to,
+            )
+            metrics.intent_misroutes.add(
+                1, {"agent": agent.name, "transfer_to": outcome.transfer_to}
+            )
+            return None
+        if outcome.summary is not None and (
+            message.role == AuthorRole.TOOL or not message.content
+        ):
+            return outcome.summary_message(agent.name)
+        return message
+
+    async def _orchestration_result(
+        self, orchestration_result: OrchestrationResult, default_timeout: float
+    ) -> object:
+        """
+        Wait for an orchestration's result within the request's deadline.
+
+        Args:
+            orchestration_result: Handle returned by the orchestration
+            default_timeout: Timeout when the request has no deadline
+
+        Returns:
+            Orchestration result
+
+        Raises:
+            DeadlineExceeded: If the deadline passes first
+        """
+        try:
+            return await orchestration_result.get(
+                timeout=time_left("orchestration", default_timeout)
+            )
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceeded("orchestration") from e
+
+    async def _run_turn(
+        self, user_message: str, messages: list[ChatMessageContent]
+    ) -> str:
+        """
+        Run one non-streaming turn on the agents and extract the reply.
+
+        Args:
+            user_message: The user's input message
+            messages: Prompt messages ending with the new user message
+
+        Returns:
+            Response text
+        """
+        direct_agent = self._select_direct_agent(user_message)
+        timer = OrchestrationTimer(
+            direct_agent.name if direct_agent is not None else "handoff"
+        )
+        orchestration: CancellableHandoffOrchestration | None = None
+        outcome = "cancelled"
+        bind_tool_limiter(create_tool_limiter())
+        try:
+            result = None
+            if direct_agent is not None:
+                result = await within_deadline(
+                    self._invoke_direct(direct_agent, messages), "orchestration"
+                )
+            if result is None:
+                if direct_agent is not None:
+                    # The direct agent transferred the turn
+                    timer.handoffs += 1
+                timer.route = "handoff"
+                logger.info("Invoking handoff orchestration for: %s", user_message)
+
+                # Create orchestration without streaming callback; agent
+                # messages are only observed for handoff metrics
+                orchestration = CancellableHandoffOrchestration(
+                    members=self.orchestration_template["members"],
+                    handoffs=self.orchestration_template["handoffs"],
+                    agent_response_callback=timer.observe,
+                )
+
+                async with self.runtime_pool.lease() as runtime:
+                    # Invoke orchestration
+                    orchestration_result = await orchestration.invoke(
+                        task=messages,
+                        runtime=runtime,
+                    )
+
+                    # Get the result within the request's deadline
+                    result = await self._orchestration_result(
+                        orchestration_result, settings.chat_timeout_seconds
+                    )
+            outcome = "success"
+        except DeadlineExceeded:
+            outcome = "timeout"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            # Client disconnects, errors and timeouts leave agents running
+            # on the shared runtime unless stopped
+            if orchestration is not None:
+                if outcome == "success":
+                    orchestration.release()
+                else:
+                    orchestration.cancel()
+            timer.finish(outcome)
+
+        return result_to_text(result)
+
+    async def _resolve_history(
+        self,
+        chat_history: ChatHistoryModel | None,
+        session_id: str | None,
+    ) -> ChatHistoryModel:
+        """
+        Get the history to run a turn against.
+
+        In session mode the stored history wins; the request history only
+        seeds a session that does not exist yet.
+
+        Args:
+            chat_history: Optional API chat history model from the request
+            session_id: Optional session id
+
+        Returns:
+            Chat history for the turn
+        """
+        if session_id:
+            stored = await self.session_store.get(session_id)
+            if stored is not None:
+                logger.debug(
+                    "Loaded session %s with %d messages",
+                    session_id,
+                    len(stored.messages),
+                )
+                return stored
+            logger.info("Starting new session %s", session_id)
+        return chat_history if chat_history is not None else ChatHistoryModel()
+
+    async def _save_streamed_turn(
+        self,
+        session_id: str,
+        sk_history: ChatHistory,
+        user_message: str,
+        response_text: str,
+    ) -> None:
+        """
+        Store a completed streamed turn in the session store.
+
+        Args:
+            session_id: Session id
+            sk_history: Prompt history including the new user message
+            user_message: The user's input message
+            response_text: The streamed assistant reply
+        """
+        if response_text:
+            sk_history.add_assistant_message(response_text)
+        await self._save_session(
+            session_id, sk_to_chat_history(sk_history), user_message, response_text
+        )
+
+    async def _save_session(
+        self,
+        session_id: str,
+        updated_history: ChatHistoryModel,
+        user_message: str,
+        response_text: str,
+    ) -> ChatHistoryModel:
+        """
+        Store the updated session history and build the turn delta.
+
+        Args:
+            session_id: Session id
+            updated_history: Full history including this turn
+            user_message: The user's input message
+            response_text: The assistant's reply
+
+        Returns:
+            History containing only the messages added by this turn
+        """
+        await self.session_store.save(session_id, updated_history)
+        delta = ChatHistoryModel()
+        delta.add_user_message(user_message)
+        if response_text:
+            delta.add_assistant_message(response_text)
+        return delta
+
     async def stream_chat_completion(
         self,
         user_message: str,
         chat_history: ChatHistoryModel | None = None,
-    ) -> AsyncGenerator[str, None]:
+        session_id: str | None = None,
+        use_cache: bool = True,
+    ) -> AsyncGenerator[StreamEvent, None]:
         """
         Stream chat completion using handoff orchestration.
 
+        Response tokens are forwarded as the answering agent generates them,
+        interleaved with agent, handoff and tool events.
+
         Args:
             user_message: The user's input message
             chat_history: Optional API chat history model for context
+            session_id: Optional session id; history is loaded from and
+                saved to the session store once the stream completes
+            use_cache: Whether the response cache may serve or store this turn
 
         Yields:
-            String chunks of the streaming response
+            Stream events; DELTA events carry the response text
         """
-        # Initialize chat history if not provided
-        if chat_history is None:
-            chat_history = ChatHistoryModel()
+        started = time.perf_counter()
+        usage = current_usage()
+        self._record_turn(user_message, chat_history, streamed=True)
+
+        with usage_stage("history"):
+            # Load session history or fall back to the request history
+            chat_history = await self._resolve_history(chat_history, session_id)
 
-        # Convert API model to Semantic Kernel ChatHistory
-        sk_history = chat_history_to_sk(chat_history, self.system_message)
+            # Convert API model to Semantic Kernel ChatHistory
+            sk_history = chat_history_to_sk(chat_history, self.system_message)
 
-        # Add user message to history
-        sk_history.add_user_message(user_message)
+            # Add user message to history
+            sk_history.add_user_message(user_message)
 
-        # Prepare task with history and current message
-        messages = []
-        for msg in sk_history.messages:
-            messages.append(msg)
+            # Prepare task with history and current message, fitted to the
+            # prompt token budget (the full history is still returned/saved)
+            messages = await self.history_window.apply(sk_history.messages)
 
-        logger.info("Starting handoff orchestration for: %s", user_message)
+        # Replay a cached response without running any agent
+        cache_key = self._response_cache_key(messages, use_cache)
+        cached = self.response_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            metrics.chat_time_to_first_token.record(
+                time.perf_counter() - started, {"route": "cache"}
+            )
+            if usage is not None:
+                usage.mark_first_token()
+            for chunk in cached.chunks:
+                yield StreamEvent(type=StreamEventType.DELTA, content=chunk)
+            if session_id:
+                await self._save_streamed_turn(
+                    session_id, sk_history, user_message, cached.text
+                )
+            return
 
-        # Use asyncio.Queue for thread-safe chunk passing
-        import asyncio
+        direct_agent = self._select_direct_agent(user_message)
+        route = direct_agent.name if direct_agent is not None else "handoff"
+        timer = OrchestrationTimer(route)
+        if direct_agent is None:
+            logger.info("Starting handoff orchestration for: %s", user_message)
 
-        chunk_queue: asyncio.Queue[str | None] = asyncio.Queue()
+        # Bounded so a slow client stalls the agents instead of letting
+        # events pile up in memory
+        event_queue: asyncio.Queue[StreamEvent | None] = asyncio.Queue(
+            maxsize=settings.stream_queue_max_events
+        )
+        current_agent: str | None = None
+        streamed_text = False
+        consumer_gone = False
 
-        async def streaming_callback(
-            chunk: object, _is_final: bool
-        ) -> None:  # StreamingChatMessageContent
-            """Callback to handle streaming chunks."""
-            # Import inside to avoid circular dependency issues
-            from semantic_kernel.contents import StreamingChatMessageContent
+        async def publish(event: StreamEvent) -> None:
+            """Queue an event for the consumer, waiting while the queue is full."""
+            if consumer_gone:
+                return
+            if event_queue.full():
+                metrics.stream_backpressure_waits.add(1)
+            await event_queue.put(event)
 
+        async def streaming_callback(chunk: ChatMessageContent, is_final: bool) -> None:
+            """Forward agent chunks and tool messages as stream events."""
+            nonlocal current_agent, streamed_text
             logger.debug(
                 "Streaming callback invoked: chunk_type=%s, is_final=%s",
                 type(chunk).__name__,
-                _is_final,
+                is_final,
             )
-
-            if isinstance(chunk, StreamingChatMessageContent):
-                # Extract text content and put in queue
-                if hasattr(chunk, "content") and chunk.content:
-                    logger.debug("Queueing chunk: %r", chunk.content)
-                    await chunk_queue.put(chunk.content)
-                else:
-                    logger.debug("Chunk has no content: %s", chunk)
-
-        # Create orchestration with streaming callback
-        orchestration = HandoffOrchestration(
-            members=self.orchestration_template["members"],
-            handoffs=self.orchestration_template["handoffs"],
-            streaming_agent_response_callback=streaming_callback,
-        )
+            for event in message_to_events(chunk):
+                event.agent = event.agent or current_agent
+                if event.agent and event.agent != current_agent:
+                    current_agent = event.agent
+                    await publish(
+                        StreamEvent(type=StreamEventType.AGENT, agent=current_agent)
+                    )
+                if event.type == StreamEventType.DELTA:
+                    streamed_text = True
+                elif event.type == StreamEventType.HANDOFF:
+                    timer.handoffs += 1
+                await publish(event)
 
         # Start orchestration in background task
         async def run_orchestration():
+            outcome = "cancelled"
+            orchestration: CancellableHandoffOrchestration | None = None
+            bind_tool_limiter(create_tool_limiter())
             try:
-                logger.info("Starting orchestration invoke")
-                orchestration_result = await orchestration.invoke(
-                    task=messages,
-                    runtime=self.runtime,
-                )
-                logger.info("Waiting for orchestration to complete")
-                # Wait for completion
-                result = await orchestration_result.get(timeout=60)
+                result = None
+                if direct_agent is not None:
+                    result = await within_deadline(
+                        self._invoke_direct(direct_agent, messages, streaming_callback),
+                        "orchestration",
+                    )
+                if result is None:
+                    timer.route = "handoff"
+                    # Create orchestration with streaming callback
+                    orchestration = CancellableHandoffOrchestration(
+                        members=self.orchestration_template["members"],
+                        handoffs=self.orchestration_template["handoffs"],
+                        streaming_agent_response_callback=streaming_callback,
+                    )
+                    async with self.runtime_pool.lease() as runtime:
+                        logger.info("Starting orchestration invoke")
+                        orchestration_result = await orchestration.invoke(
+                            task=messages,
+                            runtime=runtime,
+                        )
+                        logger.info("Waiting for orchestration to complete")
+                        # Wait for completion within the request's deadline
+                        result = await self._orchestration_result(
+                            orchestration_result, settings.stream_timeout_seconds
+                        )
                 logger.info(
                     "Orchestration complete, result type: %s",
                     type(result).__name__,
                 )
 
-                # Fallback streaming if no native chunks
-                if chunk_queue.empty():
-                    logger.info("No streaming chunks; using fallback word streaming")
-                    from semantic_kernel.contents import ChatMessageContent
-
-                    if isinstance(result, ChatMessageContent):
-                        text = result.content or ""
-                    elif isinstance(result, list):
-                        text = " ".join(
-                            str(m.content)
-                            for m in result
-                            if hasattr(m, "content") and m.content
+                # The agent may end the task without streaming any text (for
+                # example by passing its answer straight to complete_task);
+                # only then send the final result as a single delta
+                if not streamed_text:
+                    text = result_to_text(result)
+                    if text:
+                        logger.info("No text was streamed; sending final result")
+                        await publish(
+                            StreamEvent(
+                                type=StreamEventType.DELTA,
+                                agent=current_agent,
+                                content=text,
+                            )
                         )
-                    else:
-                        text = str(result)
-
-                    # Push word-sized chunks (granularity adjustable)
-                    for i, word in enumerate(text.split()):
-                        # Prefix space except first word to preserve spacing
-                        await chunk_queue.put((" " + word) if i else word)
+                outcome = "success"
+            except DeadlineExceeded as e:
+                outcome = "timeout"
+                logger.warning("Orchestration stopped: %s", e)
+                raise
             except Exception as e:
+                outcome = "error"
                 logger.error("Orchestration error: %s", e, exc_info=True)
                 raise
             finally:
-                # Signal completion by putting None in queue
+                if orchestration is not None:
+                    if outcome == "success":
+                        orchestration.release()
+                    else:
+                        orchestration.cancel()
+                timer.finish(outcome)
+                # Signal completion by putting None in queue (nobody is
+                # reading once the consumer has gone)
                 logger.info("Signaling stream completion")
-                await chunk_queue.put(None)
+                if not consumer_gone:
+                    await event_queue.put(None)
 
         # Create background task
         orchestration_task = asyncio.create_task(run_orchestration())
 
         try:
-            # Yield chunks as they arrive
-            logger.info("Starting to yield chunks from queue")
-            chunk_count = 0
+            # Yield events as they arrive
+            logger.info("Starting to yield events from queue")
+            event_count = 0
+            response_parts: list[str] = []
             while True:
-                chunk = await chunk_queue.get()
-                if chunk is None:
+                event = await event_queue.get()
+                if event is None:
                     # Orchestration complete
                     logger.info(
-                        "Received completion signal, yielded %d chunks",
-                        chunk_count,
+                        "Received completion signal, yielded %d events",
+                        event_count,
                     )
                     break
-                chunk_count += 1
-                logger.debug("Yielding chunk %d: %r", chunk_count, chunk)
-                yield chunk
+                event_count += 1
+                if event.type == StreamEventType.DELTA:
+                    if not response_parts:
+                        metrics.chat_time_to_first_token.record(
+                            time.perf_counter() - started, {"route": route}
+                        )
+                        if usage is not None:
+                            usage.mark_first_token()
+                    response_parts.append(event.content or "")
+                logger.debug("Yielding event %d: %r", event_count, event)
+                yield event
+
+            # Surface orchestration failures instead of ending the stream
+            # (or keeping a partial turn) silently
+            await orchestration_task
+            if session_id or cache_key:
+                response_text = "".join(response_parts)
+                if cache_key:
+                    self.response_cache.set(cache_key, response_text, response_parts)
+                if session_id:
+                    await self._save_streamed_turn(
+                        session_id, sk_history, user_message, response_text
+                    )
         finally:
-            # Ensure task is cleaned up
+            # Stop queueing and release agent callbacks blocked on a full
+            # queue, then ensure task is cleaned up
+            consumer_gone = True
+            while not event_queue.empty():
+                event_queue.get_nowait()
             if not orchestration_task.done():
                 orchestration_task.cancel()
                 try:
@@ -282,6 +980,8 @@ class ChatAgentService:
         self,
         user_message: str,
         chat_history: ChatHistoryModel | None = None,
+        session_id: str | None = None,
+        use_cache: bool = True,
     ) -> tuple[str, ChatHistoryModel]:
         """
         Get non-streaming chat completion using handoff orchestration.
@@ -289,63 +989,38 @@ class ChatAgentService:
         Args:
             user_message: The user's input message
             chat_history: Optional API chat history model for context
+            session_id: Optional session id; history is loaded from and
+                saved to the session store
+            use_cache: Whether the response cache may serve or store this turn
 
         Returns:
-            Tuple of (response text, updated chat history)
+            Tuple of (response text, updated chat history). In session mode
+            the history holds only the messages added by this turn.
         """
-        # Initialize chat history if not provided
-        if chat_history is None:
-            chat_history = ChatHistoryModel()
-
-        # Convert API model to Semantic Kernel ChatHistory
-        sk_history = chat_history_to_sk(chat_history, self.system_message)
+        self._record_turn(user_message, chat_history, streamed=False)
 
-        # Add user message to history
-        sk_history.add_user_message(user_message)
+        with usage_stage("history"):
+            # Load session history or fall back to the request history
+            chat_history = await self._resolve_history(chat_history, session_id)
 
-        # Prepare task with history and current message
-        messages = []
-        for msg in sk_history.messages:
-            messages.append(msg)
-
-        logger.info("Invoking handoff orchestration for: %s", user_message)
-
-        # Create orchestration without streaming callback
-        orchestration = HandoffOrchestration(
-            members=self.orchestration_template["members"],
-            handoffs=self.orchestration_template["handoffs"],
-        )
+            # Convert API model to Semantic Kernel ChatHistory
+            sk_history = chat_history_to_sk(chat_history, self.system_message)
 
-        # Invoke orchestration
-        orchestration_result = await orchestration.invoke(
-            task=messages,
-            runtime=self.runtime,
-        )
+            # Add user message to history
+            sk_history.add_user_message(user_message)
 
-        # Get the result
-        result = await orchestration_result.get(timeout=60)
+            # Prepare task with history and current message, fitted to the
+            # prompt token budget (the full history is still returned/saved)
+            messages = await self.history_window.apply(sk_history.messages)
 
-        # Extract response text
-        if isinstance(result, ChatMessageContent):
-            response_text = result.content or ""
-            # Check for content filter
-            if (
-                hasattr(result, "finish_reason")
-                and result.finish_reason == FinishReason.CONTENT_FILTER
-            ):
-                logger.warning("Chat blocked by content filter")
-                if not response_text:
-                    response_text = (
-                        "I'm sorry, but I can't help with that "
-                        "request. It may involve content that "
-                        "cannot be shared."
-                    )
-        elif isinstance(result, list):
-            response_text = " ".join(
-                str(msg.content) for msg in result if hasattr(msg, "content")
-            )
+        cache_key = self._response_cache_key(messages, use_cache)
+        cached = self.response_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            response_text = cached.text
         else:
-            response_text = str(result)
+            response_text = await self._run_turn(user_message, messages)
+            if cache_key:
+                self.response_cache.set(cache_key, response_text)
 
         # Add response to history
         if response_text:
@@ -354,4 +1029,10 @@ class ChatAgentService:
         # Convert back to API model
         updated_history = sk_to_chat_history(sk_history)
 
+        if session_id:
+            delta = await self._save_session(
+                session_id, updated_history, user_message, response_text
+            )
+            return response_text, delta
+
         return response_text, updated_history
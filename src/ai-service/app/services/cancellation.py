@@ -0,0 +1,204 @@
+"""Cancellation and deadlines of handoff orchestrations on the agent runtime."""
+
+import asyncio
+import inspect
+import logging
+import weakref
+from types import SimpleNamespace
+
+from semantic_kernel.agents import HandoffOrchestration
+from semantic_kernel.agents.orchestration.orchestration_base import (
+    OrchestrationResult, TIn, TOut)
+from semantic_kernel.agents.runtime.in_process.message_handler_context import \
+    MessageHandlerContext
+
+from ..core import metrics
+from ..core.deadline import Deadline, bind_deadline, current_deadline
+from .tool_calls import bind_tool_limiter, current_tool_limiter
+from .usage import RequestUsage, bind_usage, current_usage
+
+logger = logging.getLogger(__name__)
+
+
+def _check_runtime_internals() -> None:
+    """
+    Check the private Semantic Kernel APIs this module builds on.
+
+    They are `HandoffOrchestration._prepare` and the actor type naming of
+    `_get_agent_actor_type`, which `CancellableHandoffOrchestration`
+    overrides and parses, and `MessageHandlerContext.agent_id`.
+    semantic-kernel is pinned to an exact version in pyproject.toml. This
+    makes an upgrade that changes them fail on import rather than quietly
+    stop cancelling orchestrations and applying their deadlines.
+
+    Raises:
+        RuntimeError: If one of them is missing or has changed
+    """
+    prepare = getattr(HandoffOrchestration, "_prepare", None)
+    if prepare is None or list(inspect.signature(prepare).parameters) != [
+        "self",
+        "runtime",
+        "internal_topic_type",
+        "exception_callback",
+        "result_callback",
+    ]:
+        raise RuntimeError(
+            "Unsupported semantic-kernel version: HandoffOrchestration._prepare "
+            "has changed"
+        )
+    actor_type = getattr(HandoffOrchestration, "_get_agent_actor_type", None)
+    if actor_type is None or actor_type(
+        None, SimpleNamespace(name="Agent"), "topic"
+    ) != "Agent_topic":
+        raise RuntimeError(
+            "Unsupported semantic-kernel version: agent actor types are no "
+            "longer named <agent>_<topic>"
+        )
+    if not callable(getattr(MessageHandlerContext, "agent_id", None)):
+        raise RuntimeError(
+            "Unsupported semantic-kernel version: "
+            "MessageHandlerContext.agent_id is missing"
+        )
+
+
+_check_runtime_internals()
+
+
+class _OrchestrationScope:
+    """Request state shared with an orchestration's runtime tasks."""
+
+    def __init__(
+        self,
+        deadline: Deadline | None,
+        tool_limiter: asyncio.Semaphore | None,
+        usage: RequestUsage | None,
+    ):
+        self.deadline = deadline
+        self.tool_limiter = tool_limiter
+        self.usage = usage
+        self.tasks: set[asyncio.Task] = set()
+
+
+# Running orchestrations, by topic
+_scopes: dict[str, _OrchestrationScope] = {}
+
+# Agent runs stopped by CancellableHandoffOrchestration.cancel
+_cancelled_tasks: weakref.WeakSet[asyncio.Task] = weakref.WeakSet()
+
+# Loggers through which the agent runtime reports a message handler's
+# exception, from within the handler's task
+_RUNTIME_LOGGERS = (
+    "semantic_kernel.agents.orchestration.agent_actor_base",
+    "in_process_runtime",
+    "in_process_runtime.events",
+)
+
+
+class _CancelledRunFilter(logging.Filter):
+    """Drops the runtime's error reports for agent runs that were cancelled."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            return True
+        return task is None or task not in _cancelled_tasks
+
+
+for _name in _RUNTIME_LOGGERS:
+    logging.getLogger(_name).addFilter(_CancelledRunFilter())
+
+
+def bind_agent_task() -> None:
+    """
+    Bind the current task to its orchestration if it runs one's agent.
+
+    The agent runtime handles messages in its own tasks, which neither
+    inherit the request's context nor are reached by cancelling the
+    request. Agents' chat services call this before each model call, so
+    the task gets the request's deadline, tool call limit and usage, and
+    `CancellableHandoffOrchestration.cancel` can cancel it along with its
+    in-flight model and tool HTTP calls. Calls outside a runtime message
+    handler (direct agent runs, history summaries) already run in the
+    request's task and are ignored.
+    """
+    try:
+        agent_id = MessageHandlerContext.agent_id()
+    except RuntimeError:
+        return
+    task = asyncio.current_task()
+    if task is None:
+        return
+    # Actor types are "<agent name>_<orchestration topic>"
+    scope = _scopes.get(agent_id.type.rpartition("_")[2])
+    if scope is None or task in scope.tasks:
+        return
+    bind_deadline(scope.deadline)
+    bind_tool_limiter(scope.tool_limiter)
+    bind_usage(scope.usage)
+    scope.tasks.add(task)
+    task.add_done_callback(scope.tasks.discard)
+
+
+class CancellableHandoffOrchestration(HandoffOrchestration[TIn, TOut]):
+    """
+    HandoffOrchestration that can be stopped mid-run.
+
+    `OrchestrationResult.cancel` only stops agents from handling further
+    messages; an agent that is already answering keeps calling the model.
+    `cancel` additionally cancels the runtime tasks running this
+    orchestration's agents. The agents also run under the deadline, tool
+    call limit and usage that were current when the orchestration was
+    invoked. Call `cancel` or `release` once the orchestration is over.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._topic: str | None = None
+        self._result: OrchestrationResult | None = None
+
+    async def _prepare(
+        self, runtime, internal_topic_type, exception_callback, result_callback
+    ):
+        self._topic = internal_topic_type
+        _scopes[internal_topic_type] = _OrchestrationScope(
+            current_deadline(), current_tool_limiter(), current_usage()
+        )
+        await super()._prepare(
+            runtime, internal_topic_type, exception_callback, result_callback
+        )
+
+    async def invoke(self, task, runtime) -> OrchestrationResult[TOut]:
+        self._result = await super().invoke(task, runtime)
+        return self._result
+
+    def cancel(self) -> int:
+        """
+        Stop the orchestration if it is still running.
+
+        Safe to call at any point, including after completion.
+
+        Returns:
+            Number of in-flight agent runs cancelled
+        """
+        if self._result is not None and not self._result.event.is_set():
+            self._result.cancel()
+        scope = _scopes.pop(self._topic, None) if self._topic else None
+        if scope is None:
+            return 0
+        cancelled = 0
+        for task in list(scope.tasks):
+            if not task.done():
+                # The runtime logs the CancelledError as an agent failure
+                _cancelled_tasks.add(task)
+                task.cancel()
+                cancelled += 1
+        if cancelled:
+            metrics.agent_calls_cancelled.add(cancelled)
+            logger.info("Cancelled %d in-flight agent runs", cancelled)
+        return cancelled
+
+    def release(self) -> None:
+        """Forget a finished orchestration without cancelling anything."""
+        if self._topic is not None:
+            _scopes.pop(self._topic, None)
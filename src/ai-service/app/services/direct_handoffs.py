@@ -0,0 +1,127 @@
+"""The handoff orchestration's tools for agents invoked directly."""
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from semantic_kernel import Kernel
+from semantic_kernel.agents.orchestration.handoffs import (
+    HANDOFF_PLUGIN_NAME,
+    AgentHandoffs,
+)
+from semantic_kernel.contents import AuthorRole, ChatMessageContent
+from semantic_kernel.filters import AutoFunctionInvocationContext, FilterTypes
+from semantic_kernel.functions import (
+    KernelFunctionFromMethod,
+    KernelPlugin,
+    kernel_function,
+)
+
+# Description of the orchestration's complete_task (semantic-kernel 1.37),
+# repeated so both routes send the model the same tool schema
+COMPLETE_TASK_DESCRIPTION = (
+    "Complete the task with a summary when no further requests are given."
+)
+
+
+@dataclass
+class HandoffOutcome:
+    """How a direct agent run ended, if through a handoff tool."""
+
+    summary: str | None = None
+    transfer_to: str | None = None
+
+    def summary_message(self, agent_name: str) -> ChatMessageContent:
+        """The completed task's summary, worded as the orchestration's result."""
+        return ChatMessageContent(
+            role=AuthorRole.ASSISTANT,
+            name=agent_name,
+            content=f"Task is completed with summary: {self.summary}",
+        )
+
+
+_outcome: ContextVar[HandoffOutcome | None] = ContextVar(
+    "direct_handoff_outcome", default=None
+)
+
+
+def begin_direct_run() -> HandoffOutcome:
+    """
+    Start tracking the handoff tools of a direct run in the current task.
+
+    Returns:
+        Outcome filled in if the agent calls complete_task or transfers
+    """
+    outcome = HandoffOutcome()
+    _outcome.set(outcome)
+    return outcome
+
+
+class _DirectHandoffFunctions:
+    """Handoff functions recording their call in the current run's outcome."""
+
+    @kernel_function(name="complete_task", description=COMPLETE_TASK_DESCRIPTION)
+    async def complete_task(self, task_summary: str) -> None:
+        outcome = _outcome.get()
+        if outcome is not None:
+            outcome.summary = task_summary
+
+    def transfer_function(
+        self, agent_name: str, description: str
+    ) -> KernelFunctionFromMethod:
+        """A parameterless transfer_to_<agent> function, as the orchestration's."""
+
+        @kernel_function(name=f"transfer_to_{agent_name}", description=description)
+        async def transfer() -> None:
+            outcome = _outcome.get()
+            if outcome is not None:
+                outcome.transfer_to = agent_name
+
+        return KernelFunctionFromMethod(transfer, plugin_name=HANDOFF_PLUGIN_NAME)
+
+
+async def _end_run_on_handoff(
+    context: AutoFunctionInvocationContext,
+    next: Callable[[AutoFunctionInvocationContext], Awaitable[None]],
+) -> None:
+    """Auto function invocation filter ending the run after a handoff tool."""
+    await next(context)
+    if context.function.plugin_name == HANDOFF_PLUGIN_NAME:
+        context.terminate = True
+
+
+def create_direct_kernel(kernel: Kernel, handoffs: AgentHandoffs) -> Kernel:
+    """
+    Create the kernel an agent runs on when invoked directly.
+
+    It offers the same Handoff tools, with the same schemas and in the same
+    order, as the handoff orchestration adds to the agent, so the agent's
+    prompts start the same way on either route and share the model
+    service's prompt cache. Calling one of them ends the run like in the
+    orchestration; see `begin_direct_run` for how the caller learns of it.
+
+    Args:
+        kernel: The agent's kernel; left unchanged
+        handoffs: The agent's handoff targets and their descriptions
+
+    Returns:
+        Kernel with the agent's plugins, filters and Handoff tools
+    """
+    functions = _DirectHandoffFunctions()
+    direct = kernel.clone()
+    direct.add_plugin(
+        plugin=KernelPlugin(
+            name=HANDOFF_PLUGIN_NAME,
+            functions=[
+                *(
+                    functions.transfer_function(agent_name, description)
+                    for agent_name, description in handoffs.items()
+                ),
+                KernelFunctionFromMethod(
+                    functions.complete_task, plugin_name=HANDOFF_PLUGIN_NAME
+                ),
+            ],
+        )
+    )
+    direct.add_filter(FilterTypes.AUTO_FUNCTION_INVOCATION, _end_run_on_handoff)
+    return direct
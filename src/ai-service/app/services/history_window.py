@@ -0,0 +1,242 @@
+"""Token-budgeted prompt history windowing with rolling summaries."""
+
+import hashlib
+import logging
+
+from semantic_kernel.connectors.ai.chat_completion_client_base import (
+    ChatCompletionClientBase,
+)
+from semantic_kernel.contents import ChatHistory, ChatMessageContent
+from semantic_kernel.contents.utils.author_role import AuthorRole
+
+from ..core import metrics
+from ..core.cache import SingleFlight, TTLCache
+from ..core.config import settings
+from ..core.tokens import count_message_tokens, load_tokenizer
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain a running summary of a conversation between a user and "
+    "an AI assistant. Merge the previous summary (if any) with the new "
+    "messages into one concise summary. Keep names, locations, facts, "
+    "decisions and user preferences; drop greetings and filler. "
+    "Reply with the summary only."
+)
+
+
+class HistoryWindow:
+    """
+    Fits prompt history into a token budget.
+
+    System messages and the most recent messages are always kept. Leading
+    system messages stay in front; later ones stay in place, or move up
+    behind them when the turns around them are dropped. Older turns are
+    dropped in fixed-size chunks so the cut point, and therefore
+    the rolling summary of what was dropped, only changes every few turns
+    and can be served from cache in between.
+    """
+
+    def __init__(self, chat_service: ChatCompletionClientBase):
+        """
+        Initialize the history window from settings.
+
+        Args:
+            chat_service: Chat completion service used to write summaries
+        """
+        self._chat_service = chat_service
+        self.token_budget = settings.history_token_budget
+        self.strategy = settings.history_strategy
+        self.min_recent_messages = max(settings.history_min_recent_messages, 1)
+        self.chunk_messages = max(settings.history_chunk_messages, 1)
+        self.summary_max_tokens = settings.history_summary_max_tokens
+
+        # Summaries keyed by the hash chain of the messages they cover
+        self._summaries: TTLCache[str, str] = TTLCache(
+            max_entries=settings.history_summary_cache_entries,
+            ttl_seconds=settings.history_summary_cache_ttl_seconds,
+        )
+        self._inflight: SingleFlight[str, str] = SingleFlight()
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if a token budget is configured."""
+        return self.token_budget > 0
+
+    async def apply(
+        self, messages: list[ChatMessageContent]
+    ) -> list[ChatMessageContent]:
+        """
+        Window the prompt messages to fit the token budget.
+
+        Args:
+            messages: Full prompt history, ending with the new user message
+
+        Returns:
+            Messages to send to the model
+        """
+        if not self.enabled:
+            return list(messages)
+
+        await load_tokenizer()
+        lead = 0
+        while lead < len(messages) and messages[lead].role == AuthorRole.SYSTEM:
+            lead += 1
+        pinned, rest = list(messages[:lead]), list(messages[lead:])
+        turns = [m for m in rest if m.role != AuthorRole.SYSTEM]
+        pinned_tokens = sum(
+            count_message_tokens(m.content)
+            for m in messages
+            if m.role == AuthorRole.SYSTEM
+        )
+        turn_tokens = [count_message_tokens(m.content) for m in turns]
+
+        if pinned_tokens + sum(turn_tokens) <= self.token_budget:
+            return list(messages)
+
+        available = self.token_budget - pinned_tokens
+        if self.strategy == "summarize":
+            available -= self.summary_max_tokens
+
+        # Smallest chunk-aligned cut whose remaining turns fit the budget
+        max_cut = max(len(turns) - self.min_recent_messages, 0)
+        remaining = sum(turn_tokens)
+        cut = 0
+        while cut < max_cut and remaining > available:
+            step = min(self.chunk_messages, max_cut - cut)
+            remaining -= sum(turn_tokens[cut:cut + step])
+            cut += step
+
+        if cut == 0:
+            return list(messages)
+
+        dropped = turns[:cut]
+        start = next(i for i, m in enumerate(rest) if m is turns[cut])
+        # System messages among the dropped turns are kept, in order
+        pinned += [m for m in rest[:start] if m.role == AuthorRole.SYSTEM]
+        kept = rest[start:]
+        metrics.history_messages_dropped.add(len(dropped))
+        logger.info(
+            "History over budget (%d tokens): dropping %d of %d messages",
+            self.token_budget,
+            len(dropped),
+            len(turns),
+        )
+
+        if self.strategy == "summarize":
+            summary = await self._summarize(dropped)
+            if summary:
+                pinned = pinned + [
+                    ChatMessageContent(
+                        role=AuthorRole.SYSTEM, content=SUMMARY_PREFIX + summary
+                    )
+                ]
+
+        return pinned + kept
+
+    async def _summarize(self, dropped: list[ChatMessageContent]) -> str | None:
+        """
+        Get the rolling summary covering the dropped messages.
+
+        Reuses the cached summary for the longest already-summarized prefix
+        and only folds in the messages dropped since then.
+
+        Args:
+            dropped: Messages removed from the prompt, oldest first
+
+        Returns:
+            Summary text, or None if summarization failed
+        """
+        chain = _hash_chain(dropped)
+        covered = 0
+        previous: str | None = None
+        for index in range(len(chain), 0, -1):
+            previous = self._summaries.get(chain[index - 1])
+            if previous is not None:
+                covered = index
+                break
+
+        if covered == len(dropped):
+            metrics.history_summary_cache_hits.add(1)
+            return previous
+
+        key = chain[-1]
+        try:
+            return await self._inflight.do(
+                key,
+                lambda: self._write_summary(key, previous, dropped[covered:]),
+            )
+        except Exception as e:
+            logger.warning("History summarization failed, truncating: %s", e)
+            return None
+
+    async def _write_summary(
+        self,
+        key: str,
+        previous: str | None,
+        new_messages: list[ChatMessageContent],
+    ) -> str:
+        """
+        Ask the model to fold new messages into the previous summary.
+
+        Args:
+            key: Cache key for the resulting summary
+            previous: Summary of the messages before `new_messages`, if any
+            new_messages: Messages to fold into the summary
+
+        Returns:
+            Updated summary text
+        """
+        transcript = "\n".join(
+            f"{m.role.value.capitalize()}: {m.content}"
+            for m in new_messages
+            if m.content
+        )
+        prompt = (
+            f"Previous summary:\n{previous or '(none)'}\n\n"
+            f"New messages:\n{transcript}"
+        )
+
+        history = ChatHistory()
+        history.add_system_message(SUMMARY_INSTRUCTIONS)
+        history.add_user_message(prompt)
+
+        execution_settings = self._chat_service.get_prompt_execution_settings_class()(
+            max_tokens=self.summary_max_tokens,
+            temperature=0.0,
+        )
+        logger.info("Summarizing %d dropped messages", len(new_messages))
+        result = await self._chat_service.get_chat_message_content(
+            history, execution_settings
+        )
+        summary = (result.content if result else "") or ""
+        metrics.history_summaries.add(1)
+        self._summaries.set(key, summary)
+        return summary
+
+
+def _hash_chain(messages: list[ChatMessageContent]) -> list[str]:
+    """
+    Hash each prefix of a message list.
+
+    Element i identifies messages[:i + 1], so a conversation that grows by
+    appending shares its earlier hashes with previous turns.
+
+    Args:
+        messages: Messages to hash
+
+    Returns:
+        Hex digests, one per prefix
+    """
+    chain: list[str] = []
+    digest = b""
+    for message in messages:
+        hasher = hashlib.sha256(digest)
+        hasher.update(message.role.value.encode())
+        hasher.update(b"\0")
+        hasher.update((message.content or "").encode())
+        digest = hasher.digest()
+        chain.append(digest.hex())
+    return chain
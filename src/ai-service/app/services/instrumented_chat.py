@@ -0,0 +1,337 @@
+"""Azure OpenAI chat completion services for agents, with per-agent metrics."""
+
+import logging
+import time
+from typing import Any, AsyncGenerator
+
+import openai
+from pydantic import PrivateAttr
+from semantic_kernel.connectors.ai.completion_usage import CompletionUsage
+from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+from semantic_kernel.connectors.ai.prompt_execution_settings import (
+    PromptExecutionSettings,
+)
+from semantic_kernel.contents import (
+    ChatHistory,
+    ChatMessageContent,
+    StreamingChatMessageContent,
+)
+
+from ..core import metrics
+from ..core.config import settings
+from ..core.deadline import time_left
+from ..core.resilience import (RETRYABLE_STATUSES, CircuitOpenError, Failure,
+                               Resilience, create_resilience,
+                               parse_retry_after)
+from .cancellation import bind_agent_task
+from .tool_calls import order_tool_results
+from .usage import current_usage, usage_stage
+
+logger = logging.getLogger(__name__)
+
+
+def classify_model_error(error: BaseException) -> Failure:
+    """
+    Classify a chat completion failure by the OpenAI error behind it.
+
+    Semantic Kernel wraps client errors, so the cause chain is searched.
+
+    Args:
+        error: Exception raised by the chat completion call
+
+    Returns:
+        Failure telling whether to retry and how long to wait
+    """
+    cause: BaseException | None = error
+    while cause is not None:
+        if isinstance(cause, openai.APIStatusError):
+            return Failure(
+                cause.status_code in RETRYABLE_STATUSES,
+                str(cause.status_code),
+                parse_retry_after(cause.response.headers),
+                cause.status_code,
+            )
+        if isinstance(cause, openai.APITimeoutError):
+            return Failure(True, "timeout")
+        if isinstance(cause, openai.APIConnectionError):
+            return Failure(True, "connection")
+        cause = cause.__cause__
+    return Failure(False, type(error).__name__)
+
+
+def is_throttled(failure: Failure) -> bool:
+    """Whether a classified model failure is throttling (HTTP 429)."""
+    return failure.reason == "429"
+
+
+def _request_settings(
+    settings: PromptExecutionSettings, deployment: str
+) -> PromptExecutionSettings:
+    """
+    Adjust an agent's execution settings for one call.
+
+    The request names the deployment as its model, which must be this
+    service's (it differs on fallback). `parallel_tool_calls` is dropped
+    from requests offering no tools: the API rejects it there, and Semantic
+    Kernel removes the tools for the final call once the auto-invoke limit
+    is reached.
+
+    Args:
+        settings: Execution settings for the call
+        deployment: Deployment the call goes to
+
+    Returns:
+        Settings to send; a copy when changed, so the agent's own settings
+        are left alone
+    """
+    update: dict[str, Any] = {}
+    if getattr(settings, "ai_model_id", deployment) != deployment:
+        update["ai_model_id"] = deployment
+    if getattr(settings, "parallel_tool_calls", None) is not None and not getattr(
+        settings, "tools", None
+    ):
+        update["parallel_tool_calls"] = None
+    return settings.model_copy(update=update) if update else settings
+
+
+class InstrumentedAzureChatCompletion(AzureChatCompletion):
+    """
+    AzureChatCompletion that records latency and token usage per agent.
+
+    Each agent gets its own instance, on its own deployment, sharing the
+    underlying OpenAI connection pool, so `agent_name` and the deployment
+    identify which agent's calls are slow or expensive. Calls made on the
+    agent runtime are also bound to their orchestration for cancellation
+    and deadlines. Transient failures are retried and tracked by the
+    deployment's circuit breaker; the OpenAI client's own retries should
+    be disabled. When the deployment is throttled or its breaker is open,
+    a configured fallback service answers instead. Results of concurrent
+    tool calls are put back in call order before the next model call.
+    """
+
+    agent_name: str = "unknown"
+    _resilience: Resilience | None = PrivateAttr(default=None)
+    _fallback: "InstrumentedAzureChatCompletion | None" = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        self._resilience = create_resilience(
+            f"azure_openai:{self.ai_model_id}", settings.model_max_retries
+        )
+
+    async def _inner_get_chat_message_contents(
+        self,
+        chat_history: ChatHistory,
+        settings: PromptExecutionSettings,
+    ) -> list[ChatMessageContent]:
+        bind_agent_task()
+        # Do not start a model call that cannot finish in time
+        time_left("model")
+        order_tool_results(chat_history)
+        settings = _request_settings(settings, self.ai_model_id)
+        started = time.perf_counter()
+        outcome = "cancelled"
+        try:
+            complete = super()._inner_get_chat_message_contents
+            with usage_stage("model"):
+                messages = await self._resilience.call(
+                    lambda: complete(chat_history, settings),
+                    classify_model_error,
+                    self._give_up,
+                )
+            outcome = "success"
+        except Exception as e:
+            if not self._falls_back(e):
+                outcome = "error"
+                raise
+            outcome = "fallback"
+        finally:
+            self._record_duration(started, outcome, streaming=False)
+        if outcome == "fallback":
+            return await self._fallback._inner_get_chat_message_contents(
+                chat_history, settings
+            )
+        self._record_usage(messages[0].metadata.get("usage") if messages else None)
+        return messages
+
+    async def _inner_get_streaming_chat_message_contents(
+        self,
+        chat_history: ChatHistory,
+        settings: PromptExecutionSettings,
+        function_invoke_attempt: int = 0,
+    ) -> AsyncGenerator[list[StreamingChatMessageContent], Any]:
+        bind_agent_task()
+        # Do not start a model call that cannot finish in time
+        time_left("model")
+        order_tool_results(chat_history)
+        settings = _request_settings(settings, self.ai_model_id)
+        started = time.perf_counter()
+        outcome = "cancelled"
+        first_chunk = True
+        usage: CompletionUsage | None = None
+        try:
+            stream = super()._inner_get_streaming_chat_message_contents
+            # Only time spent waiting on the model: the consumer's handling
+            # of each chunk runs between iterations
+            chunks = aiter(
+                self._resilience.stream(
+                    lambda: stream(chat_history, settings, function_invoke_attempt),
+                    classify_model_error,
+                    self._give_up,
+                )
+            )
+            while True:
+                with usage_stage("model"):
+                    try:
+                        messages = await anext(chunks)
+                    except StopAsyncIteration:
+                        break
+                if first_chunk:
+                    first_chunk = False
+                    metrics.llm_time_to_first_chunk.record(
+                        time.perf_counter() - started, self._attributes()
+                    )
+                if messages:
+                    usage = messages[0].metadata.get("usage") or usage
+                yield messages
+            outcome = "success"
+        except Exception as e:
+            # A stream that has started cannot switch deployments
+            if not first_chunk or not self._falls_back(e):
+                outcome = "error"
+                raise
+            outcome = "fallback"
+        finally:
+            self._record_duration(started, outcome, streaming=True)
+            if outcome == "success" or usage is not None:
+                self._record_usage(usage)
+        if outcome == "fallback":
+            fallback = self._fallback._inner_get_streaming_chat_message_contents(
+                chat_history, settings, function_invoke_attempt
+            )
+            async for messages in fallback:
+                yield messages
+
+    def _give_up(self, failure: Failure) -> bool:
+        """With a fallback, throttling goes there instead of being retried."""
+        return self._fallback is not None and is_throttled(failure)
+
+    def _falls_back(self, error: Exception) -> bool:
+        """
+        Decide whether a failed call should go to the fallback deployment.
+
+        Args:
+            error: Exception raised after retries
+
+        Returns:
+            True if a fallback exists and the deployment is throttled or its
+            circuit is open
+        """
+        if self._fallback is None:
+            return False
+        if not isinstance(error, CircuitOpenError) and not is_throttled(
+            classify_model_error(error)
+        ):
+            return False
+        metrics.llm_fallbacks.add(
+            1,
+            {
+                "agent": self.agent_name,
+                "deployment": self.ai_model_id,
+                "fallback": self._fallback.ai_model_id,
+            },
+        )
+        # While the breaker is open every call falls back; it logged opening
+        logger.log(
+            logging.DEBUG if isinstance(error, CircuitOpenError) else logging.WARNING,
+            "%s: deployment %s unavailable (%s), falling back to %s",
+            self.agent_name,
+            self.ai_model_id,
+            type(error).__name__,
+            self._fallback.ai_model_id,
+        )
+        return True
+
+    def _attributes(self) -> dict[str, str]:
+        return {"agent": self.agent_name, "deployment": self.ai_model_id}
+
+    def _record_duration(self, started: float, outcome: str, streaming: bool) -> None:
+        metrics.llm_duration.record(
+            time.perf_counter() - started,
+            {**self._attributes(), "outcome": outcome, "streaming": streaming},
+        )
+
+    def _record_usage(self, usage: CompletionUsage | None) -> None:
+        """Count a completed call's tokens in metrics and the request's usage."""
+        request_usage = current_usage()
+        if request_usage is not None:
+            request_usage.add_model_call(self.agent_name, self.ai_model_id, usage)
+        if usage is None:
+            return
+        details = usage.prompt_tokens_details
+        for token_type, count in (
+            ("prompt", usage.prompt_tokens),
+            ("completion", usage.completion_tokens),
+            ("cached", details.cached_tokens if details is not None else None),
+        ):
+            if count:
+                metrics.llm_tokens.add(
+                    count, {**self._attributes(), "type": token_type}
+                )
+
+
+def deployment_client(
+    client: openai.AsyncOpenAI, deployment: str
+) -> openai.AsyncOpenAI:
+    """
+    Get a client that sends chat completions to a deployment.
+
+    Azure OpenAI clients normally put the request's model (the deployment)
+    into the URL. A base URL that already names a deployment, such as
+    `AZURE_OPENAI_BASE_URL`, is used as is, so it is rewritten instead.
+
+    Args:
+        client: Configured client
+        deployment: Deployment to target
+
+    Returns:
+        The same client, or a copy sharing its connection pool
+    """
+    head, marker, tail = client.base_url.path.rpartition("/deployments/")
+    if not marker or tail.strip("/") == deployment:
+        return client
+    path = f"{head}/deployments/{deployment}/"
+    return client.with_options(base_url=str(client.base_url.copy_with(path=path)))
+
+
+def create_agent_chat_service(
+    base: AzureChatCompletion,
+    agent_name: str,
+    deployment: str | None = None,
+    fallback_deployment: str | None = None,
+) -> InstrumentedAzureChatCompletion:
+    """
+    Create an agent's chat service sharing the base service's connections.
+
+    Args:
+        base: Configured service whose client and service id are reused
+        agent_name: Agent name recorded on the service's metrics
+        deployment: Deployment for the agent; the base service's if omitted
+        fallback_deployment: Optional deployment answering while the
+            agent's deployment is throttled
+
+    Returns:
+        Instrumented chat service for the agent
+    """
+    deployment = deployment or base.ai_model_id
+    service = InstrumentedAzureChatCompletion(
+        service_id=base.service_id,
+        deployment_name=deployment,
+        async_client=deployment_client(base.client, deployment),
+    )
+    service.agent_name = agent_name
+    if fallback_deployment and fallback_deployment != deployment:
+        service._fallback = create_agent_chat_service(
+            base, agent_name, fallback_deployment
+        )
+    return service
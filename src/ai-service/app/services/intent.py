@@ -0,0 +1,85 @@
+"""Fast-path intent routing ahead of the handoff orchestration."""
+
+import logging
+import re
+from abc import ABC, abstractmethod
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IntentRouter(ABC):
+    """
+    Pre-router that picks an agent for clearly classified requests.
+
+    Returning an agent name runs that agent directly, skipping the
+    CoordinatorAgent's routing call; returning None falls back to the full
+    handoff orchestration. The agent keeps its Handoff tools when run
+    directly, so a wrongly routed request is transferred by the agent and
+    then run on the full handoff as well.
+    """
+
+    @abstractmethod
+    def route(self, user_message: str) -> str | None:
+        """
+        Classify a user message.
+
+        Args:
+            user_message: The user's input message
+
+        Returns:
+            Name of the agent to run directly, or None when unsure
+        """
+
+
+class KeywordIntentRouter(IntentRouter):
+    """
+    Regex rule router.
+
+    A message is routed only when exactly one rule matches; ambiguous or
+    unmatched messages (including short follow-ups such as "what about
+    tomorrow?") go through the full handoff.
+    """
+
+    default_rules: dict[str, str] = {
+        "QueryAgent": (
+            r"\b(weather|forecast|temperature|rain(ing|y)?|snow(ing|y)?|"
+            r"sunny|cloudy|humid(ity)?|windy|storm(s|y)?|umbrella)\b"
+        ),
+    }
+
+    def __init__(self, rules: dict[str, str] | None = None):
+        """
+        Initialize the router.
+
+        Args:
+            rules: Mapping of agent name to regex; defaults to `default_rules`
+        """
+        self._rules = {
+            agent_name: re.compile(pattern, re.IGNORECASE)
+            for agent_name, pattern in (rules or self.default_rules).items()
+        }
+
+    def route(self, user_message: str) -> str | None:
+        matches = [
+            agent_name
+            for agent_name, pattern in self._rules.items()
+            if pattern.search(user_message)
+        ]
+        if len(matches) == 1:
+            return matches[0]
+        return None
+
+
+def create_intent_router() -> IntentRouter | None:
+    """
+    Create the intent router selected by the `intent_router` setting.
+
+    Returns:
+        Configured IntentRouter, or None when fast-path routing is disabled
+    """
+    if settings.intent_router == "keyword":
+        logger.info("Using keyword intent router for fast-path routing")
+        return KeywordIntentRouter()
+    return None
@@ -0,0 +1,131 @@
+"""Exact-match cache for complete chat responses."""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+
+from semantic_kernel.contents import ChatMessageContent
+
+from ..core import metrics
+from ..core.cache import TTLCache
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A cached assistant reply and the chunks it was streamed as."""
+
+    text: str
+    chunks: tuple[str, ...]
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of chat responses keyed by the exact prompt.
+
+    The key covers the agent configuration fingerprint and every prompt
+    message (role and whitespace-normalized content), so a hit means the
+    model would have seen the same conversation.
+    """
+
+    def __init__(self, config_fingerprint: str):
+        """
+        Initialize the cache from settings.
+
+        Args:
+            config_fingerprint: Hash of the agent configuration (instructions,
+                tools, deployment); changing it invalidates all entries
+        """
+        self._fingerprint = config_fingerprint
+        self._entries: TTLCache[str, CachedResponse] = TTLCache(
+            max_entries=settings.response_cache_max_entries,
+            ttl_seconds=settings.response_cache_ttl_seconds,
+            on_evict=lambda _key: metrics.response_cache_evictions.add(1),
+        )
+
+    def key(self, messages: list[ChatMessageContent]) -> str:
+        """
+        Build the cache key for a prompt.
+
+        Args:
+            messages: Prompt messages, including system message and the new
+                user message
+
+        Returns:
+            Hex digest identifying the prompt
+        """
+        hasher = hashlib.sha256(self._fingerprint.encode())
+        for message in messages:
+            hasher.update(b"\0")
+            hasher.update(message.role.value.encode())
+            hasher.update(b"\0")
+            hasher.update(_normalize(message.content).encode())
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Prompt key from `key`
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        cached = self._entries.get(key)
+        if cached is None:
+            metrics.response_cache_misses.add(1)
+        else:
+            metrics.response_cache_hits.add(1)
+            logger.info("Response cache hit")
+        return cached
+
+    def set(self, key: str, text: str, chunks: list[str] | None = None) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Prompt key from `key`
+            text: Full response text
+            chunks: Streamed chunks to replay; defaults to word chunks of text
+        """
+        if not text:
+            return
+        if chunks is None:
+            chunks = [
+                (" " + word) if index else word
+                for index, word in enumerate(text.split())
+            ]
+        self._entries.set(key, CachedResponse(text=text, chunks=tuple(chunks)))
+
+
+def _normalize(content: str | None) -> str:
+    """
+    Collapse whitespace so trivially different prompts match.
+
+    Case is kept: names, codes and ids that differ only in case can call
+    for different answers.
+    """
+    return " ".join((content or "").split())
+
+
+def create_response_cache(config_fingerprint: str) -> ResponseCache | None:
+    """
+    Create the response cache if enabled by the `response_cache_enabled` setting.
+
+    Args:
+        config_fingerprint: Hash of the agent configuration
+
+    Returns:
+        ResponseCache, or None when caching is disabled
+    """
+    if not settings.response_cache_enabled:
+        return None
+    logger.info(
+        "Response cache enabled: ttl=%ss, max_entries=%d",
+        settings.response_cache_ttl_seconds,
+        settings.response_cache_max_entries,
+    )
+    return ResponseCache(config_fingerprint)
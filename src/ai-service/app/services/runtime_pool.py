@@ -0,0 +1,254 @@
+"""Pool of agent runtimes shared by concurrent orchestrations."""
+
+import asyncio
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from semantic_kernel.agents.runtime import InProcessRuntime
+
+from ..core import metrics
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _RuntimeHandle:
+    """
+    An InProcessRuntime, its message loop and the orchestrations on it.
+
+    The handle runs the runtime's message loop itself through the public
+    `process_next`, rather than `InProcessRuntime.start`, so it knows when
+    the loop dies: `process_next` raises a handler exception that escaped
+    the runtime and cannot be called again after that.
+    """
+
+    def __init__(self):
+        self.runtime = InProcessRuntime()
+        self.active = 0
+        self.orchestrations = 0
+        self._loop = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self.runtime.process_next()
+
+    @property
+    def running(self) -> bool:
+        """Return True if the runtime's message loop is alive."""
+        return not self._loop.done()
+
+    async def stop(self, index: int) -> None:
+        """Stop the message loop, logging rather than raising a loop failure."""
+        self._loop.cancel()
+        await asyncio.wait([self._loop])
+        if not self._loop.cancelled() and self._loop.exception() is not None:
+            logger.warning(
+                "Runtime %d stopped with error: %s", index, self._loop.exception()
+            )
+
+
+class PooledRuntime:
+    """
+    One slot of the pool.
+
+    New orchestrations run on the slot's current runtime. When the slot is
+    rotated, a fresh runtime takes over immediately and the old one is
+    stopped once the orchestrations still running on it have finished.
+    """
+
+    def __init__(self, index: int):
+        """
+        Initialize the slot with a started runtime.
+
+        Args:
+            index: Position in the pool, used in logs and metric attributes
+        """
+        self.index = index
+        self.current = _RuntimeHandle()
+        self.retiring: list[_RuntimeHandle] = []
+        self.consecutive_failures = 0
+        self.restarts = 0
+
+    @property
+    def active(self) -> int:
+        """Orchestrations running on the current runtime."""
+        return self.current.active
+
+    async def rotate(self, reason: str) -> None:
+        """Swap in a fresh runtime and retire the current one."""
+        old = self.current
+        self.current = _RuntimeHandle()
+        self.consecutive_failures = 0
+        self.restarts += 1
+        metrics.runtime_pool_restarts.add(1, {"reason": reason})
+        logger.info(
+            "Replacing runtime %d (%s); %d orchestrations still on the old one",
+            self.index,
+            reason,
+            old.active,
+        )
+        if old.active == 0:
+            await old.stop(self.index)
+        else:
+            self.retiring.append(old)
+
+    async def release(self, handle: _RuntimeHandle) -> None:
+        """Stop a retired runtime once its last orchestration has finished."""
+        if handle in self.retiring and handle.active == 0:
+            self.retiring.remove(handle)
+            await handle.stop(self.index)
+
+    async def stop(self) -> None:
+        """Stop the current and any retiring runtimes."""
+        handles = [self.current, *self.retiring]
+        self.retiring = []
+        await asyncio.gather(*(handle.stop(self.index) for handle in handles))
+
+    def stats(self) -> dict[str, object]:
+        """Return load and health counters for diagnostics."""
+        return {
+            "index": self.index,
+            "running": self.current.running,
+            "active": self.current.active,
+            "orchestrations": self.current.orchestrations,
+            "retiring": len(self.retiring),
+            "consecutive_failures": self.consecutive_failures,
+            "restarts": self.restarts,
+        }
+
+
+class RuntimePool:
+    """
+    Spreads orchestrations across several agent runtimes.
+
+    Each InProcessRuntime dispatches all of its messages through one loop
+    task, and every orchestration registers its actors and subscriptions in
+    the runtime it runs on without ever removing them; since each new
+    subscription rebuilds the routing table for every topic seen so far, a
+    long-lived runtime gets slower with every orchestration. The pool
+    assigns each orchestration to a runtime (least-loaded or round-robin)
+    and replaces a runtime once it has served `recycle_after`
+    orchestrations, failed `max_consecutive_failures` times in a row, or
+    its message loop has died.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        policy: str = "least_loaded",
+        recycle_after: int = 0,
+        max_consecutive_failures: int = 0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Number of runtimes
+            policy: "least_loaded" or "round_robin"
+            recycle_after: Orchestrations a runtime serves before it is
+                replaced; 0 never recycles
+            max_consecutive_failures: Failed orchestrations in a row after
+                which a runtime is replaced; 0 disables this check
+        """
+        if policy not in ("least_loaded", "round_robin"):
+            raise ValueError(f"Unknown runtime pool policy: {policy}")
+        self.size = max(size, 1)
+        self.policy = policy
+        self.recycle_after = recycle_after
+        self.max_consecutive_failures = max_consecutive_failures
+        self._members: list[PooledRuntime] = []
+        self._round_robin = itertools.cycle(range(self.size))
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def start(self) -> None:
+        """Create and start every runtime in the pool."""
+        if self._members:
+            raise RuntimeError("Runtime pool is already started")
+        self._members = [PooledRuntime(index) for index in range(self.size)]
+        logger.info("Started runtime pool: size=%d, policy=%s", self.size, self.policy)
+
+    async def stop(self) -> None:
+        """Stop every runtime in the pool."""
+        members, self._members = self._members, []
+        await asyncio.gather(*(member.stop() for member in members))
+
+    def stats(self) -> list[dict[str, object]]:
+        """Return per-runtime load and health counters."""
+        return [member.stats() for member in self._members]
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[InProcessRuntime]:
+        """
+        Borrow a runtime for one orchestration.
+
+        Exceptions raised inside the block count as a failure of the runtime
+        (cancellation does not).
+
+        Yields:
+            Runtime to invoke the orchestration on
+        """
+        if not self._members:
+            raise RuntimeError("Runtime pool is not started")
+        member = await self._select()
+        handle = member.current
+        handle.active += 1
+        handle.orchestrations += 1
+        metrics.runtime_pool_active.add(1, {"runtime": member.index})
+        failed = False
+        try:
+            yield handle.runtime
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            handle.active -= 1
+            metrics.runtime_pool_active.add(-1, {"runtime": member.index})
+            if handle is member.current:
+                await self._record_outcome(member, failed)
+            await member.release(handle)
+
+    async def _select(self) -> PooledRuntime:
+        """Pick the slot for the next orchestration."""
+        for member in self._members:
+            if not member.current.running:
+                await member.rotate("stopped")
+
+        if self.policy == "round_robin":
+            return self._members[next(self._round_robin)]
+        return min(self._members, key=lambda member: member.active)
+
+    async def _record_outcome(self, member: PooledRuntime, failed: bool) -> None:
+        """Update health counters after an orchestration finishes."""
+        if failed:
+            member.consecutive_failures += 1
+            if (
+                self.max_consecutive_failures
+                and member.consecutive_failures >= self.max_consecutive_failures
+            ):
+                await member.rotate("failures")
+                return
+        else:
+            member.consecutive_failures = 0
+        if self.recycle_after and member.current.orchestrations >= self.recycle_after:
+            await member.rotate("recycle")
+
+
+def create_runtime_pool() -> RuntimePool:
+    """
+    Create the runtime pool configured by the `runtime_pool_*` settings.
+
+    Returns:
+        Unstarted RuntimePool
+    """
+    return RuntimePool(
+        size=settings.runtime_pool_size,
+        policy=settings.runtime_pool_policy,
+        recycle_after=settings.runtime_recycle_after,
+        max_consecutive_failures=settings.runtime_max_consecutive_failures,
+    )
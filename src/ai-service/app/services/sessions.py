@@ -0,0 +1,155 @@
+"""Server-side conversation session stores."""
+
+import logging
+from abc import ABC, abstractmethod
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..models import ChatHistoryModel
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(ABC):
+    """
+    Storage for conversation histories keyed by session id.
+
+    Lets clients send only the new turn: the service loads the history for
+    the session, runs the turn and saves the updated history back.
+    Concurrent turns for the same session are last-writer-wins.
+    """
+
+    @abstractmethod
+    async def get(self, session_id: str) -> ChatHistoryModel | None:
+        """
+        Load the history for a session.
+
+        Args:
+            session_id: Client-provided session identifier
+
+        Returns:
+            The stored history, or None if the session is unknown or expired
+        """
+
+    @abstractmethod
+    async def save(self, session_id: str, history: ChatHistoryModel) -> None:
+        """
+        Store the history for a session and refresh its TTL.
+
+        Args:
+            session_id: Client-provided session identifier
+            history: Full conversation history to store
+        """
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """
+        Remove a session.
+
+        Args:
+            session_id: Client-provided session identifier
+        """
+
+    async def close(self) -> None:
+        """Release any connections held by the store."""
+
+
+class InMemorySessionStore(SessionStore):
+    """Per-process session store with TTL expiry and LRU eviction."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Initialize the in-memory store.
+
+        Args:
+            max_entries: Maximum number of sessions kept before LRU eviction
+            ttl_seconds: Idle lifetime of a session in seconds
+        """
+        self._sessions: TTLCache[str, ChatHistoryModel] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds
+        )
+
+    async def get(self, session_id: str) -> ChatHistoryModel | None:
+        history = self._sessions.get(session_id)
+        if history is None:
+            return None
+        # Hand out a copy so callers cannot mutate the stored history
+        return history.model_copy(update={"messages": list(history.messages)})
+
+    async def save(self, session_id: str, history: ChatHistoryModel) -> None:
+        self._sessions.set(session_id, history)
+
+    async def delete(self, session_id: str) -> None:
+        self._sessions.pop(session_id)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Session store backed by any Redis-compatible server.
+
+    Histories are stored as JSON with a per-key expiry; size bounding is
+    left to the server's eviction policy (e.g. `maxmemory-policy
+    allkeys-lru`). Requires the optional `redis` package.
+    """
+
+    key_prefix = "ai-service:session:"
+
+    def __init__(self, url: str, ttl_seconds: float, client=None):
+        """
+        Initialize the Redis store.
+
+        Args:
+            url: Redis connection URL
+            ttl_seconds: Idle lifetime of a session in seconds
+            client: Optional pre-built `redis.asyncio`-compatible client,
+                e.g. a local in-process stand-in
+        """
+        if client is None:
+            try:
+                from redis.asyncio import Redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "SESSION_STORE=redis requires the 'redis' package; "
+                    "install it with `uv pip install .[redis]`"
+                ) from e
+            client = Redis.from_url(url)
+        self._client = client
+        self._ttl_ms = int(ttl_seconds * 1000)
+
+    async def get(self, session_id: str) -> ChatHistoryModel | None:
+        data = await self._client.get(self.key_prefix + session_id)
+        if data is None:
+            return None
+        return ChatHistoryModel.model_validate_json(data)
+
+    async def save(self, session_id: str, history: ChatHistoryModel) -> None:
+        await self._client.set(
+            self.key_prefix + session_id,
+            history.model_dump_json(),
+            px=self._ttl_ms,
+        )
+
+    async def delete(self, session_id: str) -> None:
+        await self._client.delete(self.key_prefix + session_id)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_session_store() -> SessionStore:
+    """
+    Create the session store selected by the `session_store` setting.
+
+    Returns:
+        Configured SessionStore
+    """
+    if settings.session_store == "redis":
+        logger.info("Using Redis session store")
+        return RedisSessionStore(
+            url=settings.redis_url, ttl_seconds=settings.session_ttl_seconds
+        )
+    logger.info("Using in-memory session store")
+    return InMemorySessionStore(
+        max_entries=settings.session_max_entries,
+        ttl_seconds=settings.session_ttl_seconds,
+    )
@@ -0,0 +1,132 @@
+"""Delta coalescing for streamed chat responses."""
+
+import asyncio
+import logging
+from typing import AsyncGenerator, AsyncIterable
+
+from ..models import StreamEvent, StreamEventType
+
+logger = logging.getLogger(__name__)
+
+
+class _DeltaBuffer:
+    """Pending text deltas from one agent, waiting to be flushed as one."""
+
+    def __init__(self):
+        self.parts: list[str] = []
+        self.agent: str | None = None
+        self.size = 0
+        self.started = 0.0
+
+    def __bool__(self) -> bool:
+        return bool(self.parts)
+
+    def accepts(self, event: StreamEvent) -> bool:
+        """Return True if the event can join the pending deltas."""
+        return event.type == StreamEventType.DELTA and (
+            not self.parts or event.agent == self.agent
+        )
+
+    def add(self, event: StreamEvent, now: float) -> None:
+        if not self.parts:
+            self.agent = event.agent
+            self.started = now
+        content = event.content or ""
+        self.parts.append(content)
+        self.size += len(content.encode())
+
+    def flush(self) -> StreamEvent:
+        event = StreamEvent(
+            type=StreamEventType.DELTA,
+            agent=self.agent,
+            content="".join(self.parts),
+        )
+        self.parts = []
+        self.size = 0
+        return event
+
+
+async def coalesce_deltas(
+    events: AsyncIterable[StreamEvent],
+    flush_interval: float,
+    flush_max_bytes: int,
+) -> AsyncGenerator[StreamEvent, None]:
+    """
+    Merge consecutive text deltas into fewer, larger events.
+
+    The first delta is passed through immediately so time to first token is
+    unaffected. Later deltas from the same agent are held until the flush
+    interval has passed since the oldest one, the pending text reaches
+    `flush_max_bytes`, or a non-delta event arrives (which is never delayed
+    or reordered).
+
+    Args:
+        events: Source events from the chat service
+        flush_interval: Seconds to hold deltas before flushing; 0 disables
+            time-based flushing
+        flush_max_bytes: Pending UTF-8 size that forces a flush; 0 disables
+            size-based flushing
+
+    Yields:
+        Events with consecutive deltas merged
+    """
+    if flush_interval <= 0 and flush_max_bytes <= 0:
+        async for event in events:
+            yield event
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = aiter(events)
+    buffer = _DeltaBuffer()
+    first_delta_sent = False
+    next_event: asyncio.Future[StreamEvent | None] | None = None
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(anext(iterator, None))
+
+            timeout = None
+            if buffer and flush_interval > 0:
+                timeout = max(buffer.started + flush_interval - loop.time(), 0)
+            done, _ = await asyncio.wait({next_event}, timeout=timeout)
+            if not done:
+                yield buffer.flush()
+                continue
+
+            event = next_event.result()
+            next_event = None
+            if event is None:
+                break
+
+            if event.type == StreamEventType.DELTA and not first_delta_sent:
+                first_delta_sent = True
+                yield event
+                continue
+
+            if buffer.accepts(event):
+                buffer.add(event, loop.time())
+                if flush_max_bytes > 0 and buffer.size >= flush_max_bytes:
+                    yield buffer.flush()
+                continue
+
+            if buffer:
+                yield buffer.flush()
+            if event.type == StreamEventType.DELTA:
+                buffer.add(event, loop.time())
+            else:
+                yield event
+
+        if buffer:
+            yield buffer.flush()
+    finally:
+        if next_event is not None and not next_event.done():
+            next_event.cancel()
+            try:
+                await next_event
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.debug("Stream source failed while closing: %s", e)
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
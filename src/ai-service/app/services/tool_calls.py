@@ -0,0 +1,139 @@
+"""Concurrency limit and result ordering for agents' tool calls."""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Awaitable, Callable
+
+from semantic_kernel.agents.orchestration.handoffs import HANDOFF_PLUGIN_NAME
+from semantic_kernel.contents import (
+    AuthorRole,
+    ChatHistory,
+    ChatMessageContent,
+    FunctionCallContent,
+    FunctionResultContent,
+)
+from semantic_kernel.filters import AutoFunctionInvocationContext
+
+from ..core import metrics
+from ..core.config import settings
+from .usage import current_usage, usage_stage
+
+_limiter: ContextVar[asyncio.Semaphore | None] = ContextVar(
+    "tool_call_limiter", default=None
+)
+
+
+def create_tool_limiter() -> asyncio.Semaphore | None:
+    """
+    Create the tool call limit for one request.
+
+    Returns:
+        Semaphore admitting `tool_call_max_concurrency` calls, or None when
+        the limit is disabled
+    """
+    if settings.tool_call_max_concurrency <= 0:
+        return None
+    return asyncio.Semaphore(settings.tool_call_max_concurrency)
+
+
+def current_tool_limiter() -> asyncio.Semaphore | None:
+    """The tool call limit of the request being handled, if any."""
+    return _limiter.get()
+
+
+def bind_tool_limiter(limiter: asyncio.Semaphore | None) -> None:
+    """
+    Make a tool call limit current for the rest of the running task.
+
+    Like the request deadline, the limit is inherited by tasks created from
+    here on, including the ones Semantic Kernel starts for each tool call.
+
+    Args:
+        limiter: Limit to apply
+    """
+    _limiter.set(limiter)
+
+
+async def limit_tool_calls(
+    context: AutoFunctionInvocationContext,
+    next: Callable[[AutoFunctionInvocationContext], Awaitable[None]],
+) -> None:
+    """
+    Auto function invocation filter running tool calls under the request's limit.
+
+    Semantic Kernel starts all tool calls of a model turn at once; this
+    bounds how many of them a single request has in flight. Calls are
+    counted in the request's usage and timed, from the moment they are
+    admitted, as its tools stage. The handoff plugin's functions route the
+    conversation rather than call a tool, so they bypass all of this.
+
+    Args:
+        context: Invocation context of one tool call
+        next: Rest of the filter pipeline, ending in the function
+    """
+    if context.function.plugin_name == HANDOFF_PLUGIN_NAME:
+        await next(context)
+        return
+    calls = _turn_tool_calls(context)
+    if calls and calls[0] is context.function_call_content:
+        metrics.tool_calls_per_turn.record(len(calls))
+    usage = current_usage()
+    if usage is not None:
+        usage.tool_calls += 1
+    limiter = _limiter.get()
+    if limiter is None:
+        with usage_stage("tools"):
+            await next(context)
+        return
+    async with limiter:
+        with usage_stage("tools"):
+            await next(context)
+
+
+def _turn_tool_calls(
+    context: AutoFunctionInvocationContext,
+) -> list[FunctionCallContent]:
+    """Tool calls of the model turn a call belongs to, without handoff calls."""
+    messages = context.chat_history.messages if context.chat_history else []
+    for message in reversed(messages):
+        if message.role != AuthorRole.TOOL:
+            return [
+                item
+                for item in message.items
+                if isinstance(item, FunctionCallContent)
+                and item.plugin_name != HANDOFF_PLUGIN_NAME
+            ]
+    return []
+
+
+def order_tool_results(chat_history: ChatHistory) -> None:
+    """
+    Put the latest tool results in the order the model asked for them.
+
+    Concurrent tool calls add their results to the history as they finish.
+    Sorting them by call order keeps the next prompt identical between
+    runs of the same conversation, which prompt caching and trace replay
+    rely on.
+
+    Args:
+        chat_history: History about to be sent to the model; reordered in place
+    """
+    messages = chat_history.messages
+    start = len(messages)
+    while start > 0 and messages[start - 1].role == AuthorRole.TOOL:
+        start -= 1
+    if len(messages) - start < 2 or start == 0:
+        return
+    order = {
+        item.id: index
+        for index, item in enumerate(messages[start - 1].items)
+        if isinstance(item, FunctionCallContent)
+    }
+
+    def position(message: ChatMessageContent) -> int:
+        for item in message.items:
+            if isinstance(item, FunctionResultContent):
+                return order.get(item.id, len(order))
+        return len(order)
+
+    messages[start:] = sorted(messages[start:], key=position)
@@ -0,0 +1,188 @@
+"""Token usage and stage timings of one chat request."""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from semantic_kernel.connectors.ai.completion_usage import CompletionUsage
+
+from ..core import metrics
+from ..models import AgentUsage, ChatUsage
+
+logger = logging.getLogger(__name__)
+
+# Stages reported per request. Model and tool time lie within orchestration.
+STAGES = ("queue", "history", "orchestration", "model", "tools")
+
+_usage: ContextVar["RequestUsage | None"] = ContextVar("request_usage", default=None)
+
+
+class RequestUsage:
+    """
+    Accumulates token counts and stage timings across a request's agent calls.
+
+    Stages are timed as wall-clock time: overlapping work in the same stage,
+    such as concurrent tool calls, counts once, so the stages of a request
+    can be compared with its duration.
+    """
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.first_token: float | None = None
+        self.tool_calls = 0
+        self.handoffs = 0
+        self._agents: dict[tuple[str, str], AgentUsage] = {}
+        self._stages: dict[str, float] = {}
+        # Stage -> (work in progress, when the oldest of it started)
+        self._open: dict[str, tuple[int, float]] = {}
+
+    def add_model_call(
+        self, agent: str, deployment: str, usage: CompletionUsage | None
+    ) -> None:
+        """
+        Count a chat completion call and its tokens.
+
+        Args:
+            agent: Agent that made the call
+            deployment: Deployment that answered it
+            usage: Token usage reported by the call, if any
+        """
+        entry = self._agents.get((agent, deployment))
+        if entry is None:
+            entry = self._agents[(agent, deployment)] = AgentUsage(
+                agent=agent, deployment=deployment
+            )
+        entry.model_calls += 1
+        if usage is None:
+            return
+        entry.prompt_tokens += usage.prompt_tokens or 0
+        entry.completion_tokens += usage.completion_tokens or 0
+        details = usage.prompt_tokens_details
+        if details is not None:
+            entry.cached_tokens += details.cached_tokens or 0
+
+    def mark_first_token(self) -> None:
+        """Note that the first response text was sent, if not already."""
+        if self.first_token is None:
+            self.first_token = time.perf_counter()
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        """Add time measured elsewhere to a stage."""
+        self._stages[stage] = self._stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """
+        Time a block as part of a stage.
+
+        Args:
+            stage: Stage name, one of STAGES
+        """
+        active, since = self._open.get(stage, (0, time.perf_counter()))
+        self._open[stage] = (active + 1, since)
+        try:
+            yield
+        finally:
+            active, since = self._open.pop(stage)
+            if active > 1:
+                self._open[stage] = (active - 1, since)
+            else:
+                self.add_stage(stage, time.perf_counter() - since)
+
+    def summary(self) -> ChatUsage:
+        """
+        Report usage so far.
+
+        Returns:
+            Totals, per-agent usage and stage timings in milliseconds
+        """
+        agents = [entry.model_copy() for entry in self._agents.values()]
+        prompt = sum(entry.prompt_tokens for entry in agents)
+        completion = sum(entry.completion_tokens for entry in agents)
+        return ChatUsage(
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            cached_tokens=sum(entry.cached_tokens for entry in agents),
+            total_tokens=prompt + completion,
+            model_calls=sum(entry.model_calls for entry in agents),
+            tool_calls=self.tool_calls,
+            handoffs=self.handoffs,
+            agents=agents,
+            duration_ms=_ms(time.perf_counter() - self.started),
+            time_to_first_token_ms=(
+                None
+                if self.first_token is None
+                else _ms(self.first_token - self.started)
+            ),
+            stages_ms={stage: _ms(seconds) for stage, seconds in self._stages.items()},
+        )
+
+    def finish(self) -> ChatUsage:
+        """
+        Record the request's usage in metrics and the log.
+
+        Returns:
+            Final usage report
+        """
+        usage = self.summary()
+        attributes = {"endpoint": self.endpoint}
+        for token_type, count in (
+            ("prompt", usage.prompt_tokens),
+            ("completion", usage.completion_tokens),
+            ("cached", usage.cached_tokens),
+        ):
+            metrics.request_tokens.record(count, {**attributes, "type": token_type})
+        for stage, seconds in self._stages.items():
+            metrics.request_stage_duration.record(
+                seconds, {**attributes, "stage": stage}
+            )
+        logger.info(
+            "%s usage: %d prompt (%d cached) + %d completion tokens, "
+            "%d model calls, %d tool calls, %d handoffs in %.0fms %s",
+            self.endpoint,
+            usage.prompt_tokens,
+            usage.cached_tokens,
+            usage.completion_tokens,
+            usage.model_calls,
+            usage.tool_calls,
+            usage.handoffs,
+            usage.duration_ms,
+            usage.stages_ms,
+        )
+        return usage
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def current_usage() -> RequestUsage | None:
+    """The usage accumulator of the request being handled, if any."""
+    return _usage.get()
+
+
+def bind_usage(usage: RequestUsage | None) -> None:
+    """
+    Make a usage accumulator current for the rest of the running task.
+
+    Like the request deadline, it is inherited by tasks created from here
+    on and carried into the agent runtime's tasks by the orchestration.
+
+    Args:
+        usage: Accumulator for the request
+    """
+    _usage.set(usage)
+
+
+@contextmanager
+def usage_stage(stage: str) -> Iterator[None]:
+    """Time a block as a stage of the current request, if it tracks usage."""
+    usage = _usage.get()
+    if usage is None:
+        yield
+        return
+    with usage.stage(stage):
+        yield
@@ -0,0 +1,46 @@
+"""In-memory Azure credential for exercising token caching offline."""
+
+import asyncio
+import time
+
+from azure.core.credentials import AccessToken
+from azure.core.exceptions import ClientAuthenticationError
+
+
+class FakeCredential:
+    """
+    AsyncTokenCredential issuing short-lived fake tokens.
+
+    Set `failing` to simulate an identity endpoint outage; `calls` counts
+    every `get_token` call, including failed ones.
+    """
+
+    def __init__(self, lifetime: float = 3600.0, latency: float = 0.0):
+        """
+        Initialize the credential.
+
+        Args:
+            lifetime: Seconds each issued token is valid for
+            latency: Simulated seconds per token request
+        """
+        self.lifetime = lifetime
+        self.latency = latency
+        self.failing = False
+        self.calls = 0
+
+    async def get_token(self, *scopes: str, **kwargs) -> AccessToken:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failing:
+            raise ClientAuthenticationError("Fake identity endpoint unavailable")
+        return AccessToken(f"fake-token-{self.calls}", time.time() + self.lifetime)
+
+    async def close(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "FakeCredential":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
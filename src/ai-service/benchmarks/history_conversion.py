@@ -0,0 +1,177 @@
+"""
+Micro-benchmark history conversion and chat response serialization.
+
+For histories of each size, times the service's converters against
+building the same histories message by message through the add_* helpers
+(how the converters used to work), and `ModelJSONResponse` against
+FastAPI's default handling of a returned `ChatResponse` (validation
+against the response model, `jsonable_encoder`, then `json.dumps`). Both
+serializations are checked to produce the same bytes. No servers or Azure
+resources are needed.
+
+Usage (from src/ai-service):
+    python -m benchmarks.history_conversion --sizes 10,100,1000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from semantic_kernel.contents import ChatHistory
+
+from app.models import (ChatHistoryModel, ChatResponse, MessageRole,
+                        chat_history_to_sk, sk_to_chat_history)
+
+SYSTEM_MESSAGE = "You are a helpful weather assistant. " * 8
+
+
+def build_history(size: int) -> ChatHistoryModel:
+    """A system message followed by alternating user/assistant turns."""
+    history = ChatHistoryModel()
+    history.add_system_message(SYSTEM_MESSAGE)
+    for index in range(size - 1):
+        if index % 2 == 0:
+            history.add_user_message(
+                f"Question {index}: what's the weather in Seattle?"
+            )
+        else:
+            history.add_assistant_message(
+                f"Answer {index}: " + "It is 15C and cloudy in Seattle. " * 6
+            )
+    return history
+
+
+def per_message_to_sk(history: ChatHistoryModel) -> ChatHistory:
+    """Reference: the history built through ChatHistory's helpers."""
+    sk_history = ChatHistory()
+    for message in history.messages:
+        if message.role == MessageRole.SYSTEM:
+            sk_history.add_system_message(message.content)
+        elif message.role == MessageRole.USER:
+            sk_history.add_user_message(message.content)
+        elif message.role == MessageRole.ASSISTANT:
+            sk_history.add_assistant_message(message.content)
+    return sk_history
+
+
+def per_message_from_sk(sk_history: ChatHistory) -> ChatHistoryModel:
+    """Reference: one validated ChatMessage per message via add_message."""
+    history = ChatHistoryModel()
+    for message in sk_history.messages:
+        role = str(message.role.value).lower()
+        if message.content and role in ("system", "user", "assistant"):
+            history.add_message(MessageRole(role), message.content)
+    return history
+
+
+async def fastapi_serialize(field: Any, response: ChatResponse) -> bytes:
+    """Reference: what FastAPI does with a model returned from an endpoint."""
+    content = await serialize_response(field=field, response_content=response)
+    return JSONResponse(content).body
+
+
+async def best_time(
+    call: Callable[[], Any] | Callable[[], Awaitable[Any]], loops: int, repeat: int
+) -> float:
+    """
+    Best mean duration of a call over several rounds.
+
+    Args:
+        call: Function to time; awaited if it returns an awaitable
+        loops: Calls per round
+        repeat: Rounds
+
+    Returns:
+        Seconds per call in the fastest round
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            result = call()
+            if asyncio.iscoroutine(result):
+                await result
+        best = min(best, (time.perf_counter() - started) / loops)
+    return best
+
+
+async def run(sizes: list[int], repeat: int) -> list[dict[str, Any]]:
+    # Settings are read when the router is imported; no calls are made
+    os.environ.setdefault(
+        "AZURE_AI_PROJECT_ENDPOINT", "https://bench.openai.azure.com/"
+    )
+    os.environ.setdefault("AZURE_AI_MODEL_DEPLOYMENT", "bench")
+    from app.routers.chat import ModelJSONResponse
+
+    field = create_model_field("Response_chat", ChatResponse)
+    results = []
+    for size in sizes:
+        history = build_history(size)
+        sk_history = chat_history_to_sk(history)
+        response = ChatResponse(response="It is 15C and cloudy.", history=history)
+
+        assert [m.to_dict() for m in sk_history.messages] == [
+            m.to_dict() for m in per_message_to_sk(history).messages
+        ]
+        assert sk_to_chat_history(sk_history) == per_message_from_sk(sk_history)
+        expected = await fastapi_serialize(field, response)
+        assert ModelJSONResponse(response).body == expected
+
+        loops = max(1, 2000 // size)
+        for stage, reference, current in (
+            (
+                "to_sk",
+                lambda: per_message_to_sk(history),
+                lambda: chat_history_to_sk(history),
+            ),
+            (
+                "from_sk",
+                lambda: per_message_from_sk(sk_history),
+                lambda: sk_to_chat_history(sk_history),
+            ),
+            (
+                "response",
+                lambda: fastapi_serialize(field, response),
+                lambda: ModelJSONResponse(response),
+            ),
+        ):
+            before = await best_time(reference, loops, repeat)
+            after = await best_time(current, loops, repeat)
+            results.append(
+                {
+                    "messages": size,
+                    "stage": stage,
+                    "reference_ms": round(before * 1000, 3),
+                    "current_ms": round(after * 1000, 3),
+                    "speedup": round(before / after, 2),
+                }
+            )
+            print(
+                f"{size:>5} messages  {stage:<9} reference {before * 1000:8.3f} ms  "
+                f"current {after * 1000:8.3f} ms  ({before / after:.1f}x)"
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--repeat", type=int, default=7, help="Rounds per measurement")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = asyncio.run(run(sizes, args.repeat))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
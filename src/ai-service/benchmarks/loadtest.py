@@ -0,0 +1,421 @@
+"""
+Offline load test of the chat API against mock Azure OpenAI and weather.
+
+Starts benchmarks.mock_openai, benchmarks.mock_weather and the service
+(benchmarks.serve, one uvicorn worker) on free local ports, then drives
+POST /api/chat and POST /api/chat/stream at each concurrency level and
+reports requests per second, latency percentiles, time to first token,
+event-loop lag and memory per concurrent request.
+
+Usage (from src/ai-service):
+    python -m benchmarks.loadtest --concurrency 1,16,64 --requests 200 \\
+        --first-token-latency 0.2 --tokens-per-second 100 --json results.json
+
+    # Compare against an earlier run
+    python -m benchmarks.loadtest --compare baseline.json --json results.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+
+from .mock_openai import add_script_arguments
+from .stats import summarize_ms
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+DEPLOYMENT = "mock-gpt"
+CITIES = ["Seattle", "Denver", "Boston", "Austin", "Chicago", "Miami", "Portland"]
+
+logger = logging.getLogger("benchmarks.loadtest")
+
+
+def free_port() -> int:
+    """Pick an unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    """
+    Poll a URL until it returns 200.
+
+    Raises:
+        RuntimeError: If the process exits or the timeout passes first
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args} exited with {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+def add_server_arguments(
+    parser: argparse.ArgumentParser, weather_latency: float = 0.0
+) -> None:
+    """Add the mock weather options and service overrides used by start_servers."""
+    parser.add_argument(
+        "--weather-latency",
+        type=float,
+        default=weather_latency,
+        help="Seconds per weather lookup",
+    )
+    parser.add_argument(
+        "--weather-error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of weather lookups answered with 503",
+    )
+    parser.add_argument(
+        "--weather-slow-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of weather lookups taking --weather-slow-latency",
+    )
+    parser.add_argument(
+        "--weather-slow-latency",
+        type=float,
+        default=2.0,
+        help="Seconds per slow weather lookup",
+    )
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Extra service setting, e.g. --env RUNTIME_POOL_SIZE=8",
+    )
+
+
+@contextmanager
+def start_servers(args: argparse.Namespace) -> Iterator[dict[str, str]]:
+    """
+    Start the mocks and the service.
+
+    Yields:
+        Base URLs of the service ("app") and the mocks ("openai", "weather")
+    """
+    openai_port, weather_port, app_port = free_port(), free_port(), free_port()
+    python = [sys.executable, "-m"]
+    mock_args = [
+        "--first-token-latency", str(args.first_token_latency),
+        "--tokens-per-second", str(args.tokens_per_second),
+        "--answer-tokens", str(args.answer_tokens),
+        "--error-rate", str(args.error_rate),
+        "--retry-after", str(args.retry_after),
+        *(f"--deployment-latency={item}" for item in args.deployment_latency),
+        *(f"--throttle-deployment={name}" for name in args.throttle_deployment),
+        "--prompt-cache-min-tokens", str(args.prompt_cache_min_tokens),
+        "--keep-requests", str(args.keep_requests),
+    ]
+    env = {
+        **os.environ,
+        "AZURE_AI_PROJECT_ENDPOINT": "https://mock.openai.azure.com/",
+        "AZURE_AI_MODEL_DEPLOYMENT": DEPLOYMENT,
+        "AZURE_OPENAI_API_KEY": "mock-key",
+        "AZURE_OPENAI_BASE_URL": (
+            f"http://127.0.0.1:{openai_port}/openai/deployments/{DEPLOYMENT}"
+        ),
+        "WeatherFunctionUrl": f"http://127.0.0.1:{weather_port}",
+        "APPLICATIONINSIGHTS_CONNECTION_STRING": "",
+        "SESSION_STORE": "memory",
+        "LOG_LEVEL": "WARNING",
+    }
+    for override in args.env:
+        key, _, value = override.partition("=")
+        env[key] = value
+
+    processes: list[subprocess.Popen] = []
+    try:
+        for module, port, extra in (
+            ("benchmarks.mock_openai", openai_port, mock_args),
+            (
+                "benchmarks.mock_weather",
+                weather_port,
+                [
+                    "--latency", str(args.weather_latency),
+                    "--error-rate", str(args.weather_error_rate),
+                    "--slow-rate", str(args.weather_slow_rate),
+                    "--slow-latency", str(args.weather_slow_latency),
+                ],
+            ),
+        ):
+            process = subprocess.Popen(
+                [*python, module, "--port", str(port), *extra], cwd=SERVICE_DIR
+            )
+            processes.append(process)
+            wait_until_ready(f"http://127.0.0.1:{port}/stats", process, 30)
+
+        process = subprocess.Popen(
+            [*python, "benchmarks.serve", "--port", str(app_port)],
+            cwd=SERVICE_DIR,
+            env=env,
+        )
+        processes.append(process)
+        app_url = f"http://127.0.0.1:{app_port}"
+        wait_until_ready(f"{app_url}/health", process, 120)
+        yield {
+            "app": app_url,
+            "openai": f"http://127.0.0.1:{openai_port}",
+            "weather": f"http://127.0.0.1:{weather_port}",
+        }
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def is_content(line: str, stream_format: str) -> bool:
+    """Return True if a stream line carries response text."""
+    if stream_format == "text":
+        return line.startswith("data: ") and not line.startswith("data: [")
+    payload = line[len("data: "):] if stream_format == "sse" else line
+    if not payload.startswith("{"):
+        return False
+    return json.loads(payload).get("type") == "delta"
+
+
+async def one_request(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    stream_format: str,
+    index: int,
+) -> dict[str, object]:
+    """Send one chat request and time it."""
+    body = {
+        "message": f"What's the weather in {CITIES[index % len(CITIES)]}? (#{index})"
+    }
+    started = time.perf_counter()
+    first_token: float | None = None
+    try:
+        if endpoint == "chat":
+            response = await client.post("/api/chat", json=body)
+            status = response.status_code
+            first_token = time.perf_counter() - started
+        else:
+            async with client.stream(
+                "POST", "/api/chat/stream", params={"format": stream_format}, json=body
+            ) as response:
+                status = response.status_code
+                async for line in response.aiter_lines():
+                    if first_token is None and is_content(line, stream_format):
+                        first_token = time.perf_counter() - started
+                    if line.startswith("data: [ERROR") or '"type":"error"' in line:
+                        status = 599
+    except httpx.HTTPError as e:
+        logger.debug("Request %d failed: %s", index, e)
+        status = 0
+    return {
+        "status": status,
+        "latency": time.perf_counter() - started,
+        "ttft": first_token,
+    }
+
+
+async def mock_requests(urls: dict[str, str]) -> dict[str, int]:
+    """Requests served so far by each mock."""
+    async with httpx.AsyncClient() as client:
+        return {
+            name: (await client.get(f"{urls[name]}/stats")).json()["requests"]
+            for name in ("openai", "weather")
+        }
+
+
+async def run_level(
+    urls: dict[str, str],
+    endpoint: str,
+    stream_format: str,
+    concurrency: int,
+    requests: int,
+    counter: Iterator[int],
+) -> dict[str, object]:
+    """Drive one endpoint at one concurrency level."""
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    calls_before = await mock_requests(urls)
+    async with httpx.AsyncClient(
+        base_url=urls["app"],
+        limits=limits,
+        timeout=300,
+        headers={"Cache-Control": "no-cache"},
+    ) as client:
+        await client.post("/_bench/reset")
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for _ in range(requests):
+            queue.put_nowait(next(counter))
+        results: list[dict[str, object]] = []
+
+        async def worker() -> None:
+            while not queue.empty():
+                index = queue.get_nowait()
+                results.append(
+                    await one_request(client, endpoint, stream_format, index)
+                )
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        server = (await client.get("/_bench/stats")).json()
+    calls_after = await mock_requests(urls)
+
+    ok = [r for r in results if r["status"] == 200]
+    statuses: dict[str, int] = {}
+    for result in results:
+        statuses[str(result["status"])] = statuses.get(str(result["status"]), 0) + 1
+    rss_growth = max(server["rss_peak_mb"] - server["rss_baseline_mb"], 0)
+    return {
+        "endpoint": endpoint,
+        "format": stream_format if endpoint == "stream" else None,
+        "concurrency": concurrency,
+        "requests": requests,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(ok) / elapsed, 2),
+        "statuses": statuses,
+        "latency_ms": summarize_ms([r["latency"] for r in ok]),
+        "ttft_ms": summarize_ms([r["ttft"] for r in ok if r["ttft"] is not None]),
+        "memory_per_request_kb": round(rss_growth * 1024 / concurrency, 1),
+        "model_calls_per_request": round(
+            (calls_after["openai"] - calls_before["openai"]) / requests, 2
+        ),
+        "weather_calls_per_request": round(
+            (calls_after["weather"] - calls_before["weather"]) / requests, 2
+        ),
+        **server,
+    }
+
+
+def git_revision() -> str | None:
+    """Current commit of the checkout, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=SERVICE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result: dict[str, object]) -> None:
+    latency, ttft = result["latency_ms"], result["ttft_ms"]
+    name = result["endpoint"] + (f"[{result['format']}]" if result["format"] else "")
+    print(
+        f"{name:<13} c={result['concurrency']:<4} {result['rps']:>8} rps  "
+        f"p50={latency['p50']} p95={latency['p95']} p99={latency['p99']}ms  "
+        f"ttft p50={ttft['p50']} p95={ttft['p95']}ms  "
+        f"lag p99={result['loop_lag_p99_ms']}ms  "
+        f"mem={result['memory_per_request_kb']}KB/req  "
+        f"model_calls={result['model_calls_per_request']}/req  "
+        f"statuses={result['statuses']}"
+    )
+
+
+def compare(baseline: dict[str, object], current: dict[str, object]) -> None:
+    """Print relative changes against a baseline run."""
+
+    def key(result: dict[str, object]) -> tuple:
+        return result["endpoint"], result["format"], result["concurrency"]
+
+    previous = {key(r): r for r in baseline["results"]}
+    print(f"\nCompared with {baseline.get('revision')} ({baseline.get('timestamp')}):")
+    for result in current["results"]:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        changes = []
+        for label, old, new in (
+            ("rps", before["rps"], result["rps"]),
+            ("p95", before["latency_ms"]["p95"], result["latency_ms"]["p95"]),
+            ("ttft p95", before["ttft_ms"]["p95"], result["ttft_ms"]["p95"]),
+            ("lag p99", before["loop_lag_p99_ms"], result["loop_lag_p99_ms"]),
+        ):
+            if old and new is not None:
+                changes.append(f"{label} {(new - old) / old:+.1%}")
+        print(
+            f"  {result['endpoint']:<7} c={result['concurrency']:<4} "
+            + ", ".join(changes)
+        )
+
+
+async def run(args: argparse.Namespace) -> dict[str, object]:
+    counter = itertools.count()
+    results = []
+    with start_servers(args) as urls:
+        # Warm up connections, caches and allocator before measuring
+        await run_level(urls, "stream", args.format, 4, 8, counter)
+        for endpoint in args.endpoints.split(","):
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                result = await run_level(
+                    urls,
+                    endpoint,
+                    args.format,
+                    concurrency,
+                    max(args.requests, concurrency),
+                    counter,
+                )
+                print_result(result)
+                results.append(result)
+    return {
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("json", "compare")
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--endpoints", default="chat,stream")
+    parser.add_argument("--concurrency", default="1,16,64")
+    parser.add_argument(
+        "--requests", type=int, default=200, help="Requests per concurrency level"
+    )
+    parser.add_argument("--format", choices=["text", "sse", "ndjson"], default="text")
+    add_script_arguments(parser)
+    add_server_arguments(parser)
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Baseline results file to compare with")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run(args))
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+"""
+OpenAI-compatible mock chat completions server for offline load tests.
+
+Replays the service's agent flow without a model: the CoordinatorAgent
+(any request offering a transfer_to_* tool but no weather tool) hands off
+to QueryAgent, QueryAgent calls get_weather for each location in the user
+message ("in Boston, Denver and Miami") and then streams an answer,
+calling complete_task when the Handoff plugin is offered. Locations are
+looked up in one turn of parallel tool calls, or one per turn when the
+request sets parallel_tool_calls to false. Requests without tools (e.g. history
+summaries) get a plain answer.
+
+Point the service at it with
+AZURE_OPENAI_BASE_URL=http://127.0.0.1:PORT/openai/deployments/NAME.
+Deployments are told apart by URL, so per-agent deployments can be given
+their own latency (--deployment-latency) or be throttled outright
+(--throttle-deployment); GET /stats counts requests per deployment.
+
+Prompt caching is simulated like Azure OpenAI's: a prompt (tools, then
+messages) of at least --prompt-cache-min-tokens whose leading 128-token
+blocks match an earlier prompt to the same deployment reports those
+tokens as cached_tokens. With --keep-requests N, GET /requests returns
+the last N request bodies for inspection.
+
+Usage (from src/ai-service):
+    python -m benchmarks.mock_openai --port 8010 --first-token-latency 0.3 \\
+        --tokens-per-second 50
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import random
+import re
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+_ids = itertools.count()
+
+_PLACE = r"[A-Z][\w'-]*(?:\s+[A-Z][\w'-]*)*"
+_LOCATION_PATTERN = re.compile(
+    rf"\b(?:in|for|at)\s+({_PLACE}(?:(?:,\s*|,?\s+and\s+){_PLACE})*)"
+)
+_LOCATION_SEPARATOR = re.compile(r",\s*(?:and\s+)?|\s+and\s+")
+
+CHARS_PER_TOKEN = 4
+CACHE_BLOCK_TOKENS = 128
+
+
+@dataclass
+class MockScript:
+    """Latency, token rate and error injection for the mock model."""
+
+    first_token_latency: float = 0.0
+    tokens_per_second: float = 0.0
+    answer_tokens: int = 40
+    error_rate: float = 0.0
+    retry_after: int = 1
+    deployment_latency: dict[str, float] = field(default_factory=dict)
+    throttled_deployments: frozenset[str] = frozenset()
+    prompt_cache_min_tokens: int = 1024
+    keep_requests: int = 0
+
+
+@dataclass
+class Reply:
+    """What the mock model answers: text tokens and/or tool calls."""
+
+    tokens: list[str]
+    tool_calls: list[tuple[str, str]]
+
+
+def plan_reply(body: dict[str, Any], script: MockScript) -> Reply:
+    """
+    Decide the reply for a chat completions request.
+
+    Args:
+        body: Request body
+        script: Mock configuration
+
+    Returns:
+        Reply to send
+    """
+    tools = [tool["function"]["name"] for tool in body.get("tools") or []]
+    messages = body.get("messages") or []
+
+    last_user = max(
+        (index for index, m in enumerate(messages) if m.get("role") == "user"),
+        default=-1,
+    )
+    user_text = _text(messages[last_user]) if last_user >= 0 else ""
+    called = [
+        (call["function"]["name"], call["function"].get("arguments") or "{}")
+        for m in messages[last_user + 1:]
+        for call in m.get("tool_calls") or []
+    ]
+
+    weather_tool = next((t for t in tools if t.endswith("get_weather")), None)
+    transfers = [t for t in tools if "transfer_to_" in t]
+    if weather_tool is None and transfers:
+        target = next((t for t in transfers if t.endswith("QueryAgent")), transfers[0])
+        return Reply(tokens=[], tool_calls=[(target, "{}")])
+
+    match = _LOCATION_PATTERN.search(user_text)
+    locations = _LOCATION_SEPARATOR.split(match.group(1)) if match else ["Seattle"]
+    if weather_tool is not None:
+        looked_up = {
+            json.loads(arguments).get("location")
+            for name, arguments in called
+            if name.endswith("get_weather")
+        }
+        remaining = [location for location in locations if location not in looked_up]
+        if remaining:
+            if body.get("parallel_tool_calls") is False:
+                remaining = remaining[:1]
+            return Reply(
+                tokens=[],
+                tool_calls=[
+                    (weather_tool, json.dumps({"location": location}))
+                    for location in remaining
+                ],
+            )
+
+    words = (
+        f"The weather in {', '.join(locations)} is 72 degrees and partly "
+        "cloudy with light winds and clear skies expected later."
+    ).split()
+    tokens = [
+        (" " if index else "") + words[index % len(words)]
+        for index in range(max(script.answer_tokens, 1))
+    ]
+    tool_calls = [
+        (tool, json.dumps({"task_summary": "Answered the weather question"}))
+        for tool in tools
+        if tool.endswith("complete_task")
+    ]
+    return Reply(tokens=tokens, tool_calls=tool_calls)
+
+
+def _text(message: dict[str, Any]) -> str:
+    """Flatten a message's content, which may be a string or content parts."""
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content)
+    return content
+
+
+def prompt_text(body: dict[str, Any]) -> str:
+    """The prompt as the mock sees it: tool schemas, then the messages."""
+    return json.dumps(
+        [body.get("tools") or [], body.get("messages") or []],
+        separators=(",", ":"),
+    )
+
+
+class PromptCache:
+    """
+    Simulated service-side prompt cache.
+
+    Remembers chained hashes of every prompt's leading 128-token blocks,
+    per deployment. A prompt is served from cache up to the last block it
+    shares with an earlier one, counting only blocks at or beyond the
+    minimum prompt length.
+    """
+
+    def __init__(self, min_tokens: int, max_blocks: int = 100_000):
+        self.min_tokens = min_tokens
+        self.max_blocks = max_blocks
+        self._blocks: OrderedDict[str, None] = OrderedDict()
+
+    def cached_tokens(self, deployment: str, prompt: str) -> int:
+        """Tokens of the prompt served from cache; remembers the prompt."""
+        block = CACHE_BLOCK_TOKENS * CHARS_PER_TOKEN
+        chain = hashlib.sha256(deployment.encode())
+        cached = 0
+        for end in range(block, len(prompt) + 1, block):
+            chain.update(prompt[end - block:end].encode())
+            if end // CHARS_PER_TOKEN < self.min_tokens:
+                continue
+            key = chain.hexdigest()
+            if key in self._blocks:
+                self._blocks.move_to_end(key)
+                cached = end // CHARS_PER_TOKEN
+            else:
+                self._blocks[key] = None
+                if len(self._blocks) > self.max_blocks:
+                    self._blocks.popitem(last=False)
+        return cached
+
+
+def _usage(
+    prompt_tokens: int, cached_tokens: int, reply: Reply
+) -> dict[str, Any]:
+    """Rough token usage: four characters per prompt token."""
+    completion_tokens = len(reply.tokens) + 10 * len(reply.tool_calls)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": cached_tokens},
+    }
+
+
+def create_app(script: MockScript) -> FastAPI:
+    """
+    Create the mock server.
+
+    Args:
+        script: Mock configuration
+
+    Returns:
+        FastAPI app serving chat completions and model listing
+    """
+    app = FastAPI(title="Mock OpenAI")
+    stats: dict[str, Any] = {
+        "requests": 0,
+        "errors_injected": 0,
+        "deployments": {},
+        "prompt_tokens": 0,
+        "cached_tokens": 0,
+    }
+    prompt_cache = PromptCache(script.prompt_cache_min_tokens)
+    kept: deque[dict[str, Any]] = deque(maxlen=script.keep_requests or None)
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.get("/requests")
+    async def get_requests():
+        return list(kept) if script.keep_requests else []
+
+    @app.get("/{path:path}/models")
+    async def list_models(path: str):
+        return {"object": "list", "data": [{"id": "mock", "object": "model"}]}
+
+    @app.post("/{path:path}/chat/completions")
+    async def chat_completions(path: str, request: Request):
+        stats["requests"] += 1
+        body = await request.json()
+        deployment = path.rpartition("deployments/")[2] or body.get("model") or "mock"
+        deployments = stats["deployments"]
+        deployments[deployment] = deployments.get(deployment, 0) + 1
+        if deployment in script.throttled_deployments or (
+            script.error_rate and random.random() < script.error_rate
+        ):
+            stats["errors_injected"] += 1
+            return JSONResponse(
+                {"error": {"code": "429", "message": "Injected rate limit"}},
+                status_code=429,
+                headers={"Retry-After": str(script.retry_after)},
+            )
+
+        call_script = script
+        if deployment in script.deployment_latency:
+            call_script = replace(
+                script, first_token_latency=script.deployment_latency[deployment]
+            )
+        if script.keep_requests:
+            kept.append({"deployment": deployment, "body": body})
+        prompt = prompt_text(body)
+        prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+        cached_tokens = prompt_cache.cached_tokens(deployment, prompt)
+        stats["prompt_tokens"] += prompt_tokens
+        stats["cached_tokens"] += cached_tokens
+        reply = plan_reply(body, call_script)
+        usage = _usage(prompt_tokens, cached_tokens, reply)
+        completion_id = f"chatcmpl-mock-{next(_ids)}"
+        model = body.get("model") or "mock"
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage")
+            return StreamingResponse(
+                _stream(
+                    completion_id,
+                    model,
+                    reply,
+                    call_script,
+                    usage if include_usage else None,
+                ),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(
+            call_script.first_token_latency + _token_time(reply, call_script)
+        )
+        message: dict[str, Any] = {
+            "role": "assistant",
+            "content": "".join(reply.tokens) or None,
+        }
+        if reply.tool_calls:
+            message["tool_calls"] = [
+                {
+                    "id": f"call_{next(_ids)}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": arguments},
+                }
+                for name, arguments in reply.tool_calls
+            ]
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if reply.tool_calls else "stop",
+                }
+            ],
+            "usage": usage,
+        }
+
+    return app
+
+
+def _token_time(reply: Reply, script: MockScript) -> float:
+    """Seconds spent generating the reply's tokens at the scripted rate."""
+    if not script.tokens_per_second:
+        return 0.0
+    return len(reply.tokens) / script.tokens_per_second
+
+
+async def _stream(
+    completion_id: str,
+    model: str,
+    reply: Reply,
+    script: MockScript,
+    usage: dict[str, Any] | None,
+) -> AsyncIterator[str]:
+    """Yield the reply as OpenAI streaming chunks."""
+
+    def chunk(delta: dict[str, Any], finish_reason: str | None = None) -> str:
+        return "data: " + json.dumps(
+            {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+        ) + "\n\n"
+
+    await asyncio.sleep(script.first_token_latency)
+    yield chunk({"role": "assistant", "content": ""})
+    delay = 1 / script.tokens_per_second if script.tokens_per_second else 0
+    for token in reply.tokens:
+        yield chunk({"content": token})
+        if delay:
+            await asyncio.sleep(delay)
+    for index, (name, arguments) in enumerate(reply.tool_calls):
+        yield chunk(
+            {
+                "tool_calls": [
+                    {
+                        "index": index,
+                        "id": f"call_{next(_ids)}",
+                        "type": "function",
+                        "function": {"name": name, "arguments": arguments},
+                    }
+                ]
+            }
+        )
+    yield chunk({}, "tool_calls" if reply.tool_calls else "stop")
+    if usage is not None:
+        yield "data: " + json.dumps(
+            {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [],
+                "usage": usage,
+            }
+        ) + "\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def add_script_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mock model's command line options to a parser."""
+    parser.add_argument(
+        "--first-token-latency",
+        type=float,
+        default=0.0,
+        help="Seconds before the first chunk of every model response",
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=0.0,
+        help="Answer token rate (0 = as fast as possible)",
+    )
+    parser.add_argument("--answer-tokens", type=int, default=40)
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of model calls answered with 429",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=int,
+        default=1,
+        help="Retry-After seconds sent with injected 429s",
+    )
+    parser.add_argument(
+        "--deployment-latency",
+        action="append",
+        default=[],
+        metavar="NAME=SECONDS",
+        help="First-token latency for one deployment, overriding the default",
+    )
+    parser.add_argument(
+        "--throttle-deployment",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Answer every call to this deployment with 429",
+    )
+    parser.add_argument(
+        "--prompt-cache-min-tokens",
+        type=int,
+        default=1024,
+        help="Shortest prompt the simulated prompt cache serves (Azure: 1024)",
+    )
+    parser.add_argument(
+        "--keep-requests",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Keep the last N request bodies for GET /requests",
+    )
+
+
+def script_from_args(args: argparse.Namespace) -> MockScript:
+    """Build a MockScript from parsed command line options."""
+    return MockScript(
+        first_token_latency=args.first_token_latency,
+        tokens_per_second=args.tokens_per_second,
+        answer_tokens=args.answer_tokens,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        deployment_latency={
+            name: float(seconds)
+            for name, _, seconds in (
+                item.partition("=") for item in args.deployment_latency
+            )
+        },
+        throttled_deployments=frozenset(args.throttle_deployment),
+        prompt_cache_min_tokens=args.prompt_cache_min_tokens,
+        keep_requests=args.keep_requests,
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8010)
+    add_script_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_app(script_from_args(args)),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Local stand-in for the weather Azure Function (src/weather-function).
+
+Serves the same routes and payloads as function_app.py, with optional
+latency and fault injection, so load tests need neither the Functions host
+nor Azure. Point the service at it with
+WeatherFunctionUrl=http://127.0.0.1:PORT.
+
+Usage (from src/ai-service):
+    python -m benchmarks.mock_weather --port 8011 --latency 0.05 \\
+        --error-rate 0.1 --slow-rate 0.05 --slow-latency 2
+"""
+
+import argparse
+import asyncio
+import random
+
+from fastapi import Body, FastAPI
+from fastapi.responses import JSONResponse
+
+
+def build_weather_data(location: str) -> dict:
+    """Build the weather payload returned by function_app.py."""
+    return {
+        "location": location,
+        "temperature": 72,
+        "temperature_unit": "F",
+        "conditions": "Partly Cloudy",
+        "humidity": 65,
+        "wind_speed": 8,
+        "wind_unit": "mph",
+        "forecast": "Clear skies expected for the rest of the day",
+    }
+
+
+def create_app(
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    slow_rate: float = 0.0,
+    slow_latency: float = 0.0,
+) -> FastAPI:
+    """
+    Create the mock weather function.
+
+    Args:
+        latency: Seconds added to every weather lookup
+        error_rate: Fraction of lookups answered with 503
+        slow_rate: Fraction of lookups taking `slow_latency` instead
+        slow_latency: Seconds per slow lookup
+
+    Returns:
+        FastAPI app
+    """
+    app = FastAPI(title="Mock Weather Function")
+    stats = {"requests": 0, "errors_injected": 0, "slow_injected": 0}
+
+    async def lookup_delay() -> JSONResponse | None:
+        """Apply injected latency; return an error response to send, if any."""
+        stats["requests"] += 1
+        if slow_rate and random.random() < slow_rate:
+            stats["slow_injected"] += 1
+            await asyncio.sleep(slow_latency)
+        else:
+            await asyncio.sleep(latency)
+        if error_rate and random.random() < error_rate:
+            stats["errors_injected"] += 1
+            return JSONResponse({"error": "Injected failure"}, status_code=503)
+        return None
+
+    @app.get("/")
+    async def root():
+        return {"service": "Mock Weather Function"}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "healthy", "service": "Weather Function"}
+
+    @app.get("/api/weather")
+    async def weather(location: str = "Seattle"):
+        return await lookup_delay() or build_weather_data(location)
+
+    @app.post("/api/weather/batch")
+    async def weather_batch(locations: list[str] = Body(..., embed=True)):
+        return await lookup_delay() or {
+            "results": [build_weather_data(location) for location in locations]
+        }
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds per weather lookup"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of lookups answered with 503",
+    )
+    parser.add_argument(
+        "--slow-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of lookups taking --slow-latency instead",
+    )
+    parser.add_argument(
+        "--slow-latency", type=float, default=2.0, help="Seconds per slow lookup"
+    )
+    args = parser.parse_args()
+    uvicorn.run(
+        create_app(args.latency, args.error_rate, args.slow_rate, args.slow_latency),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Check that agents' prompts keep a stable, cache-friendly prefix across turns.
+
+Starts the mocks and the service (see benchmarks.loadtest) with the mock
+model keeping every request, then holds multi-turn conversations: one in
+session mode alternating /api/chat and /api/chat/stream, and one resending
+the history each /api/chat response returns. For every agent it checks
+that:
+
+- the tool schemas and leading system messages (agent instructions and
+  the service's system message) are byte-identical on every call;
+- each turn's first prompt starts with the previous turn's first prompt,
+  so the whole conversation so far is a reusable prefix.
+
+The resent history gets a system message mid-conversation, which must
+come back in place in the returned history and stay out of the leading
+system messages of later prompts.
+
+It also prints the prompt and cached tokens each turn reported through
+`include_usage`, from the mock's simulated prompt cache (serving prompts
+from 256 tokens by default, as the agents' prompts are short; Azure's
+minimum is 1024, see --prompt-cache-min-tokens). Exits with
+status 1 if a check fails. History trimming (HISTORY_TOKEN_BUDGET) breaks
+the second check by design, every HISTORY_CHUNK_MESSAGES messages.
+
+Usage (from src/ai-service):
+    python -m benchmarks.prompt_prefix --turns 8
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import Any
+
+import httpx
+
+from .loadtest import add_server_arguments, start_servers
+from .mock_openai import add_script_arguments
+
+QUESTIONS = [
+    "What's the weather in Seattle?",
+    "Thanks! Any tips for a rainy weekend?",
+    "And the weather in Denver and Boston?",
+    "Which of those is warmest?",
+    "What's the weather in Miami?",
+    "Great, thank you for the help.",
+]
+
+# Added to the resent history before this turn (counted from 0)
+MID_SYSTEM_TURN = 2
+MID_SYSTEM_MESSAGE = "Give temperatures in Fahrenheit from now on."
+
+
+def _dump(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def static_prefix(body: dict[str, Any]) -> str:
+    """Tool schemas and leading system messages of a request, serialized."""
+    messages = body.get("messages") or []
+    leading = 0
+    while leading < len(messages) and messages[leading].get("role") == "system":
+        leading += 1
+    return _dump([body.get("tools") or [], messages[:leading]])
+
+
+def agent_of(body: dict[str, Any]) -> str | None:
+    """Agent that sent a request: its instructions message carries the name."""
+    messages = body.get("messages") or []
+    return messages[0].get("name") if messages else None
+
+
+async def chat_turn(
+    client: httpx.AsyncClient, payload: dict[str, Any], stream: bool
+) -> tuple[dict[str, Any], dict[str, Any] | None]:
+    """
+    Send one turn with usage reporting.
+
+    Returns:
+        Tuple of (usage, response history or None for streams)
+    """
+    payload = {**payload, "include_usage": True}
+    if not stream:
+        response = await client.post("/api/chat", json=payload)
+        response.raise_for_status()
+        body = response.json()
+        return body["usage"], body["history"]
+    usage: dict[str, Any] = {}
+    async with client.stream(
+        "POST", "/api/chat/stream", params={"format": "ndjson"}, json=payload
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if event["type"] == "usage":
+                usage = event["usage"]
+            elif event["type"] == "error":
+                raise RuntimeError(event.get("detail"))
+    return usage, None
+
+
+async def converse(
+    client: httpx.AsyncClient, mock: httpx.AsyncClient, mode: str, turns: int
+) -> tuple[list[list[dict[str, Any]]], list[str]]:
+    """
+    Hold one conversation.
+
+    Args:
+        client: Client of the service
+        mock: Client of the mock model
+        mode: "session" or "history"
+        turns: Number of user turns
+
+    Returns:
+        Tuple of (the model requests made per turn, failures of the
+        returned histories)
+    """
+    history: dict[str, Any] | None = None
+    requests_per_turn = []
+    failures = []
+    seen = len((await mock.get("/requests")).json())
+    for turn in range(turns):
+        payload: dict[str, Any] = {"message": QUESTIONS[turn % len(QUESTIONS)]}
+        stream = False
+        if mode == "session":
+            payload["session_id"] = "prompt-prefix"
+            stream = turn % 2 == 1
+        elif history is not None:
+            if turn == MID_SYSTEM_TURN:
+                history["messages"].append(
+                    {"role": "system", "content": MID_SYSTEM_MESSAGE}
+                )
+            payload["history"] = history
+        sent = history["messages"] if mode == "history" and history else []
+        usage, history = await chat_turn(client, payload, stream)
+        if history is not None and history["messages"][:len(sent)] != sent:
+            failures.append(
+                f"{mode} turn {turn + 1}: returned history does not keep the "
+                "messages sent in their order"
+            )
+        kept = (await mock.get("/requests")).json()
+        requests_per_turn.append([item["body"] for item in kept[seen:]])
+        seen = len(kept)
+        prompt = usage.get("prompt_tokens", 0)
+        cached = usage.get("cached_tokens", 0)
+        print(
+            f"{mode:<8} turn {turn + 1:<2} {'stream' if stream else 'chat':<6} "
+            f"model_calls={usage.get('model_calls')} prompt={prompt} "
+            f"cached={cached} ({100 * cached / prompt if prompt else 0:.0f}%)"
+        )
+    return requests_per_turn, failures
+
+
+def check(mode: str, requests_per_turn: list[list[dict[str, Any]]]) -> list[str]:
+    """
+    Check prompt prefixes of one conversation.
+
+    Returns:
+        Failure descriptions; empty if the prefixes are stable
+    """
+    failures = []
+    prefixes: dict[str, str] = {}
+    previous: dict[str, list[dict[str, Any]]] = {}
+    for turn, bodies in enumerate(requests_per_turn, start=1):
+        first: dict[str, list[dict[str, Any]]] = {}
+        for body in bodies:
+            agent = agent_of(body)
+            if agent is None:
+                continue
+            prefix = static_prefix(body)
+            expected = prefixes.setdefault(agent, prefix)
+            if prefix != expected:
+                offset = next(
+                    (i for i, (a, b) in enumerate(zip(prefix, expected)) if a != b),
+                    min(len(prefix), len(expected)),
+                )
+                failures.append(
+                    f"{mode} turn {turn}: {agent} tools/system prefix differs "
+                    f"at byte {offset}: ...{prefix[max(offset - 40, 0):offset + 40]}..."
+                )
+            first.setdefault(agent, body["messages"])
+        for agent, messages in first.items():
+            before = previous.get(agent)
+            if before is not None and messages[:len(before)] != before:
+                shared = next(
+                    (
+                        i
+                        for i, (a, b) in enumerate(zip(messages, before))
+                        if _dump(a) != _dump(b)
+                    ),
+                    len(before),
+                )
+                failures.append(
+                    f"{mode} turn {turn}: {agent} prompt does not extend the "
+                    f"previous turn's; first {shared} of {len(before)} "
+                    "messages kept"
+                )
+            previous[agent] = messages
+    return failures
+
+
+async def run(args: argparse.Namespace) -> list[str]:
+    failures = []
+    with start_servers(args) as urls:
+        async with httpx.AsyncClient(
+            base_url=urls["app"],
+            timeout=120,
+            headers={"Cache-Control": "no-cache"},
+        ) as client, httpx.AsyncClient(base_url=urls["openai"]) as mock:
+            for mode in ("session", "history"):
+                requests_per_turn, history_failures = await converse(
+                    client, mock, mode, args.turns
+                )
+                failures += history_failures + check(mode, requests_per_turn)
+            stats = (await mock.get("/stats")).json()
+    print(
+        f"mock prompt cache: {stats['cached_tokens']} of "
+        f"{stats['prompt_tokens']} prompt tokens cached"
+    )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=8)
+    add_script_arguments(parser)
+    add_server_arguments(parser)
+    # The agents' prompts are short; Azure only caches from 1024 tokens
+    parser.set_defaults(prompt_cache_min_tokens=256)
+    args = parser.parse_args()
+    args.keep_requests = max(args.keep_requests, 1000)
+
+    logging.basicConfig(level=logging.WARNING)
+    failures = asyncio.run(run(args))
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: prompt prefixes are stable across turns")
+
+
+if __name__ == "__main__":
+    main()
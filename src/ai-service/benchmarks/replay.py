@@ -0,0 +1,143 @@
+"""
+Replay a recorded orchestration trace to measure the service's own overhead.
+
+Loads a trace written with RECORDING_MODE=record, builds ChatAgentService
+in replay mode and re-runs every recorded chat turn. Model and weather
+calls are served from the trace, so with --speed 0 the measured time is
+the service's own work: history conversion, orchestration setup, agent
+runtime dispatch, and stream coalescing and SSE framing. With --speed 1
+the recorded model timings are reproduced.
+
+Usage (from src/ai-service):
+    python -m benchmarks.replay traces/orchestration.jsonl --iterations 20 \\
+        --speed 0 --profile replay.prof
+"""
+
+import argparse
+import asyncio
+import cProfile
+import json
+import logging
+import os
+import pstats
+import time
+
+
+async def replay(args: argparse.Namespace) -> dict[str, object]:
+    # Settings are read at import time, so configure them first
+    os.environ["RECORDING_MODE"] = "replay"
+    os.environ["RECORDING_FILE"] = args.trace
+    os.environ["RECORDING_REPLAY_SPEED"] = str(args.speed)
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+    os.environ.setdefault(
+        "AZURE_AI_PROJECT_ENDPOINT", "https://replay.openai.azure.com/"
+    )
+    os.environ.setdefault("AZURE_AI_MODEL_DEPLOYMENT", "replay")
+    os.environ.setdefault("AZURE_OPENAI_API_KEY", "replay")
+
+    from app.models import ChatHistoryModel, StreamFormat
+    from app.routers.chat import format_event
+    from app.services.agent import ChatAgentService
+    from app.services.streaming import coalesce_deltas
+    from app.core.config import settings
+
+    from .stats import summarize_ms
+
+    service = ChatAgentService()
+    turns = service.trace.turns
+    if not turns:
+        raise SystemExit(f"{args.trace} has no recorded chat turns")
+
+    async def run_turn(turn: dict[str, object]) -> tuple[float, float | None]:
+        history = (
+            ChatHistoryModel.model_validate({"messages": turn["history"]})
+            if turn["history"]
+            else None
+        )
+        started = time.perf_counter()
+        first_token = None
+        if turn["streamed"]:
+            events = coalesce_deltas(
+                service.stream_chat_completion(turn["message"], history),
+                settings.stream_flush_interval_seconds,
+                settings.stream_flush_max_bytes,
+            )
+            stream_format = StreamFormat(args.format)
+            async for event in events:
+                if format_event(event, stream_format) and first_token is None:
+                    first_token = time.perf_counter() - started
+        else:
+            await service.get_chat_completion(turn["message"], history)
+        return time.perf_counter() - started, first_token
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(turn: dict[str, object]) -> tuple[float, float | None]:
+        async with semaphore:
+            return await run_turn(turn)
+
+    # One untimed pass to build caches and warm the runtime pool
+    for turn in turns:
+        await run_turn(turn)
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(limited(turn) for _ in range(args.iterations) for turn in turns)
+    )
+    elapsed = time.perf_counter() - started
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+
+    misses = service.trace.misses
+    await service.close()
+    return {
+        "trace": args.trace,
+        "speed": args.speed,
+        "turns": len(results),
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "turns_per_s": round(len(results) / elapsed, 1),
+        "latency_ms": summarize_ms([duration for duration, _ in results]),
+        "ttft_ms": summarize_ms([ttft for _, ttft in results if ttft is not None]),
+        "replay_misses": misses,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("trace", help="Trace file recorded with RECORDING_MODE=record")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="Multiplier for recorded model and tool delays (0 = no delay)",
+    )
+    parser.add_argument("--format", choices=["text", "sse", "ndjson"], default="text")
+    parser.add_argument("--profile", help="Write cProfile stats to this file")
+    parser.add_argument("--top", type=int, default=25, help="Profile rows to print")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    result = asyncio.run(replay(args))
+    latency = result["latency_ms"]
+    print(
+        f"{result['turns']} turns in {result['elapsed_s']}s "
+        f"({result['turns_per_s']}/s)  p50={latency['p50']}ms "
+        f"p95={latency['p95']}ms p99={latency['p99']}ms  "
+        f"ttft p50={result['ttft_ms']['p50']}ms  misses={result['replay_misses']}"
+    )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
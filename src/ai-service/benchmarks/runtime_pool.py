@@ -0,0 +1,178 @@
+"""
+Benchmark handoff orchestration throughput against the runtime pool size.
+
+Runs real HandoffOrchestrations (CoordinatorAgent -> QueryAgent ->
+complete_task) on a scripted chat service, so no Azure resources are
+needed, and reports throughput and latency for each pool size.
+
+Usage (from src/ai-service):
+    python -m benchmarks.runtime_pool --pool-sizes 1,2,4,8 \\
+        --orchestrations 2000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from semantic_kernel import Kernel
+from semantic_kernel.agents import (
+    ChatCompletionAgent,
+    HandoffOrchestration,
+    OrchestrationHandoffs,
+)
+from semantic_kernel.connectors.ai import FunctionChoiceBehavior
+from semantic_kernel.connectors.ai.prompt_execution_settings import (
+    PromptExecutionSettings,
+)
+from semantic_kernel.functions import KernelArguments
+
+from app.services.runtime_pool import RuntimePool
+
+from .scripted_chat import ScriptedChatCompletion
+
+
+def build_orchestration_members(latency: float):
+    """Build the coordinator/query agent pair used by the service."""
+    service = ScriptedChatCompletion(ai_model_id="scripted", latency=latency)
+    agents = []
+    for name, instructions in (
+        ("CoordinatorAgent", "You are the coordinator."),
+        ("QueryAgent", "You answer weather queries."),
+    ):
+        kernel = Kernel()
+        kernel.add_service(service)
+        agents.append(
+            ChatCompletionAgent(
+                service=service,
+                kernel=kernel,
+                name=name,
+                instructions=instructions,
+                arguments=KernelArguments(
+                    settings=PromptExecutionSettings(
+                        function_choice_behavior=FunctionChoiceBehavior.Auto()
+                    )
+                ),
+            )
+        )
+    coordinator, query = agents
+    handoffs = (
+        OrchestrationHandoffs()
+        .add(coordinator, query, description="Transfer to QueryAgent")
+        .add(query, coordinator, description="Transfer back to CoordinatorAgent")
+    )
+    return agents, handoffs
+
+
+async def run_pool(
+    pool_size: int,
+    orchestrations: int,
+    concurrency: int,
+    latency: float,
+    policy: str,
+    recycle_after: int,
+) -> dict[str, object]:
+    """Run the workload on one pool configuration and collect results."""
+    members, handoffs = build_orchestration_members(latency)
+    pool = RuntimePool(pool_size, policy=policy, recycle_after=recycle_after)
+    pool.start()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    finished_at: list[float] = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            orchestration = HandoffOrchestration(
+                members=members,
+                handoffs=handoffs,
+                streaming_agent_response_callback=lambda chunk, is_final: None,
+            )
+            async with pool.lease() as runtime:
+                result = await orchestration.invoke(
+                    task=f"What's the weather? #{index}", runtime=runtime
+                )
+                await result.get(timeout=120)
+            now = time.perf_counter()
+            latencies.append(now - started)
+            finished_at.append(now)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(orchestrations)))
+    elapsed = time.perf_counter() - started
+    restarts = sum(stats["restarts"] for stats in pool.stats())
+    await pool.stop()
+
+    # Throughput over the first and last fifth shows slowdown as a runtime
+    # accumulates registrations
+    finished_at.sort()
+    fifth = max(len(finished_at) // 5, 2)
+    head = finished_at[:fifth]
+    tail = finished_at[-fifth:]
+    latencies.sort()
+    return {
+        "pool_size": pool_size,
+        "policy": policy,
+        "recycle_after": recycle_after,
+        "orchestrations": orchestrations,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(orchestrations / elapsed, 1),
+        "first_fifth_per_s": round((len(head) - 1) / (head[-1] - head[0]), 1),
+        "last_fifth_per_s": round((len(tail) - 1) / (tail[-1] - tail[0]), 1),
+        "latency_p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "latency_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        "restarts": restarts,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pool-sizes", default="1,2,4,8")
+    parser.add_argument("--orchestrations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Simulated model seconds per call"
+    )
+    parser.add_argument(
+        "--policy", choices=["least_loaded", "round_robin"], default="least_loaded"
+    )
+    parser.add_argument(
+        "--recycle-after",
+        type=int,
+        default=0,
+        help="Orchestrations per runtime before it is replaced (0 = never)",
+    )
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = []
+    for pool_size in (int(size) for size in args.pool_sizes.split(",")):
+        result = await run_pool(
+            pool_size,
+            args.orchestrations,
+            args.concurrency,
+            args.latency,
+            args.policy,
+            args.recycle_after,
+        )
+        results.append(result)
+        print(
+            f"pool={pool_size:<3} {result['throughput_per_s']:>8} orch/s "
+            f"(first 1/5 {result['first_fifth_per_s']}, "
+            f"last 1/5 {result['last_fifth_per_s']})  "
+            f"p50={result['latency_p50_ms']}ms p95={result['latency_p95_ms']}ms "
+            f"restarts={result['restarts']}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
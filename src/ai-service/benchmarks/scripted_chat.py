@@ -0,0 +1,88 @@
+"""Scripted chat completion service for offline orchestration benchmarks."""
+
+import asyncio
+import itertools
+from typing import Any, AsyncGenerator
+
+from semantic_kernel.connectors.ai.chat_completion_client_base import (
+    ChatCompletionClientBase,
+)
+from semantic_kernel.connectors.ai.prompt_execution_settings import (
+    PromptExecutionSettings,
+)
+from semantic_kernel.contents import (
+    ChatHistory,
+    ChatMessageContent,
+    FunctionCallContent,
+    StreamingChatMessageContent,
+)
+from semantic_kernel.contents.utils.author_role import AuthorRole
+
+_call_ids = itertools.count()
+
+
+class ScriptedChatCompletion(ChatCompletionClientBase):
+    """
+    Chat completion service that replays a fixed handoff script.
+
+    A coordinator (identified by "coordinator" in its instructions) hands
+    off to the QueryAgent; every other agent streams a short answer and
+    calls complete_task. `latency` is slept before each response to stand
+    in for model time.
+    """
+
+    SUPPORTS_FUNCTION_CALLING = True
+    latency: float = 0.0
+    answer_chunks: int = 8
+
+    async def _inner_get_chat_message_contents(
+        self,
+        chat_history: ChatHistory,
+        settings: PromptExecutionSettings,
+    ) -> list[ChatMessageContent]:
+        chunks = [
+            chunk
+            async for chunks in self._inner_get_streaming_chat_message_contents(
+                chat_history, settings
+            )
+            for chunk in chunks
+        ]
+        return [sum(chunks[1:], chunks[0])]
+
+    async def _inner_get_streaming_chat_message_contents(
+        self,
+        chat_history: ChatHistory,
+        settings: PromptExecutionSettings,
+        function_invoke_attempt: int = 0,
+    ) -> AsyncGenerator[list[StreamingChatMessageContent], Any]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        instructions = (chat_history.messages[0].content or "").lower()
+        if "coordinator" in instructions:
+            yield [self._call("Handoff-transfer_to_QueryAgent", "{}")]
+            return
+        for index in range(self.answer_chunks):
+            yield [
+                StreamingChatMessageContent(
+                    role=AuthorRole.ASSISTANT,
+                    choice_index=0,
+                    content=f"token{index} ",
+                    ai_model_id=self.ai_model_id,
+                )
+            ]
+        yield [self._call("Handoff-complete_task", '{"task_summary": "done"}')]
+
+    def _call(self, name: str, arguments: str) -> StreamingChatMessageContent:
+        return StreamingChatMessageContent(
+            role=AuthorRole.ASSISTANT,
+            choice_index=0,
+            ai_model_id=self.ai_model_id,
+            items=[
+                FunctionCallContent(
+                    id=f"call_{next(_call_ids)}",
+                    index=0,
+                    name=name,
+                    arguments=arguments,
+                )
+            ],
+        )
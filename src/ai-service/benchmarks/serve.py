@@ -0,0 +1,111 @@
+"""
+Run the service in one uvicorn worker with load-test instrumentation.
+
+Adds two routes to the app:
+- GET /_bench/stats: event-loop lag percentiles and resident memory
+  (baseline at the last reset and peak since) sampled in-process
+- POST /_bench/reset: start a new measurement window
+
+Usage (from src/ai-service, with the service's environment set):
+    python -m benchmarks.serve --port 8000
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import time
+
+import uvicorn
+
+from .stats import percentile
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak RSS in KiB on Linux; the best available elsewhere
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class LoopMonitor:
+    """Samples event-loop lag and memory on a fixed interval."""
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new measurement window."""
+        self.lags: list[float] = []
+        self.baseline_rss = rss_bytes()
+        self.peak_rss = self.baseline_rss
+
+    async def run(self) -> None:
+        """Sample until cancelled."""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(time.perf_counter() - started - self.interval)
+            self.peak_rss = max(self.peak_rss, rss_bytes())
+
+    def stats(self) -> dict[str, float]:
+        """Summarize the current window."""
+        lags = sorted(self.lags) or [0.0]
+        return {
+            "loop_lag_p50_ms": round(percentile(lags, 50) * 1000, 2),
+            "loop_lag_p99_ms": round(percentile(lags, 99) * 1000, 2),
+            "loop_lag_max_ms": round(lags[-1] * 1000, 2),
+            "rss_baseline_mb": round(self.baseline_rss / 2**20, 1),
+            "rss_peak_mb": round(self.peak_rss / 2**20, 1),
+        }
+
+
+async def serve(port: int) -> None:
+    from main import app
+
+    monitor = LoopMonitor()
+
+    @app.get("/_bench/stats", include_in_schema=False)
+    async def bench_stats():
+        return monitor.stats()
+
+    @app.post("/_bench/reset", include_in_schema=False)
+    async def bench_reset():
+        monitor.reset()
+        return monitor.stats()
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app,
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+            timeout_keep_alive=120,
+        )
+    )
+    sampler = asyncio.create_task(monitor.run())
+    try:
+        await server.serve()
+    finally:
+        sampler.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    asyncio.run(serve(args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Summary statistics shared by the benchmarks."""
+
+import math
+import statistics
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+
+    Args:
+        sorted_values: Values in ascending order; must not be empty
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The value at that percentile
+    """
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize_ms(values: list[float]) -> dict[str, float | None]:
+    """
+    Summarize durations in seconds as milliseconds.
+
+    Args:
+        values: Durations in seconds
+
+    Returns:
+        Mean, p50, p95, p99 and max in milliseconds (None when empty)
+    """
+    if not values:
+        return dict.fromkeys(("mean", "p50", "p95", "p99", "max"))
+    ordered = sorted(values)
+    return {
+        "mean": round(statistics.fmean(ordered) * 1000, 1),
+        "p50": round(percentile(ordered, 50) * 1000, 1),
+        "p95": round(percentile(ordered, 95) * 1000, 1),
+        "p99": round(percentile(ordered, 99) * 1000, 1),
+        "max": round(ordered[-1] * 1000, 1),
+    }
@@ -0,0 +1,128 @@
+"""
+Exercise the cached token provider under concurrent load and an outage.
+
+Runs callers that each request a token in a loop against a fake
+credential issuing short-lived tokens, with the credential failing for
+part of the run, and reports credential calls, how many requests had to
+wait for a token, caller latency and failures.
+
+Usage (from src/ai-service):
+    python -m benchmarks.token_provider --duration 10 --lifetime 3 \\
+        --latency 0.2 --outage 4:5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from app.core.token_provider import CachedTokenProvider
+
+from .fake_credential import FakeCredential
+
+
+async def run_provider(
+    credential: FakeCredential,
+    provider: Callable[[], Awaitable[str]],
+    callers: int,
+    interval: float,
+    duration: float,
+    outage: tuple[float, float] | None,
+) -> dict[str, object]:
+    """Drive one provider and collect caller-side results."""
+    latencies: list[float] = []
+    failures = 0
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def toggle_outage() -> None:
+        if outage is None:
+            return
+        await asyncio.sleep(outage[0])
+        credential.failing = True
+        await asyncio.sleep(outage[1] - outage[0])
+        credential.failing = False
+
+    async def caller() -> None:
+        nonlocal failures
+        while time.perf_counter() < deadline:
+            call_started = time.perf_counter()
+            try:
+                await provider()
+                latencies.append(time.perf_counter() - call_started)
+            except Exception:
+                failures += 1
+            await asyncio.sleep(interval)
+
+    await asyncio.gather(toggle_outage(), *(caller() for _ in range(callers)))
+    latencies.sort()
+    return {
+        "requests": len(latencies) + failures,
+        "failures": failures,
+        "waited_over_1ms": sum(1 for latency in latencies if latency > 0.001),
+        "credential_calls": credential.calls,
+        "latency_p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "latency_p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        "latency_max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument(
+        "--interval", type=float, default=0.01, help="Seconds between calls per caller"
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--lifetime", type=float, default=3.0, help="Token lifetime")
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="Credential seconds per token"
+    )
+    parser.add_argument(
+        "--outage",
+        default="4:5",
+        help="START:END seconds during which the credential fails ('' for none)",
+    )
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    outage = (
+        tuple(float(part) for part in args.outage.split(":")) if args.outage else None
+    )
+
+    credential = FakeCredential(args.lifetime, args.latency)
+    provider = CachedTokenProvider(
+        credential,
+        refresh_margin=args.lifetime / 3,
+        retry_interval=args.lifetime / 10,
+        expiry_skew=args.latency,
+    )
+    result = await run_provider(
+        credential,
+        provider,
+        args.callers,
+        args.interval,
+        args.duration,
+        outage,
+    )
+    await provider.close()
+
+    print(
+        f"requests={result['requests']} failures={result['failures']} "
+        f"waited_over_1ms={result['waited_over_1ms']} "
+        f"credential_calls={result['credential_calls']} "
+        f"p50={result['latency_p50_ms']}ms p99={result['latency_p99_ms']}ms "
+        f"max={result['latency_max_ms']}ms"
+    )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""
+Wall-clock time of multi-location weather questions, with and without
+parallel tool calls.
+
+Starts the mocks and the service (see benchmarks.loadtest) once with
+QUERY_AGENT_PARALLEL_TOOL_CALLS=true and once with false, then asks the
+same N-location questions of each. The mock model asks for every location
+in one turn when parallel tool calls are allowed, and for one location
+per turn otherwise, so the tool phase costs about one weather lookup
+instead of N lookups plus N extra model round-trips.
+
+Usage (from src/ai-service):
+    python -m benchmarks.tool_calls --locations 1,2,4,8 --requests 10 \\
+        --weather-latency 0.2 --first-token-latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+
+from .loadtest import add_server_arguments, mock_requests, start_servers
+from .mock_openai import add_script_arguments
+from .stats import summarize_ms
+
+CITIES = [
+    "Seattle", "Denver", "Boston", "Austin", "Chicago", "Miami",
+    "Portland", "Phoenix", "Atlanta", "Dallas", "Detroit", "Nashville",
+]
+
+
+def question(locations: int, index: int) -> str:
+    """An N-location weather question; the index keeps requests distinct."""
+    cities = [CITIES[(index + offset) % len(CITIES)] for offset in range(locations)]
+    if len(cities) == 1:
+        return f"What's the weather in {cities[0]}?"
+    return f"What's the weather in {', '.join(cities[:-1])} and {cities[-1]}?"
+
+
+async def run_mode(args: argparse.Namespace, parallel: bool) -> list[dict[str, object]]:
+    """Measure every location count with parallel tool calls on or off."""
+    args.env = [
+        *args.base_env,
+        f"QUERY_AGENT_PARALLEL_TOOL_CALLS={str(parallel).lower()}",
+    ]
+    results = []
+    with start_servers(args) as urls:
+        async with httpx.AsyncClient(
+            base_url=urls["app"],
+            timeout=300,
+            headers={"Cache-Control": "no-cache"},
+        ) as client:
+            # Warm up connections and the runtime pool
+            await client.post("/api/chat", json={"message": question(1, 0)})
+            for locations in args.locations:
+                calls_before = await mock_requests(urls)
+                latencies = []
+                statuses: dict[str, int] = {}
+                for index in range(args.requests):
+                    started = time.perf_counter()
+                    response = await client.post(
+                        "/api/chat", json={"message": question(locations, index)}
+                    )
+                    latencies.append(time.perf_counter() - started)
+                    status = str(response.status_code)
+                    statuses[status] = statuses.get(status, 0) + 1
+                calls_after = await mock_requests(urls)
+                result = {
+                    "parallel": parallel,
+                    "locations": locations,
+                    "requests": args.requests,
+                    "statuses": statuses,
+                    "latency_ms": summarize_ms(latencies),
+                    "model_calls_per_request": round(
+                        (calls_after["openai"] - calls_before["openai"])
+                        / args.requests,
+                        2,
+                    ),
+                    "weather_calls_per_request": round(
+                        (calls_after["weather"] - calls_before["weather"])
+                        / args.requests,
+                        2,
+                    ),
+                }
+                print_result(result)
+                results.append(result)
+    return results
+
+
+def print_result(result: dict[str, object]) -> None:
+    latency = result["latency_ms"]
+    mode = "parallel" if result["parallel"] else "sequential"
+    print(
+        f"{mode:<10} locations={result['locations']:<3} "
+        f"p50={latency['p50']} p95={latency['p95']}ms  "
+        f"model_calls={result['model_calls_per_request']}/req  "
+        f"weather_calls={result['weather_calls_per_request']}/req  "
+        f"statuses={result['statuses']}"
+    )
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, object]]:
+    results = []
+    for parallel in (False, True):
+        results += await run_mode(args, parallel)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--locations", default="1,2,4,8")
+    parser.add_argument(
+        "--requests", type=int, default=10, help="Requests per location count"
+    )
+    add_script_arguments(parser)
+    add_server_arguments(parser, weather_latency=0.2)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+    args.locations = [int(n) for n in args.locations.split(",")]
+    # Every lookup must reach the weather mock
+    args.base_env = ["WEATHER_CACHE_ENABLED=false", *args.env]
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,13 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.http_metrics import RequestMetricsMiddleware
 from app.core.lifespan import lifespan
-from app.core.telemetry import setup_telemetry
-from app.routers import chat, health
+from app.core.startup import startup_phases
+from app.routers import chat, health, metrics
+
+# Interpreter boot plus module imports, dominated by Semantic Kernel
+startup_phases.record_process_age("imports")
 
 # Configure Python logging
 log_level = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -30,8 +34,7 @@ logging.getLogger("urllib3").setLevel(logging.WARNING)
 logging.getLogger("opentelemetry").setLevel(logging.ERROR)
 logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 
-# Set up Application Insights telemetry
-setup_telemetry()
+# Application Insights telemetry is set up once per worker in the lifespan
 
 # Create FastAPI app
 app = FastAPI(
@@ -50,6 +53,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-endpoint latency and time to first byte; probes and scrapes excluded
+app.add_middleware(
+    RequestMetricsMiddleware,
+    excluded_paths=("/", "/health", "/health/live", "/metrics"),
+)
+
 
 # Middleware to suppress health check logs
 @app.middleware("http")
@@ -57,7 +66,7 @@ async def suppress_health_logs(request: Request, call_next):
     """Suppress logging for health check endpoints."""
     response = await call_next(request)
     # Don't log health checks
-    if request.url.path in ["/health", "/"]:
+    if request.url.path in ["/health", "/", "/metrics"]:
         return response
     # Log other requests at trace level
     logging.getLogger("uvicorn.access").log(
@@ -69,6 +78,8 @@ async def suppress_health_logs(request: Request, call_next):
 # Include routers
 app.include_router(health.router)
 app.include_router(chat.router)
+if settings.prometheus_metrics_enabled:
+    app.include_router(metrics.router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -20,6 +20,26 @@ def health_check(req: func.HttpRequest) -> func.HttpResponse:
     )
 
 
+# Upper bound on locations accepted by the batch endpoint
+MAX_BATCH_LOCATIONS = 50
+
+
+def build_weather_data(location: str) -> dict:
+    """
+    Build the hardcoded weather payload for a location.
+    """
+    return {
+        "location": location,
+        "temperature": 72,
+        "temperature_unit": "F",
+        "conditions": "Partly Cloudy",
+        "humidity": 65,
+        "wind_speed": 8,
+        "wind_unit": "mph",
+        "forecast": "Clear skies expected for the rest of the day",
+    }
+
+
 @app.route(route="weather")
 def get_weather(req: func.HttpRequest) -> func.HttpResponse:
     """
@@ -37,19 +57,70 @@ def get_weather(req: func.HttpRequest) -> func.HttpResponse:
     logging.info("Processing weather request for location: %s", location)
 
     # Hardcoded weather data
-    weather_data = {
-        "location": location,
-        "temperature": 72,
-        "temperature_unit": "F",
-        "conditions": "Partly Cloudy",
-        "humidity": 65,
-        "wind_speed": 8,
-        "wind_unit": "mph",
-        "forecast": "Clear skies expected for the rest of the day",
-    }
+    weather_data = build_weather_data(location)
 
     logging.info("Returning weather data for location: %s", location)
 
     return func.HttpResponse(
         body=json.dumps(weather_data), status_code=200, mimetype="application/json"
     )
+
+
+@app.route(route="weather/batch", methods=["GET", "POST"])
+def get_weather_batch(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Azure Function that returns hardcoded weather data for many locations.
+    Lets the AI agent answer multi-location questions with one call.
+
+    Request (either form):
+    - POST JSON body: {"locations": ["Seattle", "Denver"]}
+    - GET query parameter: locations=Seattle,Denver
+
+    Response: {"results": [...]} in the same order as the request.
+    """
+    logging.info("Weather batch function triggered by request")
+
+    if req.method == "POST":
+        try:
+            body = req.get_json()
+        except ValueError:
+            return _error_response("Request body must be valid JSON")
+        locations = body.get("locations") if isinstance(body, dict) else None
+    else:
+        raw = req.params.get("locations", "")
+        locations = raw.split(",")
+
+    if not isinstance(locations, list) or not all(
+        isinstance(location, str) for location in locations
+    ):
+        return _error_response("'locations' must be a list of strings")
+
+    locations = [location.strip() for location in locations if location.strip()]
+    if not locations:
+        return _error_response("At least one location is required")
+    if len(locations) > MAX_BATCH_LOCATIONS:
+        return _error_response(
+            f"At most {MAX_BATCH_LOCATIONS} locations are allowed per request"
+        )
+
+    logging.info("Processing weather batch request for %d locations", len(locations))
+
+    results = [build_weather_data(location) for location in locations]
+
+    return func.HttpResponse(
+        body=json.dumps({"results": results}),
+        status_code=200,
+        mimetype="application/json",
+    )
+
+
+def _error_response(message: str) -> func.HttpResponse:
+    """
+    Build a 400 JSON error response.
+    """
+    logging.warning("Rejecting weather batch request: %s", message)
+    return func.HttpResponse(
+        body=json.dumps({"error": message}),
+        status_code=400,
+        mimetype="application/json",
+    )